@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Sync Benchmark
+Runs LeetCodeSync / CodeforcesSync against the local stub server at several
+scales and reports wall time, per-stage time, request counts, peak RSS,
+files written and the syncers' own profiling spans and counters as JSON
+
+Usage:
+    python benchmarks/run_benchmark.py --submissions 10 1000 50000 --output report.json
+    python benchmarks/run_benchmark.py --platform leetcode --async --baseline report.json
+"""
+
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+# Syncer method -> reported stage; stage times are busy seconds summed over worker threads
+STAGES = {
+    'leetcode': {
+        'iter_submissions': 'fetch', 'iter_submissions_async': 'fetch',
+        'resolve_chunk': 'details', 'schedule_chunk': 'details',
+        'analyze_submission': 'analyze', 'analyze_submission_async': 'analyze',
+        'render_page': 'render', 'write_page': 'write', 'create_main_readme': 'index',
+        'collect_solutions': 'collect',
+    },
+    'codeforces': {
+        'iter_user_submissions': 'fetch', 'iter_user_submissions_async': 'fetch',
+        'prepare_submission': 'prepare',
+        'analyze_submission': 'analyze', 'analyze_submission_async': 'analyze',
+        'render_page': 'render', 'write_page': 'write', 'create_main_readme': 'index',
+        'collect_submissions': 'collect',
+    },
+}
+
+
+class StageTimer:
+    """Wraps syncer methods on an instance and accumulates the time spent inside them"""
+
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+
+    def wrap(self, obj, name, stage):
+        func = getattr(obj, name, None)
+        if func is None:
+            return
+        timer = self
+
+        if inspect.isasyncgenfunction(func):
+            async def wrapper(*args, **kwargs):
+                agen = func(*args, **kwargs)
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = await agen.__anext__()
+                    except StopAsyncIteration:
+                        timer.add(stage, time.perf_counter() - start)
+                        return
+                    timer.add(stage, time.perf_counter() - start)
+                    yield item
+        elif inspect.iscoroutinefunction(func):
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timer.add(stage, time.perf_counter() - start)
+        elif inspect.isgeneratorfunction(func):
+            def wrapper(*args, **kwargs):
+                gen = func(*args, **kwargs)
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        timer.add(stage, time.perf_counter() - start)
+                        return
+                    timer.add(stage, time.perf_counter() - start)
+                    yield item
+        else:
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timer.add(stage, time.perf_counter() - start)
+
+        setattr(obj, name, wrapper)
+
+    def report(self):
+        with self.lock:
+            return {stage: {'seconds': round(entry['seconds'], 4), 'calls': entry['calls']}
+                    for stage, entry in sorted(self.stages.items())}
+
+
+def snapshot_files(root):
+    """{path: (size, mtime_ns)} of every file under `root`"""
+    files = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            files[path] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == 'darwin' else usage  # bytes on macOS, KB on Linux
+
+
+def make_syncer(platform_name, use_async):
+    if use_async:
+        from async_sync import AsyncCodeforcesSync, AsyncLeetCodeSync
+        return AsyncLeetCodeSync() if platform_name == 'leetcode' else AsyncCodeforcesSync()
+    if platform_name == 'leetcode':
+        from sync_leetcode import LeetCodeSync
+        return LeetCodeSync()
+    from sync_codeforces import CodeforcesSync
+    return CodeforcesSync()
+
+
+def run_scenario(scenario, results):
+    """Child process: serve fixtures, run the sync `runs` times and put one report on `results`"""
+    sys.path.insert(0, SCRIPTS_DIR)
+    sys.path.insert(0, BENCH_DIR)
+    if not scenario['verbose']:
+        sys.stdout = open(os.devnull, 'w')
+    from stub_server import Fixtures, StubServer
+    from profiling import profiler
+
+    if scenario['fixtures']:
+        fixtures = Fixtures.load(scenario['fixtures'])
+    else:
+        fixtures = Fixtures.synthetic(scenario['submissions'], scenario['problems'], scenario['seed'])
+    stub = StubServer(fixtures, scenario['gemini_latency']).start()
+
+    workdir = tempfile.mkdtemp(prefix='sync-bench-')
+    os.chdir(workdir)
+    os.environ.update(stub.environment())
+    os.environ.update({
+        'LEETCODE_SESSION': 'bench', 'LEETCODE_CSRF': 'bench', 'CODEFORCES_HANDLE': 'bench',
+        'GEMINI_API_KEY': 'bench', 'SYNC_CACHE_DIR': os.path.join(workdir, '.cache'),
+    })
+    if not scenario['live_rates']:
+        os.environ.update({'LEETCODE_RATE': '0', 'CODEFORCES_RATE': '0', 'GEMINI_RATE': '0'})
+    os.environ.update(scenario['env'])
+
+    runs = []
+    try:
+        baseline_rss = peak_rss_kb()
+        for run in range(scenario['runs']):
+            if run:
+                fixtures.add_submissions(scenario['new_per_run'])
+            stub.reset_counts()
+            before = snapshot_files(workdir)
+
+            timer = StageTimer()
+            profiler.reset()
+            start = time.perf_counter()
+            syncer = make_syncer(scenario['platform'], scenario['async'])
+            for name, stage in STAGES[scenario['platform']].items():
+                timer.wrap(syncer, name, stage)
+            syncer.sync()
+            wall = time.perf_counter() - start
+
+            after = snapshot_files(workdir)
+            runs.append({
+                'run': run + 1,
+                'wall_seconds': round(wall, 4),
+                'stages': timer.report(),
+                'profile': profiler.report(),
+                'requests': dict(sorted(stub.reset_counts().items())),
+                'peak_rss_kb': peak_rss_kb(),
+                'files_written': sum(1 for path, meta in after.items() if before.get(path) != meta),
+                'files_total': len(after),
+            })
+        results.put({'runs': runs, 'fixture_rss_kb': baseline_rss})
+    except Exception as e:
+        results.put({'runs': runs, 'error': f'{type(e).__name__}: {e}'})
+    finally:
+        stub.stop()
+        os.chdir(BENCH_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_isolated(scenario):
+    """Run a scenario in a fresh interpreter so peak RSS covers only that scenario"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=run_scenario, args=(scenario, results))
+    process.start()
+    report = results.get()
+    process.join()
+    return report
+
+
+def compare(report, baseline_path):
+    """Print wall-time ratios against a previous report"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(s['platform'], s['submissions']): s for s in baseline.get('scenarios', [])}
+
+    for scenario in report['scenarios']:
+        old = previous.get((scenario['platform'], scenario['submissions']))
+        if not old:
+            continue
+        for run, old_run in zip(scenario['runs'], old['runs']):
+            ratio = run['wall_seconds'] / old_run['wall_seconds'] if old_run['wall_seconds'] else float('inf')
+            print(f"  {scenario['platform']:<10} n={scenario['submissions']:<6} run {run['run']}: "
+                  f"{old_run['wall_seconds']:.3f}s -> {run['wall_seconds']:.3f}s ({ratio:.2f}x)", file=sys.stderr)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--platform', choices=('leetcode', 'codeforces', 'both'), default='both')
+    parser.add_argument('--submissions', type=int, nargs='+', default=[10, 1000],
+                        help='Submission counts per platform to benchmark (10 to 50000)')
+    parser.add_argument('--problems', type=int, default=None,
+                        help='Distinct problems in synthetic fixtures (default: submissions / 4)')
+    parser.add_argument('--fixtures', help='Recorded fixtures JSON to replay instead of synthetic data')
+    parser.add_argument('--runs', type=int, default=2,
+                        help='Sequential syncs per scenario; the first is a full sync, later ones incremental')
+    parser.add_argument('--new-per-run', type=int, default=10, help='Submissions added before each incremental run')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Benchmark the asyncio variant')
+    parser.add_argument('--gemini-latency', type=float, default=0.0, help='Seconds the stub waits per Gemini call')
+    parser.add_argument('--live-rates', action='store_true', help='Keep the default per-service rate limits')
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='Extra environment for the syncers, e.g. SYNC_GRAPH_BACKEND=matplotlib')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='Show the syncers\' own output')
+    parser.add_argument('--output', help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='Previous JSON report to compare wall times against')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    platforms = ('leetcode', 'codeforces') if args.platform == 'both' else (args.platform,)
+    sizes = [0] if args.fixtures else args.submissions
+    extra_env = dict(item.split('=', 1) for item in args.env)
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'scenarios': [],
+    }
+    for size in sizes:
+        for platform_name in platforms:
+            scenario = {
+                'platform': platform_name,
+                'submissions': size,
+                'problems': args.problems,
+                'fixtures': os.path.abspath(args.fixtures) if args.fixtures else None,
+                'runs': max(1, args.runs),
+                'new_per_run': args.new_per_run,
+                'async': args.use_async,
+                'gemini_latency': args.gemini_latency,
+                'live_rates': args.live_rates,
+                'env': extra_env,
+                'seed': args.seed,
+                'verbose': args.verbose,
+            }
+            print(f"Benchmarking {platform_name} with {size or 'recorded'} submissions...", file=sys.stderr)
+            result = run_isolated(scenario)
+            report['scenarios'].append(dict(scenario, **result))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.baseline:
+        print("\nWall time vs baseline:", file=sys.stderr)
+        compare(report, args.baseline)
+
+    if any('error' in scenario for scenario in report['scenarios']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark Stub Server
+Serves recorded or synthetic responses for every endpoint the syncers call:
+Codeforces user.status and problemset.problems, LeetCode /api/submissions/ and
+GraphQL, and Gemini generateContent, counting requests per endpoint and
+answering conditional requests with 304 Not Modified
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+LEETCODE_LANGS = ('python3', 'cpp', 'java', 'javascript')
+CODEFORCES_LANGS = ('GNU C++17', 'Python 3', 'PyPy 3', 'Java 11')
+TAGS = ('math', 'greedy', 'dp', 'graphs', 'strings', 'implementation', 'sortings', 'binary search')
+
+# Solutions of different shapes, so some are estimated offline and some go to Gemini
+SOLUTION_BODIES = (
+    "class Solution:\n    def solve(self, nums):\n        total = 0\n        for x in nums:\n            total += x\n        return total\n",
+    "class Solution:\n    def solve(self, nums):\n        best = 0\n        for i in range(len(nums)):\n            for j in range(i, len(nums)):\n                best = max(best, nums[j] - nums[i])\n        return best\n",
+    "class Solution:\n    def solve(self, nums):\n        nums.sort()\n        seen = {}\n        for i, x in enumerate(nums):\n            seen[x] = i\n        return seen\n",
+    "class Solution:\n    def solve(self, n, memo={}):\n        if n < 2:\n            return n\n        if n not in memo:\n            memo[n] = self.solve(n - 1) + self.solve(n - 2)\n        return memo[n]\n",
+)
+
+GEMINI_ANSWER = {
+    'time_complexity': 'O(n)',
+    'space_complexity': 'O(1)',
+    'time_explanation': 'Each element is visited once',
+    'space_explanation': 'Only a few variables are kept'
+}
+
+ALIASED_LOOKUP = re.compile(r'(\w+)\s*:\s*(question|submissionDetails)\((?:titleSlug|submissionId):\s*\$(\w+)\)')
+
+
+class Fixtures:
+    """Submission histories for both platforms, newest first, plus the problemset"""
+
+    def __init__(self, leetcode_submissions=None, codeforces_submissions=None, problemset=None):
+        self.leetcode_submissions = leetcode_submissions or []
+        self.codeforces_submissions = codeforces_submissions or []
+        self.problemset = problemset or []
+        self.problem_count = len(self.problemset)
+        self.rng = random.Random(0)
+
+    @classmethod
+    def load(cls, path):
+        """Recorded responses: {"leetcode_submissions": [...], "codeforces_submissions": [...], "problemset": [...]}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('leetcode_submissions'), data.get('codeforces_submissions'), data.get('problemset'))
+
+    @classmethod
+    def synthetic(cls, submissions, problems=None, seed=0):
+        """`submissions` per platform spread over `problems` problems (default a quarter as many)"""
+        fixtures = cls()
+        fixtures.rng = random.Random(seed)
+        fixtures.problem_count = max(1, problems or submissions // 4)
+        fixtures.problemset = [
+            {'contestId': 1000 + i, 'index': 'A', 'name': f'Problem {i}', 'rating': 800 + 100 * (i % 20),
+             'tags': list(fixtures.rng.sample(TAGS, 2))}
+            for i in range(fixtures.problem_count)
+        ]
+        fixtures.add_submissions(submissions)
+        return fixtures
+
+    def add_submissions(self, count):
+        """Prepend `count` newer submissions to both histories"""
+        rng = self.rng
+        next_lc = max((sub['id'] for sub in self.leetcode_submissions), default=100000) + 1
+        next_cf = max((sub['id'] for sub in self.codeforces_submissions), default=500000) + 1
+        created = int(time.time()) - 86400
+        problem_count = self.problem_count or 1
+
+        leetcode = []
+        codeforces = []
+        for i in range(count):
+            p = rng.randrange(problem_count)
+            accepted = rng.random() < 0.8
+            leetcode.append({
+                'id': next_lc + i,
+                'title_slug': f'problem-{p}',
+                'title': f'Problem {p}',
+                'lang': rng.choice(LEETCODE_LANGS),
+                'status_display': 'Accepted' if accepted else 'Wrong Answer',
+                'code': rng.choice(SOLUTION_BODIES) + f"# submission {next_lc + i}\n",
+                'runtime_percentile': round(rng.uniform(5, 99), 2) if rng.random() < 0.5 else None,
+                'memory_percentile': round(rng.uniform(5, 99), 2),
+                'timestamp': created + i
+            })
+            problem = self.problemset[p % len(self.problemset)] if self.problemset else \
+                {'contestId': 1000 + p, 'index': 'A', 'name': f'Problem {p}', 'tags': []}
+            codeforces.append({
+                'id': next_cf + i,
+                'creationTimeSeconds': created + i,
+                'verdict': 'OK' if accepted else 'WRONG_ANSWER',
+                'programmingLanguage': rng.choice(CODEFORCES_LANGS),
+                'timeConsumedMillis': rng.randrange(15, 2000),
+                'memoryConsumedBytes': rng.randrange(1, 256) * 1024 * 1024,
+                'problem': {key: problem[key] for key in ('contestId', 'index', 'name', 'tags')}
+            })
+
+        self.leetcode_submissions[:0] = reversed(leetcode)
+        self.codeforces_submissions[:0] = reversed(codeforces)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, body, status=200):
+        data = json.dumps(body).encode('utf-8')
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.server.stub.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        fixtures = self.server.stub.fixtures
+
+        if url.path.endswith('/user.status'):
+            self.server.stub.count('codeforces.user.status')
+            start = int(query.get('from', ['1'])[0])
+            count = int(query.get('count', ['10000'])[0])
+            self.send_json({'status': 'OK', 'result': fixtures.codeforces_submissions[start - 1:start - 1 + count]})
+        elif url.path.endswith('/problemset.problems'):
+            self.server.stub.count('codeforces.problemset')
+            self.send_json({'status': 'OK', 'result': {'problems': fixtures.problemset, 'problemStatistics': []}})
+        elif url.path.startswith('/api/submissions'):
+            self.server.stub.count('leetcode.submissions')
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', ['20'])[0])
+            page = fixtures.leetcode_submissions[offset:offset + limit]
+            self.send_json({
+                'submissions_dump': page,
+                'has_next': offset + limit < len(fixtures.leetcode_submissions),
+                'last_key': f'key-{offset + limit}'
+            })
+        else:
+            self.send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+        if url.path.endswith(':generateContent'):
+            self.server.stub.count('gemini')
+            if self.server.stub.gemini_latency:
+                time.sleep(self.server.stub.gemini_latency)
+            # Batched prompts list their solutions as JSON after "Solutions:"
+            prompt = body['contents'][0]['parts'][0]['text']
+            solutions = json.loads(prompt.split('Solutions:\n', 1)[1]) if 'Solutions:\n' in prompt else []
+            self.server.stub.count('gemini.solutions', max(1, len(solutions)))
+            answer = [dict(GEMINI_ANSWER, id=solution['id']) for solution in solutions] if solutions else GEMINI_ANSWER
+            self.send_json({'candidates': [{'content': {'parts': [{'text': json.dumps(answer)}]}}]})
+        elif url.path.endswith('/graphql'):
+            self.server.stub.count('leetcode.graphql')
+            variables = body.get('variables', {})
+            data = {}
+            for alias, field, variable in ALIASED_LOOKUP.findall(body.get('query', '')):
+                data[alias] = self.resolve(field, variables.get(variable))
+            if not data:
+                if 'titleSlug' in variables:
+                    data['question'] = self.resolve('question', variables['titleSlug'])
+                else:
+                    data['submissionDetails'] = self.resolve('submissionDetails', variables.get('submissionId'))
+            self.server.stub.count('leetcode.graphql.lookups', len(data))
+            self.send_json({'data': data})
+        else:
+            self.send_json({'error': 'not found'}, 404)
+
+    @staticmethod
+    def resolve(field, value):
+        if field == 'question':
+            number = str(value).rsplit('-', 1)[-1]
+            return {'questionId': number, 'questionFrontendId': str(int(number) + 1) if number.isdigit() else number,
+                    'title': str(value).replace('-', ' ').title(),
+                    'difficulty': ('Easy', 'Medium', 'Hard')[int(number) % 3 if number.isdigit() else 0]}
+        return {'runtime': '12 ms', 'runtimePercentile': 71.5, 'memory': '16.2 MB', 'memoryPercentile': 48.25}
+
+
+class StubServer:
+    """One server per service on its own loopback address, so per-host rate limits stay separate"""
+
+    HOSTS = {'leetcode': '127.0.0.1', 'codeforces': '127.0.0.2', 'gemini': '127.0.0.3'}
+
+    def __init__(self, fixtures, gemini_latency=0.0):
+        self.fixtures = fixtures
+        self.gemini_latency = gemini_latency
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.servers = {}
+
+    def count(self, endpoint, amount=1):
+        with self.lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + amount
+
+    def reset_counts(self):
+        with self.lock:
+            counts = dict(self.counts)
+            self.counts.clear()
+        return counts
+
+    def start(self):
+        for service, host in self.HOSTS.items():
+            server = ThreadingHTTPServer((host, 0), StubHandler)
+            server.daemon_threads = True
+            server.stub = self
+            threading.Thread(target=server.serve_forever, name=f'stub-{service}', daemon=True).start()
+            self.servers[service] = server
+        return self
+
+    def url(self, service):
+        host, port = self.servers[service].server_address[:2]
+        return f'http://{host}:{port}'
+
+    def environment(self):
+        """Endpoint overrides pointing the syncers at this server"""
+        return {
+            'LEETCODE_BASE_URL': self.url('leetcode'),
+            'CODEFORCES_API_BASE': self.url('codeforces') + '/api',
+            'GEMINI_API_BASE': self.url('gemini'),
+        }
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
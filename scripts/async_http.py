@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Async HTTP Client
+aiohttp counterpart of HttpClient for the asyncio sync path: one session per
+host with the same headers, cookies and retry policy, a semaphore bounding
+each host's concurrency and asyncio.sleep pacing on the shared rate limiter
+"""
+
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+from http_client import RETRY_STATUSES, THROTTLE_STATUSES
+from profiling import count, span
+from rate_limit import backoff_delay, retry_after_seconds
+
+
+class AsyncResponse:
+    """Fully read response exposing the parts of the requests API the syncers use"""
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code} for {self.url}")
+
+
+def import_aiohttp():
+    """aiohttp is only installed for the asyncio sync path, from requirements-async.txt"""
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("SYNC_ASYNC needs aiohttp: pip install -r requirements-async.txt") from None
+    return aiohttp
+
+
+async def acquire(bucket):
+    """Wait for a token of a shared TokenBucket without blocking the event loop"""
+    while True:
+        wait = bucket.reserve()
+        if not wait:
+            return
+        await asyncio.sleep(wait)
+
+
+class AsyncHttpClient:
+    def __init__(self, timeout=30, retries=3, backoff=1.0, limit_per_host=10, limiter=None, host_defaults=None,
+                 cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.limit_per_host = max(1, limit_per_host)
+        self.limiter = limiter
+        self.host_defaults = dict(host_defaults or {})
+        self.sessions = {}
+        self.semaphores = {}
+
+    @classmethod
+    def from_client(cls, client):
+        """Mirror a blocking HttpClient's policy, host defaults, rate limiter and response cache"""
+        return cls(client.timeout, client.retries, client.backoff, client.pool_size, client.limiter, client.host_defaults,
+                   client.cache)
+
+    def session_for(self, host):
+        """Return the host's session, creating it inside the running loop on first use"""
+        aiohttp = import_aiohttp()
+
+        session = self.sessions.get(host)
+        if session is None:
+            headers, cookies = self.host_defaults.get(host, ({}, {}))
+            session = self.sessions[host] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.limit_per_host),
+                headers=headers,
+                cookies=cookies
+            )
+            self.semaphores[host] = asyncio.Semaphore(self.limit_per_host)
+        return session
+
+    async def request(self, method, url, revalidate=False, **kwargs):
+        """Send a request through the response cache like HttpClient.request"""
+        cacheable, ttl = self.cache.rule_for(url) if self.cache else (False, 0)
+        if not cacheable:
+            return await self.send(method, url, **kwargs)
+
+        key = self.cache.make_key(method, url, kwargs.get('params'), kwargs.get('json', kwargs.get('data')))
+        entry = self.cache.lookup(key)
+        if entry:
+            cached = self.cache.response(key, entry) if not revalidate and self.cache.is_fresh(entry, ttl) else None
+            if cached:
+                count('http_cache.hits')
+                return cached
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **self.cache.conditional_headers(entry))
+
+        response = await self.send(method, url, **kwargs)
+        if response.status_code == 304 and entry:
+            cached = self.cache.response(key, entry)
+            if cached:
+                count('http_cache.revalidated')
+                self.cache.revalidated(key)
+                return cached
+        count('http_cache.misses')
+        if self.cache.storable(response, ttl):
+            self.cache.store(key, url, response.headers, response.content)
+        return response
+
+    async def send(self, method, url, timeout=None, **kwargs):
+        """Send a request, paced by the host's rate limit and retried like HttpClient"""
+        aiohttp = import_aiohttp()
+
+        host = urlsplit(url).hostname
+        session = self.session_for(host)
+        bucket = self.limiter.bucket_for(url) if self.limiter else None
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        for attempt in range(self.retries + 1):
+            async with self.semaphores[host]:
+                if bucket:
+                    with span('http.rate_limit_wait'):
+                        await acquire(bucket)
+                try:
+                    with span('http'):
+                        async with session.request(method, url, timeout=client_timeout, **kwargs) as raw:
+                            response = AsyncResponse(url, raw.status, raw.headers, await raw.read())
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt == self.retries:
+                        raise
+                    count('http.retries')
+                    await asyncio.sleep(backoff_delay(attempt, self.backoff))
+                    continue
+            count('http.requests')
+            count('http.bytes_received', len(response.content))
+
+            retryable = response.status_code in RETRY_STATUSES or response.status_code in THROTTLE_STATUSES
+            if not retryable or attempt == self.retries:
+                return response
+
+            delay = retry_after_seconds(response) if response.status_code in THROTTLE_STATUSES else None
+            if delay is None:
+                delay = backoff_delay(attempt, self.backoff)
+            count('http.retries')
+            if response.status_code in THROTTLE_STATUSES:
+                count('http.throttled')
+                print(f"Throttled by {host} ({response.status_code}), backing off {delay:.1f}s")
+                if bucket:
+                    bucket.pause(delay)
+                    continue
+            await asyncio.sleep(delay)
+        return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        """Close every host session"""
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+        self.semaphores.clear()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Asyncio Sync
+Event-loop variants of both syncers: submission paging, GraphQL details, the
+problemset download and Gemini analysis overlap on one thread through aiohttp,
+while records, pages and state are produced by the same code as the threaded
+pipeline
+"""
+
+import asyncio
+import os
+
+from async_http import AsyncHttpClient
+from complexity_batch import AsyncComplexityBatcher
+from graphql_fetch import AsyncGraphQLFetcher
+from json_stream import JsonArrayStream
+from profiling import span
+from records import ComplexityResult
+from sync_codeforces import CodeforcesSync
+from sync_leetcode import LeetCodeSync
+
+
+class AsyncAnalysisMixin:
+    """Gemini analysis and bounded task scheduling shared by both async syncers"""
+
+    def open_async(self):
+        """Create the event-loop clients; must run inside the loop"""
+        self.async_http = AsyncHttpClient.from_client(self.http)
+        self.async_batcher = AsyncComplexityBatcher.from_batcher(self.resources.complexity_batcher, self.async_http)
+        self.task_slots = asyncio.Semaphore(int(os.environ.get('SYNC_ASYNC_CONCURRENCY', 64)))
+        self.tasks = []
+
+    async def close_async(self):
+        await self.async_http.close()
+
+    async def schedule(self, coro):
+        """Start `coro` once a slot is free; results are gathered in scheduling order"""
+        await self.task_slots.acquire()
+
+        async def run():
+            try:
+                return await coro
+            finally:
+                self.task_slots.release()
+
+        self.tasks.append(asyncio.ensure_future(run()))
+
+    async def gather(self):
+        return list(await asyncio.gather(*self.tasks))
+
+    async def analyze_complexity_async(self, code, lang, message=None):
+        """analyze_complexity with the batched Gemini answer awaited instead of blocking a worker"""
+        cache_key, result = await asyncio.to_thread(self.local_complexity, code, lang, message)
+        if result or not self.gemini_api_key:
+            return result
+
+        result = await self.async_batcher.analyze(code, lang)
+        if result:
+            self.complexity_cache.put(cache_key, result)
+        return result
+
+
+class AsyncLeetCodeSync(AsyncAnalysisMixin, LeetCodeSync):
+    def collect_solutions(self, last_submission_id, problems, progress):
+        return asyncio.run(self.collect_solutions_async(last_submission_id, problems, progress))
+
+    async def collect_solutions_async(self, last_submission_id, problems, progress):
+        self.open_async()
+        fetcher = AsyncGraphQLFetcher(self.async_http, self.fetcher.graphql_url,
+                                      self.fetcher.timeout, self.fetcher.batch_size, self.fetcher.cache)
+        try:
+            selector = self.make_selector(problems)
+            pending = []
+            async for sub in self.iter_submissions_async(last_submission_id):
+                self.note_submission(sub, progress)
+                self.queue_selected(selector.offer(sub), problems, pending)
+                if len(pending) >= self.chunk_size:
+                    await self.schedule_chunk(fetcher, pending, problems)
+
+            self.queue_selected(selector.finish(), problems, pending)
+            while pending:
+                chunk, pending = pending[:self.chunk_size], pending[self.chunk_size:]
+                await self.schedule_chunk(fetcher, chunk, problems)
+            return await self.gather()
+        finally:
+            await self.close_async()
+
+    async def iter_submissions_async(self, last_submission_id):
+        """iter_submissions over the async client"""
+        url = f"{self.base_url}/api/submissions/"
+        cursor = (0, '')
+
+        while cursor:
+            with span('leetcode.fetch'):
+                response = await self.async_http.get(url, params=self.submissions_params(cursor))
+                response.raise_for_status()
+                data = response.json()
+            submissions, cursor = self.read_submissions_page(data, cursor, last_submission_id)
+            for sub in submissions:
+                yield sub
+
+    async def schedule_chunk(self, fetcher, pending, problems):
+        """Resolve a chunk's details, then start analyzing its submissions"""
+        missing_slugs, detail_ids = self.chunk_lookups(pending, problems)
+        with span('leetcode.details'):
+            problem_details, submission_details = await fetcher.fetch_details(missing_slugs, detail_ids)
+        for item in self.apply_details(pending, problems, problem_details, submission_details):
+            await self.schedule(self.analyze_submission_async(item, problems))
+
+    async def analyze_submission_async(self, item, problems):
+        # Writing the solution file is blocking file I/O, kept off the event loop
+        title_slug, lang, record, code = await asyncio.to_thread(self.store_submission, item)
+        message = f"Analyzing complexity for {title_slug} ({lang})..."
+        record.complexity = ComplexityResult.from_dict(await self.analyze_complexity_async(code, lang, message))
+        if record.complexity:
+            print(f"✓ Complexity analyzed: {record.complexity.time_complexity}, {record.complexity.space_complexity}")
+        return self.checkpoint_solution((title_slug, lang, record), problems)
+
+
+class AsyncCodeforcesSync(AsyncAnalysisMixin, CodeforcesSync):
+    def collect_submissions(self, last_submission_id, problems, progress):
+        return asyncio.run(self.collect_submissions_async(last_submission_id, problems, progress))
+
+    async def collect_submissions_async(self, last_submission_id, problems, progress):
+        self.open_async()
+        try:
+            selector = self.make_selector(problems)
+            async for sub in self.iter_user_submissions_async(last_submission_id):
+                self.note_submission(sub, progress)
+                for winner in selector.offer(sub):
+                    await self.schedule_submission(winner, problems)
+            for winner in selector.finish():
+                await self.schedule_submission(winner, problems)
+            return await self.gather()
+        finally:
+            await self.close_async()
+
+    async def schedule_submission(self, sub, problems):
+        """Start analyzing a selected submission unless an earlier run recorded it"""
+        item = self.accept_submission(sub, problems)
+        if item:
+            # Load ratings up front so prepare_submission never blocks on the API
+            await self.ensure_rating_async(sub['problem']['contestId'], sub['problem']['index'])
+            # prepare_submission creates the folder and placeholder, so it runs off the event loop
+            prepared = await asyncio.to_thread(self.prepare_submission, item)
+            await self.schedule(self.analyze_submission_async(prepared))
+
+    async def iter_user_submissions_async(self, last_submission_id=0):
+        """iter_user_submissions over the async client; each page body is read whole, then parsed lazily"""
+        url = f"{self.api_base}/user.status"
+        cursor = self.first_status_cursor(last_submission_id)
+
+        try:
+            while cursor:
+                with span('codeforces.fetch'):
+                    response = await self.async_http.get(url, params=self.status_params(cursor))
+                page = self.read_status_page(JsonArrayStream([response.content], 'result'), cursor,
+                                             last_submission_id)
+                # Async generators cannot `yield from`, so the next cursor is taken from StopIteration
+                while True:
+                    try:
+                        sub = next(page)
+                    except StopIteration as done:
+                        cursor = done.value
+                        break
+                    yield sub
+        except Exception as e:
+            # A partial history would advance the watermark past unseen submissions
+            print(f"Error fetching submissions: {e}")
+            raise
+
+    async def fetch_problemset_async(self, revalidate=False):
+        try:
+            response = await self.async_http.get(f"{self.api_base}/problemset.problems", timeout=60,
+                                                 revalidate=revalidate)
+            return self.parse_problemset(response.json())
+        except Exception as e:
+            print(f"Error fetching problemset: {e}")
+            return None
+
+    async def load_problemset_index_async(self, force_refresh=False):
+        """load_problemset_index with the download awaited"""
+        ratings, snapshot = self.cached_problemset(force_refresh)
+        if ratings is not None:
+            return ratings
+
+        with span('codeforces.problemset'):
+            ratings = await self.fetch_problemset_async(revalidate=force_refresh)
+        return self.store_problemset(ratings, snapshot)
+
+    async def ensure_rating_async(self, contest_id, index):
+        """Make get_problem_rating answer from memory, refreshing like it would"""
+        ratings = await self.load_problemset_index_async()
+        if self.needs_problemset_refresh(ratings, (contest_id, index)):
+            ratings = await self.load_problemset_index_async(force_refresh=True)
+            self.needs_problemset_refresh(ratings, (contest_id, index))
+
+    async def analyze_submission_async(self, item):
+        record, page = item
+        submission = record.latest
+        code = self.solution_code(record, page[1])
+        if code:
+            submission.complexity = ComplexityResult.from_dict(
+                await self.analyze_complexity_async(code, submission.language, "  Analyzing complexity..."))
+            if submission.complexity:
+                print(f"  ✓ Complexity: {submission.complexity.time_complexity}, {submission.complexity.space_complexity}")
+        return self.checkpoint_submission((record, page))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Sync Checkpoints
+Periodically persists the records an unfinished run has already produced, so a
+rerun after a crash or CI timeout resumes instead of fetching and analyzing
+everything again
+"""
+
+import json
+import os
+import threading
+import time
+
+from document_writer import write_if_changed
+
+
+class Checkpoint:
+    """Problem records of one run, keyed like the sync state and valid only for the watermark it started from"""
+
+    def __init__(self, path, watermark, interval=30):
+        self.path = path
+        self.watermark = watermark
+        self.interval = interval
+        self.records = {}
+        self.lock = threading.Lock()
+        self.saved_at = time.monotonic()
+        self.dirty = False
+
+    def load(self):
+        """Records saved by an interrupted run from the same watermark, or {}"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+        if data.get('watermark') != self.watermark:
+            print("Ignoring checkpoint from a different run")
+            return {}
+        with self.lock:
+            self.records = data.get('records', {})
+        return dict(self.records)
+
+    def add(self, key, record):
+        """Merge a problem record (its solutions are merged per language) and save if the interval passed"""
+        with self.lock:
+            existing = self.records.get(key)
+            if existing:
+                solutions = dict(existing.get('solutions', {}))
+                solutions.update(record.get('solutions', {}))
+                record = dict(record, solutions=solutions)
+            self.records[key] = record
+            self.dirty = True
+            due = time.monotonic() - self.saved_at >= self.interval
+        if due:
+            self.save()
+
+    def save(self):
+        """Write pending records atomically"""
+        with self.lock:
+            if not self.dirty:
+                return
+            data = {'watermark': self.watermark, 'saved_at': int(time.time()), 'records': self.records}
+            write_if_changed(self.path, json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+            self.saved_at = time.monotonic()
+            self.dirty = False
+
+    def clear(self):
+        """Forget the checkpoint once the run's results are in the sync state"""
+        with self.lock:
+            self.records = {}
+            self.dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
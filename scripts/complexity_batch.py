@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Batched Complexity Analysis
+Packs several solutions into one Gemini request answered as a JSON array in
+structured output mode; every entry is validated on its own and only the
+failed ones are queued for another attempt
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from complexity_cache import ComplexityCache
+from profiling import count, span
+
+
+MODEL_PATH = "/v1beta/models/gemini-1.5-flash:generateContent"
+
+RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            **{field: {"type": "STRING"} for field in ComplexityCache.FIELDS}
+        },
+        "required": ["id", *ComplexityCache.FIELDS]
+    }
+}
+
+BIG_O = re.compile(r'^O\(.+\)$')
+
+
+def clean_markdown(text):
+    """Remove markdown formatting like * and _ for clean output"""
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.+?)\*', r'\1', text)
+    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = re.sub(r'_(.+?)_', r'\1', text)
+    return text.strip()
+
+
+def batch_request(gemini_base, api_key, entries):
+    """Gemini URL and payload asking for the complexity of every (id, code, lang) entry"""
+    url = f"{gemini_base}{MODEL_PATH}?key={api_key}"
+
+    solutions = [{"id": entry_id, "language": lang, "code": code} for entry_id, code, lang in entries]
+    prompt_text = "Analyze each of these solutions and provide ONLY its time and space complexity in Big O notation.\n"
+    prompt_text += "Answer with one array entry per solution, using the solution's id. "
+    prompt_text += "Explanations are brief and use NO markdown formatting, NO asterisks, NO underscores.\n\n"
+    prompt_text += "Solutions:\n" + json.dumps(solutions, indent=1, ensure_ascii=False)
+
+    payload = {
+        "contents": [{
+            "parts": [{
+                "text": prompt_text
+            }]
+        }],
+        "generationConfig": {
+            "temperature": 0.1,
+            "maxOutputTokens": 500 * len(entries),
+            "responseMimeType": "application/json",
+            "responseSchema": RESPONSE_SCHEMA
+        }
+    }
+    return url, payload
+
+
+def parse_entry(entry):
+    """Complexity fields of one array entry, or None if any of them is missing or malformed"""
+    result = {}
+    for field in ComplexityCache.FIELDS:
+        value = entry.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        result[field] = value.strip()
+    if not BIG_O.match(result['time_complexity']) or not BIG_O.match(result['space_complexity']):
+        return None
+    result['time_explanation'] = clean_markdown(result['time_explanation'])
+    result['space_explanation'] = clean_markdown(result['space_explanation'])
+    return result
+
+
+def parse_batch(data, ids):
+    """{id: result} for the valid entries of a batch response; unknown ids and bad entries are left out"""
+    try:
+        entries = json.loads(data['candidates'][0]['content']['parts'][0]['text'])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    results = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        entry_id = str(entry.get('id'))
+        if entry_id in ids and entry_id not in results:
+            result = parse_entry(entry)
+            if result:
+                results[entry_id] = result
+    return results
+
+
+class BatchJob:
+    __slots__ = ('code', 'lang', 'future', 'attempts')
+
+    def __init__(self, code, lang, future):
+        self.code = code
+        self.lang = lang
+        self.future = future
+        self.attempts = 0
+
+
+class BatchQueue:
+    """Pending jobs and the batch bookkeeping shared by the threaded and asyncio analyzers"""
+
+    def __init__(self, gemini_base, api_key, batch_size=8, linger=0.5, max_attempts=3):
+        self.gemini_base = gemini_base
+        self.api_key = api_key
+        self.batch_size = max(1, batch_size)
+        self.linger = linger
+        self.max_attempts = max(1, max_attempts)
+        self.pending = deque()
+
+    def take(self):
+        return [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+
+    def request(self, batch):
+        """URL, payload and entry ids of a batch; ids are positions, so they stay short"""
+        entries = [(str(i), job.code, job.lang) for i, job in enumerate(batch)]
+        url, payload = batch_request(self.gemini_base, self.api_key, entries)
+        return url, payload, {entry[0] for entry in entries}
+
+    def settle(self, batch, results):
+        """Resolve jobs that got a valid answer, returns the ones to queue again"""
+        retry = []
+        for i, job in enumerate(batch):
+            result = results.get(str(i))
+            if result:
+                job.future.set_result(result)
+                continue
+            job.attempts += 1
+            if job.attempts >= self.max_attempts:
+                count('gemini.failed')
+                job.future.set_result(None)
+            else:
+                retry.append(job)
+        if retry:
+            count('gemini.requeued', len(retry))
+            print(f"Re-queuing {len(retry)} of {len(batch)} solutions without a valid complexity answer")
+        return retry
+
+
+class ComplexityBatcher(BatchQueue):
+    """Collects solutions from any thread and analyzes them in batches over a shared HttpClient"""
+
+    def __init__(self, http, gemini_base, api_key, batch_size=8, linger=0.5, max_attempts=3, workers=4):
+        super().__init__(gemini_base, api_key, batch_size, linger, max_attempts)
+        self.http = http
+        self.workers = max(1, workers)
+        self.condition = threading.Condition()
+        self.dispatcher = None
+        self.pool = None
+        self.closed = False
+        self.in_flight = 0
+
+    def submit(self, code, lang):
+        """Queue a solution, returns a Future of its complexity result or None"""
+        future = Future()
+        with self.condition:
+            self.pending.append(BatchJob(code, lang, future))
+            if self.dispatcher is None:
+                self.closed = False
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='gemini-batch')
+                self.dispatcher = threading.Thread(target=self.dispatch, name='gemini-dispatch', daemon=True)
+                self.dispatcher.start()
+            self.condition.notify_all()
+        return future
+
+    def next_batch(self):
+        """Wait for a full batch, or for the linger time after the first job, returns None once closed
+        and no batch in flight can queue retries"""
+        with self.condition:
+            while not self.pending and not (self.closed and not self.in_flight):
+                self.condition.wait()
+            deadline = time.monotonic() + self.linger
+            while 0 < len(self.pending) < self.batch_size and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            batch = self.take()
+            if batch:
+                self.in_flight += 1
+            return batch or None
+
+    def dispatch(self):
+        while True:
+            batch = self.next_batch()
+            if batch is None:
+                return
+            self.pool.submit(self.send, batch)
+
+    def send(self, batch):
+        url, payload, ids = self.request(batch)
+        count('gemini.batches')
+        count('gemini.solutions', len(batch))
+        results = {}
+        try:
+            with span('gemini'):
+                response = self.http.post(url, json=payload)
+            if response.status_code == 200:
+                results = parse_batch(response.json(), ids)
+            else:
+                print(f"Gemini API error: {response.status_code} ({len(batch)} solutions)")
+        except Exception as e:
+            print(f"Complexity batch error ({len(batch)} solutions): {e}")
+
+        retry = []
+        try:
+            retry = self.settle(batch, results)
+        finally:
+            with self.condition:
+                self.pending.extendleft(reversed(retry))
+                self.in_flight -= 1
+                self.condition.notify_all()
+
+    def close(self):
+        """Stop the dispatcher once queued solutions and their retries are sent"""
+        with self.condition:
+            dispatcher, pool = self.dispatcher, self.pool
+            self.dispatcher = None
+            self.closed = True
+            self.condition.notify_all()
+        if dispatcher:
+            dispatcher.join()
+            pool.shutdown(wait=True)
+
+
+class AsyncComplexityBatcher(BatchQueue):
+    """ComplexityBatcher for the event loop: batches are sent as tasks over an AsyncHttpClient"""
+
+    def __init__(self, http, gemini_base, api_key, batch_size=8, linger=0.5, max_attempts=3):
+        super().__init__(gemini_base, api_key, batch_size, linger, max_attempts)
+        self.http = http
+        self.timer = None
+        self.tasks = set()
+
+    @classmethod
+    def from_batcher(cls, batcher, http):
+        """Mirror a ComplexityBatcher's endpoint and batching policy over an AsyncHttpClient"""
+        return cls(http, batcher.gemini_base, batcher.api_key, batcher.batch_size, batcher.linger, batcher.max_attempts)
+
+    async def analyze(self, code, lang):
+        """Complexity result of one solution, or None"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(BatchJob(code, lang, future))
+        self.schedule()
+        return await future
+
+    def schedule(self):
+        """Send full batches now and a partial one after the linger time"""
+        while len(self.pending) >= self.batch_size:
+            self.start(self.take())
+        if self.pending and self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.linger, self.flush)
+
+    def flush(self):
+        self.timer = None
+        while self.pending:
+            self.start(self.take())
+
+    def start(self, batch):
+        task = asyncio.ensure_future(self.send(batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def send(self, batch):
+        url, payload, ids = self.request(batch)
+        count('gemini.batches')
+        count('gemini.solutions', len(batch))
+        results = {}
+        try:
+            with span('gemini'):
+                response = await self.http.post(url, json=payload)
+            if response.status_code == 200:
+                results = parse_batch(response.json(), ids)
+            else:
+                print(f"Gemini API error: {response.status_code} ({len(batch)} solutions)")
+        except Exception as e:
+            print(f"Complexity batch error ({len(batch)} solutions): {e}")
+
+        retry = self.settle(batch, results)
+        if retry:
+            self.pending.extendleft(reversed(retry))
+            self.schedule()
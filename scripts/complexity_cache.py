@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Complexity Analysis Cache
+Content-addressed store of Gemini complexity results so unchanged solutions
+are never sent for analysis twice
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from profiling import count
+
+
+class ComplexityCache:
+    FIELDS = ('time_complexity', 'space_complexity', 'time_explanation', 'space_explanation')
+
+    def __init__(self, path, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.entries = self.load()
+
+    @staticmethod
+    def normalize_code(code):
+        """Ignore line endings, trailing whitespace and surrounding blank lines"""
+        lines = (code or '').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+    @classmethod
+    def make_key(cls, code, lang, prompt_version):
+        """Hash of prompt version, language and normalized code"""
+        digest = hashlib.sha256()
+        for part in (str(prompt_version), lang.lower(), cls.normalize_code(code)):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def load(self):
+        """Load cached entries, starting empty if the file is missing or corrupt"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        """Return the cached result for `key` and mark it recently used"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                count('complexity_cache.misses')
+                return None
+            count('complexity_cache.hits')
+            entry['used'] = int(time.time())
+            self.dirty = True
+            return {field: entry[field] for field in self.FIELDS}
+
+    def put(self, key, result):
+        """Store the parsed complexity fields of a successful analysis"""
+        with self.lock:
+            entry = {field: result.get(field, '') for field in self.FIELDS}
+            entry['used'] = int(time.time())
+            self.entries[key] = entry
+            self.dirty = True
+
+    def save(self):
+        """Evict least recently used entries over the limit and write atomically"""
+        with self.lock:
+            if not self.dirty:
+                return
+            if len(self.entries) > self.max_entries:
+                newest = sorted(self.entries.items(), key=lambda item: item[1]['used'], reverse=True)
+                self.entries = dict(newest[:self.max_entries])
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
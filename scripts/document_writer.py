@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Diff-Aware Document Writer
+Builds generated files in memory and replaces them atomically only when their
+content changed, ignoring the volatile "_Last updated: ..._" footer
+"""
+
+import hashlib
+import io
+import os
+import re
+
+from profiling import count
+
+
+VOLATILE_LINES = re.compile(r'^_Last updated: .*_$', re.MULTILINE)
+
+
+def content_digest(text):
+    """Hash of a document with its volatile lines blanked out"""
+    return hashlib.sha256(VOLATILE_LINES.sub('', text).encode('utf-8')).hexdigest()
+
+
+def write_if_changed(path, content):
+    """Atomically replace `path` with `content` unless it is effectively unchanged, returns True if written"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if content_digest(f.read()) == content_digest(content):
+                count('files.unchanged')
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    data = content.encode('utf-8')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    count('files.written')
+    count('files.bytes_written', len(data))
+    return True
+
+
+class DocumentWriter:
+    """File-like buffer used as `with DocumentWriter(path) as f:`; `changed` tells whether the file was written"""
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = io.StringIO()
+        self.changed = False
+
+    def write(self, text):
+        return self.buffer.write(text)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.changed = write_if_changed(self.path, self.buffer.getvalue())
+        return False
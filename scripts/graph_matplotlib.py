@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Matplotlib Graph Backend
+Renders performance.png charts with Matplotlib's object-oriented Figure API;
+only imported when SYNC_GRAPH_BACKEND=matplotlib
+"""
+
+from matplotlib.figure import Figure
+
+
+def render_percentile_graph(graph_path, runtime_percentile, memory_percentile, title):
+    """LeetCode chart: runtime and memory percentiles side by side"""
+    categories = ['Runtime', 'Memory']
+    percentiles = [runtime_percentile, memory_percentile]
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    bars = ax.bar(categories, percentiles, color=['#10B981', '#3B82F6'], width=0.5)
+
+    ax.set_ylabel('Percentile (%)', fontsize=12, fontweight='bold')
+    ax.set_title(f'Performance: {title}', fontsize=14, fontweight='bold', pad=20)
+    ax.set_ylim(0, 100)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    ax.set_axisbelow(True)
+
+    for bar, val in zip(bars, percentiles):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height,
+                f'{val:.1f}%',
+                ha='center', va='bottom', fontsize=11, fontweight='bold')
+
+    ax.axhline(y=50, color='red', linestyle='--', alpha=0.5, linewidth=1, label='Median (50%)')
+    ax.legend(loc='upper right')
+
+    fig.tight_layout()
+    fig.savefig(graph_path, dpi=150, bbox_inches='tight')
+
+
+def render_runtime_memory_graph(graph_path, time_ms, memory_kb, title):
+    """Codeforces chart: execution time and memory usage as two panels"""
+    fig = Figure(figsize=(12, 5))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Time graph
+    ax1.bar(['Execution Time'], [time_ms], color='#10B981', width=0.4)
+    ax1.set_ylabel('Time (ms)', fontsize=11, fontweight='bold')
+    ax1.set_title('Runtime', fontsize=12, fontweight='bold')
+    ax1.text(0, time_ms, f'{time_ms} ms', ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax1.grid(axis='y', alpha=0.3, linestyle='--')
+
+    # Memory graph
+    ax2.bar(['Memory Usage'], [memory_kb / 1024], color='#3B82F6', width=0.4)
+    ax2.set_ylabel('Memory (MB)', fontsize=11, fontweight='bold')
+    ax2.set_title('Memory', fontsize=12, fontweight='bold')
+    ax2.text(0, memory_kb / 1024, f'{memory_kb / 1024:.2f} MB', ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax2.grid(axis='y', alpha=0.3, linestyle='--')
+
+    fig.suptitle(f'Performance: {title}', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    fig.savefig(graph_path, dpi=150, bbox_inches='tight')
+
+
+# Rasterizing is CPU-bound, so batches are spread over worker processes
+PARALLEL = True
+
+RENDERERS = {
+    'percentile': render_percentile_graph,
+    'runtime_memory': render_runtime_memory_graph,
+}
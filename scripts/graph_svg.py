@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+SVG Graph Backend
+Writes the performance bar charts as small hand-built SVG documents from
+templates, with no Matplotlib import
+"""
+
+import math
+from string import Template
+from xml.sax.saxutils import escape
+
+
+DOCUMENT = Template(
+    '<svg xmlns="http://www.w3.org/2000/svg" width="$width" height="$height" viewBox="0 0 $width $height" '
+    'font-family="DejaVu Sans,Arial,sans-serif">\n'
+    '<rect width="100%" height="100%" fill="#fff"/>\n'
+    '<text x="$center" y="34" text-anchor="middle" font-size="20" font-weight="bold">$title</text>\n'
+    '$body</svg>\n'
+)
+PANEL_TITLE = Template(
+    '<text x="$x" y="$y" text-anchor="middle" font-size="16" font-weight="bold">$text</text>\n'
+)
+GRID_LINE = Template(
+    '<line x1="$x1" y1="$y" x2="$x2" y2="$y" stroke="#b0b0b0" stroke-opacity="0.3" stroke-dasharray="4 3"/>'
+    '<text x="$label_x" y="$label_y" text-anchor="end" font-size="12">$label</text>\n'
+)
+AXES = Template(
+    '<rect x="$x" y="$y" width="$w" height="$h" fill="none" stroke="#000"/>\n'
+    '<text transform="translate($label_x $label_y) rotate(-90)" text-anchor="middle" font-size="14" '
+    'font-weight="bold">$label</text>\n'
+)
+BAR = Template(
+    '<rect x="$x" y="$y" width="$w" height="$h" fill="$color"/>'
+    '<text x="$center" y="$value_y" text-anchor="middle" font-size="14" font-weight="bold">$value</text>'
+    '<text x="$center" y="$name_y" text-anchor="middle" font-size="13">$name</text>\n'
+)
+MEDIAN = Template(
+    '<line x1="$x1" y1="$y" x2="$x2" y2="$y" stroke="red" stroke-opacity="0.5" stroke-dasharray="6 4"/>'
+    '<text x="$text_x" y="$text_y" text-anchor="end" font-size="12" fill="#c33">Median (50%)</text>\n'
+)
+
+
+def fmt(value):
+    """Compact coordinate formatting keeps the documents small"""
+    return f'{value:.1f}'.rstrip('0').rstrip('.')
+
+
+def nice_ticks(max_value, count=5):
+    """Evenly spaced round tick values covering 0..max_value"""
+    if max_value <= 0:
+        return [0, 1]
+    raw = max_value / count
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    top = math.ceil(max_value * 1.05 / step) * step
+    return [round(i * step, 10) for i in range(int(round(top / step)) + 1)]
+
+
+def panel(x, y, w, h, bars, ticks, ylabel, title=None, median=None):
+    """One set of axes: gridlines, bars with value labels and optional median line"""
+    parts = []
+    top = ticks[-1] or 1
+
+    def to_y(value):
+        return y + h - (value / top) * h
+
+    for tick in ticks:
+        label = f'{tick:g}'
+        parts.append(GRID_LINE.substitute(x1=fmt(x), x2=fmt(x + w), y=fmt(to_y(tick)),
+                                          label_x=fmt(x - 8), label_y=fmt(to_y(tick) + 4), label=label))
+    parts.append(AXES.substitute(x=fmt(x), y=fmt(y), w=fmt(w), h=fmt(h), label=escape(ylabel),
+                                 label_x=fmt(x - 48), label_y=fmt(y + h / 2)))
+    if title:
+        parts.append(PANEL_TITLE.substitute(x=fmt(x + w / 2), y=fmt(y - 12), text=escape(title)))
+
+    slot = w / len(bars)
+    for i, (name, value, color, text) in enumerate(bars):
+        bar_width = slot * 0.5
+        left = x + slot * i + (slot - bar_width) / 2
+        bar_top = to_y(max(0, value))
+        parts.append(BAR.substitute(x=fmt(left), y=fmt(bar_top), w=fmt(bar_width), h=fmt(y + h - bar_top),
+                                    color=color, center=fmt(left + bar_width / 2), value_y=fmt(bar_top - 6),
+                                    value=escape(text), name_y=fmt(y + h + 20), name=escape(name)))
+
+    if median is not None:
+        parts.append(MEDIAN.substitute(x1=fmt(x), x2=fmt(x + w), y=fmt(to_y(median)),
+                                       text_x=fmt(x + w - 8), text_y=fmt(to_y(median) - 6)))
+    return ''.join(parts)
+
+
+def write_document(graph_path, width, height, title, body):
+    document = DOCUMENT.substitute(width=width, height=height, center=fmt(width / 2),
+                                   title=escape(title), body=body)
+    with open(graph_path, 'w', encoding='utf-8') as f:
+        f.write(document)
+
+
+def render_percentile_graph(graph_path, runtime_percentile, memory_percentile, title):
+    """LeetCode chart: runtime and memory percentiles side by side"""
+    bars = [
+        ('Runtime', runtime_percentile, '#10B981', f'{runtime_percentile:.1f}%'),
+        ('Memory', memory_percentile, '#3B82F6', f'{memory_percentile:.1f}%'),
+    ]
+    body = panel(80, 70, 690, 370, bars, [0, 20, 40, 60, 80, 100], 'Percentile (%)', median=50)
+    write_document(graph_path, 800, 480, f'Performance: {title}', body)
+
+
+def render_runtime_memory_graph(graph_path, time_ms, memory_kb, title):
+    """Codeforces chart: execution time and memory usage as two panels"""
+    memory_mb = memory_kb / 1024
+    body = panel(90, 90, 460, 340, [('Execution Time', time_ms, '#10B981', f'{time_ms} ms')],
+                 nice_ticks(time_ms), 'Time (ms)', title='Runtime')
+    body += panel(700, 90, 460, 340, [('Memory Usage', memory_mb, '#3B82F6', f'{memory_mb:.2f} MB')],
+                  nice_ticks(memory_mb), 'Memory (MB)', title='Memory')
+    write_document(graph_path, 1200, 480, f'Performance: {title}', body)
+
+
+# Writing a few kilobytes of text is cheaper than starting worker processes
+PARALLEL = False
+
+RENDERERS = {
+    'percentile': render_percentile_graph,
+    'runtime_memory': render_runtime_memory_graph,
+}
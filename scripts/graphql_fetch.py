@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+GraphQL Fetch Engine
+Resolves many LeetCode GraphQL lookups concurrently with bounded parallelism,
+merging them into aliased batch documents to cut the request count; resolved
+lookups are cached one by one, since batches rarely repeat but items do
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import count
+
+
+PROBLEM_FIELDS = """
+    questionId
+    questionFrontendId
+    title
+    difficulty
+"""
+
+SUBMISSION_FIELDS = """
+    runtime
+    runtimePercentile
+    memory
+    memoryPercentile
+"""
+
+PROBLEM_QUERY = """
+query questionTitle($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {""" + PROBLEM_FIELDS + """  }
+}
+"""
+
+SUBMISSION_QUERY = """
+query submissionDetails($submissionId: Int!) {
+  submissionDetails(submissionId: $submissionId) {""" + SUBMISSION_FIELDS + """  }
+}
+"""
+
+# kind -> (root field, argument name, argument type, selected fields)
+LOOKUP_FIELDS = {
+    'problem': ('question', 'titleSlug', 'String!', PROBLEM_FIELDS),
+    'submission': ('submissionDetails', 'submissionId', 'Int!', SUBMISSION_FIELDS),
+}
+
+
+def parse_problem(node):
+    """Return the question object, or None if LeetCode had no match"""
+    return node or None
+
+
+def parse_submission(node):
+    """Extract percentiles from a submissionDetails object"""
+    if node:
+        return {
+            'runtime_percentile': node.get('runtimePercentile'),
+            'memory_percentile': node.get('memoryPercentile')
+        }
+    return None
+
+
+def build_batch_query(lookups):
+    """Merge [(kind, value), ...] into one aliased document, returns (query, variables, aliases)"""
+    declarations = []
+    selections = []
+    variables = {}
+    aliases = {}
+
+    for i, (kind, value) in enumerate(lookups):
+        field, argument, argument_type, fields = LOOKUP_FIELDS[kind]
+        alias = f"q{i}"
+        declarations.append(f"${alias}: {argument_type}")
+        selections.append(f"  {alias}: {field}({argument}: ${alias}) {{{fields}  }}")
+        variables[alias] = value
+        aliases[alias] = (kind, value)
+
+    query = "query batch(" + ", ".join(declarations) + ") {\n" + "\n".join(selections) + "\n}\n"
+    return query, variables, aliases
+
+
+def detail_lookups(title_slugs, submission_ids):
+    return [('problem', title_slug) for title_slug in title_slugs] + \
+        [('submission', submission_id) for submission_id in submission_ids]
+
+
+def split_details(results):
+    """Split {(kind, value): node} into parsed problem and submission dicts"""
+    problems = {}
+    submissions = {}
+    for (kind, value), node in results.items():
+        if kind == 'problem':
+            problems[value] = parse_problem(node)
+        else:
+            submissions[value] = parse_submission(node)
+    return problems, submissions
+
+
+def cached_lookups(cache, graphql_url, lookups):
+    """Split lookups into {(kind, value): node} found in the response cache and those still to fetch"""
+    lookups = list(dict.fromkeys(lookups))
+    if not cache:
+        return {}, lookups
+
+    found = {}
+    missing = []
+    for lookup in lookups:
+        node = cache.get_json(cache.make_key('POST', graphql_url, body=list(lookup)))
+        if node is None:
+            missing.append(lookup)
+        else:
+            found[lookup] = node
+    count('graphql.cached', len(found))
+    count('graphql.fetched', len(missing))
+    return found, missing
+
+
+def is_final(kind, node):
+    """Problem metadata never changes; submission percentiles are final once LeetCode has filled in both"""
+    if kind == 'submission':
+        return node.get('runtimePercentile') is not None and node.get('memoryPercentile') is not None
+    return True
+
+
+def store_lookups(cache, graphql_url, results):
+    """Cache resolved nodes that can no longer change, so pending percentiles are fetched again"""
+    if not cache:
+        return
+    for lookup, node in results.items():
+        if node and is_final(lookup[0], node):
+            cache.put_json(cache.make_key('POST', graphql_url, body=list(lookup)), graphql_url, node)
+
+
+def make_batches(lookups, batch_size):
+    lookups = list(dict.fromkeys(lookups))
+    return [lookups[i:i + batch_size] for i in range(0, len(lookups), batch_size)]
+
+
+class GraphQLFetcher:
+    def __init__(self, http, graphql_url, max_workers=8, timeout=15, batch_size=20, cache=None):
+        self.http = http
+        self.graphql_url = graphql_url
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+
+    def post(self, query, variables):
+        """Run one GraphQL query, returns the `data` object or None"""
+        payload = {
+            'query': query,
+            'variables': variables
+        }
+
+        try:
+            response = self.http.post(self.graphql_url, json=payload, timeout=self.timeout)
+            data = response.json()
+            return data.get('data')
+        except Exception as e:
+            print(f"GraphQL request failed: {e}")
+            return None
+
+    def fetch_batch(self, lookups):
+        """Resolve one batch of lookups with a single request, returns {(kind, value): node}"""
+        query, variables, aliases = build_batch_query(lookups)
+        data = self.post(query, variables) or {}
+        return {lookup: data.get(alias) for alias, lookup in aliases.items()}
+
+    def fetch_all(self, lookups):
+        """Resolve [(kind, value), ...] in parallel batches, returns {(kind, value): node}"""
+        batches = make_batches(lookups, self.batch_size)
+        if not batches:
+            return {}
+
+        results = {}
+        workers = min(self.max_workers, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch_result in pool.map(self.fetch_batch, batches):
+                results.update(batch_result)
+        return results
+
+    def fetch_details(self, title_slugs, submission_ids):
+        """Fetch problem and submission details together, returns two dicts"""
+        results, missing = cached_lookups(self.cache, self.graphql_url, detail_lookups(title_slugs, submission_ids))
+        fetched = self.fetch_all(missing)
+        store_lookups(self.cache, self.graphql_url, fetched)
+        results.update(fetched)
+        return split_details(results)
+
+
+class AsyncGraphQLFetcher:
+    """GraphQLFetcher over an AsyncHttpClient; batches are awaited together on the event loop"""
+
+    def __init__(self, http, graphql_url, timeout=15, batch_size=20, cache=None):
+        self.http = http
+        self.graphql_url = graphql_url
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+
+    async def post(self, query, variables):
+        """Run one GraphQL query, returns the `data` object or None"""
+        payload = {
+            'query': query,
+            'variables': variables
+        }
+
+        try:
+            response = await self.http.post(self.graphql_url, json=payload, timeout=self.timeout)
+            data = response.json()
+            return data.get('data')
+        except Exception as e:
+            print(f"GraphQL request failed: {e}")
+            return None
+
+    async def fetch_batch(self, lookups):
+        query, variables, aliases = build_batch_query(lookups)
+        data = await self.post(query, variables) or {}
+        return {lookup: data.get(alias) for alias, lookup in aliases.items()}
+
+    async def fetch_all(self, lookups):
+        """Resolve every batch concurrently; the client's per-host semaphore bounds parallelism"""
+        results = {}
+        for batch_result in await asyncio.gather(*(self.fetch_batch(batch) for batch in make_batches(lookups, self.batch_size))):
+            results.update(batch_result)
+        return results
+
+    async def fetch_details(self, title_slugs, submission_ids):
+        results, missing = cached_lookups(self.cache, self.graphql_url, detail_lookups(title_slugs, submission_ids))
+        fetched = await self.fetch_all(missing)
+        store_lookups(self.cache, self.graphql_url, fetched)
+        results.update(fetched)
+        return split_details(results)
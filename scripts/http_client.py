@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+Keeps one pooled keep-alive session per host with prepared auth headers,
+cookies, per-host rate limits, a uniform timeout/retry policy and an optional
+response cache for both sync scripts
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from profiling import count, span
+from rate_limit import backoff_delay, retry_after_seconds
+from response_cache import CachingStream
+
+
+# Transient server errors are retried inside urllib3; throttling responses are
+# handled here so the whole host's bucket slows down, not just one request
+RETRY_STATUSES = (500, 502, 504)
+THROTTLE_STATUSES = (429, 503)
+
+
+class HttpClient:
+    def __init__(self, timeout=30, retries=3, backoff=1.0, pool_size=10, limiter=None, cache=None):
+        self.timeout = timeout
+        self.limiter = limiter
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.host_defaults = {}
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def configure_host(self, host, headers=None, cookies=None):
+        """Register headers and cookies sent with every request to `host`"""
+        self.host_defaults[host] = (headers or {}, cookies or {})
+        with self.lock:
+            self.sessions.pop(host, None)
+
+    def create_session(self, host):
+        """Build a keep-alive session with the retry policy and host defaults"""
+        session = requests.Session()
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # GraphQL and Gemini POSTs are safe to repeat
+            respect_retry_after_header=False,  # 429/503 go through the rate limiter
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        headers, cookies = self.host_defaults.get(host, ({}, {}))
+        session.headers.update(headers)
+        session.cookies.update(cookies)
+        return session
+
+    def session_for(self, url):
+        """Return the pooled session for the URL's host, creating it on first use"""
+        host = urlsplit(url).hostname
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = self.sessions[host] = self.create_session(host)
+            return session
+
+    def request(self, method, url, revalidate=False, **kwargs):
+        """Send a request, answering from the response cache when the endpoint is cached;
+        `revalidate` skips the stored copy's TTL but still sends its validators"""
+        cacheable, ttl = self.cache.rule_for(url) if self.cache else (False, 0)
+        if not cacheable:
+            return self.send(method, url, **kwargs)
+
+        key = self.cache.make_key(method, url, kwargs.get('params'), kwargs.get('json', kwargs.get('data')))
+        entry = self.cache.lookup(key)
+        if entry:
+            cached = self.cache.response(key, entry) if not revalidate and self.cache.is_fresh(entry, ttl) else None
+            if cached:
+                count('http_cache.hits')
+                return cached
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **self.cache.conditional_headers(entry))
+
+        response = self.send(method, url, **kwargs)
+        if response.status_code == 304 and entry:
+            cached = self.cache.response(key, entry)
+            if cached:
+                count('http_cache.revalidated')
+                response.close()
+                self.cache.revalidated(key)
+                return cached
+        count('http_cache.misses')
+        if not self.cache.storable(response, ttl):
+            return response
+
+        if kwargs.get('stream'):
+            return CachingStream(response, self.cache, key, url)
+        self.cache.store(key, url, response.headers, response.content)
+        return response
+
+    def send(self, method, url, **kwargs):
+        """Send a request through the host's session, paced by its rate limit"""
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session_for(url)
+        bucket = self.limiter.bucket_for(url) if self.limiter else None
+
+        for attempt in range(self.retries + 1):
+            if bucket:
+                with span('http.rate_limit_wait'):
+                    bucket.acquire()
+            with span('http'):
+                response = session.request(method, url, **kwargs)
+            self.record(response, kwargs.get('stream'))
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.retries:
+                return response
+
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = backoff_delay(attempt, self.backoff)
+            count('http.retries')
+            count('http.throttled')
+            print(f"Throttled by {urlsplit(url).hostname} ({response.status_code}), backing off {delay:.1f}s")
+            response.close()  # Release the connection of a streamed response
+            if bucket:
+                bucket.pause(delay)
+            else:
+                time.sleep(delay)
+        return response
+
+    @staticmethod
+    def record(response, stream=False):
+        """Count a response, the urllib3 retries behind it and its body size (announced size if streamed)"""
+        count('http.requests')
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None and retries.history:
+            count('http.retries', len(retries.history))
+        size = int(response.headers.get('Content-Length') or 0) if stream else len(response.content)
+        count('http.bytes_received', size)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close every pooled session"""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Parsing
+Incrementally decodes the elements of one array inside a top-level JSON
+object, so large API responses are processed without materializing them
+"""
+
+import codecs
+import json
+
+
+WHITESPACE = ' \t\n\r'
+
+
+class JsonArrayStream:
+    """Iterate over `object[key]` from byte chunks; other top-level members land in `meta`"""
+
+    def __init__(self, chunks, key):
+        self.chunks = iter(chunks)
+        self.key = key
+        self.meta = {}
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+        """Append the next chunk to the buffer, returns False at end of stream"""
+        if self.exhausted:
+            return False
+        # Drop consumed text so the buffer stays around one element in size
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer += self.text_decoder.decode(chunk)
+                return True
+        self.buffer += self.text_decoder.decode(b'', final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of stream"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of streamed JSON")
+        self.pos += 1
+
+    def value(self):
+        """Decode one complete JSON value, reading more input while it is truncated"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.exhausted:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+    def __iter__(self):
+        self.expect('{')
+        while True:
+            char = self.peek()
+            if char == '}':
+                self.pos += 1
+                return
+            if char == ',':
+                self.pos += 1
+                continue
+
+            key = self.value()
+            self.expect(':')
+            if key != self.key:
+                self.meta[key] = self.value()
+                continue
+
+            self.expect('[')
+            while True:
+                char = self.peek()
+                if char == ']':
+                    self.pos += 1
+                    break
+                if char == ',':
+                    self.pos += 1
+                    continue
+                yield self.value()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Performance Graph Rendering
+Dispatches pending charts to the configured backend: dependency-free SVG by
+default, or Matplotlib PNGs drawn in parallel worker processes
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from profiling import count, span
+
+
+# Bump when the chart layout changes so every graph is redrawn once
+GRAPH_VERSION = 1
+GRAPH_BASENAME = 'performance'
+BACKENDS = {
+    'svg': 'graph_svg',
+    'matplotlib': 'graph_matplotlib',
+}
+BACKEND = os.getenv('SYNC_GRAPH_BACKEND', 'svg').strip().lower() or 'svg'
+if BACKEND not in BACKENDS:
+    print(f"Unknown SYNC_GRAPH_BACKEND '{BACKEND}', using svg")
+    BACKEND = 'svg'
+EXTENSIONS = {'svg': 'svg', 'matplotlib': 'png'}
+LABELS = {'svg': 'SVG', 'matplotlib': 'Matplotlib'}
+
+
+def load_backend(name):
+    """Import a backend module on first use"""
+    return importlib.import_module(BACKENDS[name])
+
+
+def graph_job(kind, folder_path, *metrics):
+    """Describe one pending graph as a picklable (backend, kind, path, metrics) tuple"""
+    filename = f'{GRAPH_BASENAME}.{EXTENSIONS[BACKEND]}'
+    return (BACKEND, kind, os.path.join(folder_path, filename), metrics)
+
+
+def graph_fingerprint(job):
+    """Hash of the backend, chart kind, its inputs and the layout version"""
+    backend, kind, _, metrics = job
+    payload = json.dumps([GRAPH_VERSION, backend, kind, list(metrics)], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def remove_stale_graphs(graph_path):
+    """Delete graphs left behind by the other backends"""
+    folder_path = os.path.dirname(graph_path)
+    for extension in set(EXTENSIONS.values()):
+        stale_path = os.path.join(folder_path, f'{GRAPH_BASENAME}.{extension}')
+        if stale_path != graph_path and os.path.exists(stale_path):
+            os.remove(stale_path)
+
+
+def render_job(job):
+    """Render one graph, returns (path, success, error message)"""
+    backend, kind, graph_path, metrics = job
+    try:
+        load_backend(backend).RENDERERS[kind](graph_path, *metrics)
+        remove_stale_graphs(graph_path)
+        return graph_path, True, None
+    except Exception as e:
+        return graph_path, False, str(e)
+
+
+class GraphRenderer:
+    """Renders graph jobs within a CPU budget, in a shared process pool for backends that benefit from it"""
+
+    def __init__(self, max_workers=None, cpu_slots=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cpu_slots = cpu_slots or threading.BoundedSemaphore(self.max_workers)
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def render(self, job):
+        """Render one job, returns True on success"""
+        with self.cpu_slots, span(f'render.{job[0]}'):
+            if load_backend(job[0]).PARALLEL and self.max_workers > 1:
+                with self.lock:
+                    if self.pool is None:
+                        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                graph_path, success, error = self.pool.submit(render_job, job).result()
+            else:
+                graph_path, success, error = render_job(job)
+
+        if success:
+            count('graphs.rendered')
+            print(f"✓ Performance graph created: {graph_path}")
+        else:
+            count('graphs.failed')
+            print(f"Error creating graph {graph_path}: {error}")
+        return success
+
+    def close(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
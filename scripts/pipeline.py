@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Sync Pipeline
+Stage threads connected by bounded queues, plus the network, analysis and CPU
+resources that one or more syncers share during a run
+"""
+
+import os
+import queue
+import threading
+from urllib.parse import urlsplit
+
+from complexity_batch import ComplexityBatcher
+from complexity_cache import ComplexityCache
+from http_client import HttpClient
+from performance_graphs import GraphRenderer
+from profiling import span
+from rate_limit import RateLimiter
+from response_cache import ResponseCache
+
+
+DONE = object()
+
+
+class Pipeline:
+    """Feed items from a source through stages of worker threads; each stage may drop an item by returning None"""
+
+    def __init__(self, name, maxsize=32):
+        self.name = name
+        self.maxsize = maxsize
+        self.stages = []
+
+    def add_stage(self, name, func, workers=1):
+        self.stages.append((name, func, max(1, workers)))
+        return self
+
+    def run(self, source):
+        """Run the source and all stages to completion, returns the last stage's results in source order;
+        the first error stops the source and is re-raised once in-flight items are done"""
+        queues = [queue.Queue(self.maxsize) for _ in self.stages]
+        results = []
+        errors = []
+        stop = threading.Event()
+
+        def put(q, entry):
+            while not stop.is_set():
+                try:
+                    q.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                items = enumerate(source)
+                while True:
+                    with span(f'{self.name}.source'):
+                        entry = next(items, DONE)
+                    if entry is DONE or not put(queues[0], entry):
+                        break
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                for _ in range(self.stages[0][2]):
+                    queues[0].put(DONE)
+
+        def work(position, stage_name, func):
+            is_last = position == len(self.stages) - 1
+            while True:
+                entry = queues[position].get()
+                if entry is DONE:
+                    return
+                seq, item = entry
+                try:
+                    with span(f'{self.name}.{stage_name}'):
+                        result = func(item)
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+                    continue
+                if result is None:
+                    continue
+                if is_last:
+                    results.append((seq, result))
+                else:
+                    # Items already in flight still finish after an error, so
+                    # later stages such as checkpoints see all completed work
+                    queues[position + 1].put((seq, result))
+
+        producer = threading.Thread(target=produce, name=f'{self.name}-source', daemon=True)
+        producer.start()
+        stage_threads = []
+        for position, (stage_name, func, workers) in enumerate(self.stages):
+            threads = [
+                threading.Thread(target=work, args=(position, stage_name, func), name=f'{self.name}-{stage_name}',
+                                 daemon=True)
+                for _ in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append(threads)
+
+        # Shut stages down in order once everything upstream has finished
+        producer.join()
+        for position, threads in enumerate(stage_threads):
+            for thread in threads:
+                thread.join()
+            if position + 1 < len(self.stages):
+                for _ in range(self.stages[position + 1][2]):
+                    queues[position + 1].put(DONE)
+
+        if errors:
+            raise errors[0]
+        return [result for _, result in sorted(results, key=lambda entry: entry[0])]
+
+
+class SyncResources:
+    """Rate limits, HTTP sessions and their response cache, complexity cache, batched Gemini analysis and
+    CPU slots shared by the syncers of one run"""
+
+    def __init__(self, cache_dir=None, pool_size=10, cpu_workers=None):
+        self.cache_dir = cache_dir or os.environ.get('SYNC_CACHE_DIR', './.cache')
+        self.limiter = RateLimiter()
+        gemini_base = os.environ.get('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com')
+        self.limiter.configure(urlsplit(gemini_base).hostname, float(os.environ.get('GEMINI_RATE', 0.25)))
+        cache_mb = float(os.environ.get('SYNC_HTTP_CACHE_MB', 64))
+        self.http_cache = ResponseCache(os.path.join(self.cache_dir, 'http'), int(cache_mb * 1024 * 1024)) \
+            if cache_mb > 0 else None
+        self.http = HttpClient(
+            timeout=float(os.environ.get('SYNC_HTTP_TIMEOUT', 30)),
+            retries=int(os.environ.get('SYNC_HTTP_RETRIES', 3)),
+            pool_size=pool_size,
+            limiter=self.limiter,
+            cache=self.http_cache
+        )
+        self.complexity_cache = ComplexityCache(os.path.join(self.cache_dir, 'complexity.json'))
+
+        # One CPU budget for static analysis and graph rendering across platforms
+        self.cpu_workers = cpu_workers or int(os.environ.get('SYNC_RENDER_WORKERS', 0)) or os.cpu_count() or 1
+        self.cpu_slots = threading.BoundedSemaphore(self.cpu_workers)
+        self.renderer = GraphRenderer(self.cpu_workers, self.cpu_slots)
+        self.analysis_workers = int(os.environ.get('SYNC_ANALYSIS_WORKERS', 4))
+        self.queue_size = int(os.environ.get('SYNC_QUEUE_SIZE', 32))
+
+        # Solutions of both platforms share Gemini batches
+        gemini_api_key = os.environ.get('GEMINI_API_KEY')
+        if not gemini_api_key:
+            print("No Gemini API key found, complexity is only estimated offline")
+        self.complexity_batcher = ComplexityBatcher(
+            self.http,
+            gemini_base.rstrip('/'),
+            gemini_api_key,
+            batch_size=int(os.environ.get('SYNC_GEMINI_BATCH_SIZE', 8)),
+            linger=float(os.environ.get('SYNC_GEMINI_BATCH_WAIT', 0.5)),
+            workers=self.analysis_workers
+        )
+
+    def close(self):
+        """Persist the shared caches and release pooled connections and worker processes"""
+        self.complexity_batcher.close()
+        self.complexity_cache.save()
+        if self.http_cache:
+            self.http_cache.save()
+        self.renderer.close()
+        self.http.close()
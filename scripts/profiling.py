@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Sync Profiling
+Named timing spans and counters collected from every stage thread and the
+event loop; `--profile` writes them as a JSON report and `--cprofile` adds a
+cProfile dump covering all threads
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class Profiler:
+    """Span times are busy seconds summed over concurrent callers, so they can exceed the wall time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.spans = {}
+            self.counters = {}
+            self.started = time.perf_counter()
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            entry = self.spans.get(name)
+            if entry is None:
+                entry = self.spans[name] = {'seconds': 0.0, 'calls': 0, 'max_seconds': 0.0}
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        with self.lock:
+            return {
+                'wall_seconds': round(time.perf_counter() - self.started, 4),
+                'spans': {name: {'seconds': round(entry['seconds'], 4), 'calls': entry['calls'],
+                                 'max_seconds': round(entry['max_seconds'], 4)}
+                          for name, entry in sorted(self.spans.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+
+# One profiler per process; spans and counters are cheap enough to always record
+profiler = Profiler()
+
+
+def span(name):
+    return profiler.span(name)
+
+
+def count(name, amount=1):
+    profiler.count(name, amount)
+
+
+class ThreadProfiles:
+    """cProfile for the main thread plus one profile per thread started while it runs"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.main = cProfile.Profile()
+        self.profiles = []
+
+    def thread_hook(self, frame, event, arg):
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # Interpreters with a process-wide profiler already cover this thread
+        with self.lock:
+            self.profiles.append(profile)
+
+    def start(self):
+        threading.setprofile(self.thread_hook)
+        self.main.enable()
+
+    def stop(self, path):
+        """Merge every thread's stats into one pstats dump"""
+        self.main.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(self.main)
+        with self.lock:
+            for profile in self.profiles:
+                profile.disable()
+                stats.add(profile)
+        stats.dump_stats(path)
+
+
+def write_report(path, name):
+    report = dict(
+        {
+            'name': name,
+            'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+        },
+        **profiler.report()
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"Profile written to {path}")
+
+
+def run_profiled(name, run, description=None):
+    """Parse --profile / --cprofile and call `run()`, writing the reports even if it fails"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--profile', nargs='?', const=f'{name}-profile.json', metavar='REPORT',
+                        help=f'Write span times and counters as JSON (default {name}-profile.json)')
+    parser.add_argument('--cprofile', metavar='FILE',
+                        help='Also write a cProfile dump of all threads, readable with python -m pstats')
+    args = parser.parse_args()
+
+    profiles = ThreadProfiles() if args.cprofile else None
+    profiler.reset()
+    if profiles:
+        profiles.start()
+    try:
+        return run()
+    finally:
+        if profiles:
+            profiles.stop(args.cprofile)
+            print(f"cProfile dump written to {args.cprofile}")
+        if args.profile:
+            write_report(args.profile, name)
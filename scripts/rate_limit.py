@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+Token buckets per endpoint that pace requests near each service's limit and
+back off when the service answers 429/503
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token if one is available, otherwise return the seconds to wait before trying again"""
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def pause(self, delay):
+        """Hold every caller of this bucket for `delay` seconds"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.updated = self.blocked_until
+            self.tokens = 0
+
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets = {}
+
+    def configure(self, host, rate, burst=1):
+        """Limit requests to `host` to `rate` per second with bursts of `burst`"""
+        if host and rate > 0:
+            self.buckets[host] = TokenBucket(rate, burst)
+
+    def bucket_for(self, url):
+        """Bucket for the URL's host, or None for unlimited hosts"""
+        return self.buckets.get(urlsplit(url).hostname)
+
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Exponential backoff with jitter over the upper half of the window"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+README Templates
+Page and index layouts for both platforms, rendered from the shared records;
+index rows are rendered separately so unchanged ones can be reused
+"""
+
+import hashlib
+import json
+import re
+
+from performance_graphs import BACKEND, LABELS
+from template_engine import Template
+
+
+DIFFICULTY_EMOJI = {'Easy': '🟢', 'Medium': '🟡', 'Hard': '🔴'}
+
+
+def rating_emoji(rating):
+    if rating is None:
+        return '⚪'
+    if rating <= 1000:
+        return '🟢'
+    if rating <= 1300:
+        return '🔵'
+    if rating <= 1600:
+        return '🟣'
+    if rating <= 1900:
+        return '🟡'
+    return '🔴'
+
+
+HELPERS = {
+    'DIFFICULTY_EMOJI': DIFFICULTY_EMOJI,
+    'rating_emoji': rating_emoji,
+    'GRAPH_BACKEND': LABELS[BACKEND],
+}
+
+
+LEETCODE_PROBLEM = Template('leetcode_problem', """\
+# {{ problem.title }}
+
+**Difficulty:** {{ problem.difficulty }}
+
+**Problem Link:** [LeetCode](https://leetcode.com/problems/{{ problem.key }}/)
+
+**Status:** Accepted
+
+{% set performance = [(lang, sub.perf) for lang, sub in problem.solutions.items() if sub.perf.has_percentiles] %}
+{% set complexities = [(lang, sub.complexity) for lang, sub in problem.solutions.items() if sub.complexity] %}
+{% if graph_file and performance %}
+## Performance
+
+![Performance Graph](./{{ graph_file }})
+
+{% endif %}
+{% if any(perf.runtime_percentile > 0 or perf.memory_percentile > 0 for _, perf in performance) %}
+## Performance Metrics
+
+| Language | Runtime Percentile | Memory Percentile |
+|----------|-------------------|------------------|
+{% for lang, perf in performance %}
+| {{ lang.title() }} | {{ perf.runtime_percentile:.2f }}% | {{ perf.memory_percentile:.2f }}% |
+{% endfor %}
+
+{% endif %}
+{% if complexities %}
+## Complexity Analysis
+
+{% for lang, complexity in complexities %}
+### {{ lang.title() }}
+
+- **Time Complexity:** {{ complexity.time_complexity }}
+  - {{ complexity.time_explanation }}
+
+- **Space Complexity:** {{ complexity.space_complexity }}
+  - {{ complexity.space_explanation }}
+
+{% endfor %}
+{% endif %}
+""", ('problem', 'graph_file'), HELPERS)
+
+LEETCODE_ROW = Template('leetcode_row', """\
+{% set difficulty = problem.difficulty or 'Unknown' %}
+| {{ problem.number }} | [{{ problem.title }}](./{{ problem.folder }}) | {{ DIFFICULTY_EMOJI.get(difficulty, '⚪') }} {{ difficulty }} | {{ ' '.join(f'`{lang}`' for lang in problem.languages) }} |
+""", ('problem',), HELPERS)
+
+LEETCODE_INDEX = Template('leetcode_index', """\
+# 🚀 LeetCode Solutions
+
+My personal collection of LeetCode problem solutions, documenting my journey in mastering data structures and algorithms.
+
+## 📊 Progress Statistics
+
+**Total Problems Solved:** {{ total }}
+
+| Difficulty | Count |
+|------------|-------|
+| 🟢 Easy | {{ difficulty_count['Easy'] }} |
+| 🟡 Medium | {{ difficulty_count['Medium'] }} |
+| 🔴 Hard | {{ difficulty_count['Hard'] }} |
+
+**Languages Used:** {{ ', '.join(sorted(lang.title() for lang in languages)) }}
+
+## 📝 Problem List
+
+| # | Title | Difficulty | Solution |
+|---|-------|------------|----------|
+{{ ''.join(rows) }}\
+## 🔗 My Profile
+
+**LeetCode:** [My Profile](https://leetcode.com/u/gourangadassamrat/)
+
+## 📈 Features
+
+Each solution includes:
+- ✅ Problem statement and LeetCode link
+- 💻 Clean, well-commented code
+- ⏱️ Time complexity analysis
+- 💾 Space complexity analysis
+- 📊 Performance metrics (Runtime & Memory percentiles)
+- 📈 Visual performance graphs
+
+## 🛠️ Tech Stack
+
+- **Automated Sync:** GitHub Actions
+- **Complexity Analysis:** Google Gemini AI
+- **Visualization:** {{ GRAPH_BACKEND }}
+
+---
+
+_🎯 Consistency is key. Keep coding, keep learning!_ 💻
+
+_Last updated: {{ updated }}_
+""", ('total', 'difficulty_count', 'languages', 'rows', 'updated'), HELPERS)
+
+CODEFORCES_PROBLEM = Template('codeforces_problem', """\
+{% set submission = problem.latest %}
+# {{ problem.title }}
+
+**Contest ID:** {{ problem.contest_id }}
+
+**Index:** {{ problem.index }}
+
+**Rating:** {{ problem.rating_label }}
+
+**Problem Link:** [Codeforces](https://codeforces.com/problemset/problem/{{ problem.contest_id }}/{{ problem.index }})
+
+**Verdict:** {{ submission.verdict }}
+
+{% if problem.tags %}
+**Tags:** {{ ', '.join(f'`{tag}`' for tag in problem.tags) }}
+
+{% endif %}
+{% if graph_file %}
+## Performance
+
+![Performance Graph](./{{ graph_file }})
+
+{% endif %}
+## Performance Metrics
+
+| Metric | Value |
+|--------|-------|
+| Language | {{ submission.language }} |
+| Execution Time | {{ submission.perf.time_ms }} ms |
+| Memory Used | {{ submission.perf.memory_kb / 1024:.2f }} MB |
+| Submission Time | {{ submission.created }} |
+
+{% set complexity = submission.complexity %}
+{% if complexity %}
+## Complexity Analysis
+
+### {{ submission.language }}
+
+- **Time Complexity:** {{ complexity.time_complexity }}
+  - {{ complexity.time_explanation }}
+
+- **Space Complexity:** {{ complexity.space_complexity }}
+  - {{ complexity.space_explanation }}
+
+{% endif %}
+""", ('problem', 'graph_file'), HELPERS)
+
+CODEFORCES_ROW = Template('codeforces_row', """\
+| {{ problem.contest_id }} | {{ problem.index }} | [{{ problem.title }}](./{{ problem.folder }}) | {{ rating_emoji(problem.rating) }} {{ problem.rating_label }} | `{{ ', '.join(problem.languages) }}` |
+""", ('problem',), HELPERS)
+
+CODEFORCES_INDEX = Template('codeforces_index', """\
+# 🚀 Codeforces Solutions
+
+My personal collection of Codeforces problem solutions, showcasing competitive programming skills.
+
+## 📊 Progress Statistics
+
+**Total Problems Solved:** {{ total }}
+
+### By Rating
+
+| Rating Range | Count |
+|--------------|-------|
+{% for rating_range, count in rating_ranges.items() %}
+{% if count > 0 %}
+| {{ rating_range }} | {{ count }} |
+{% endif %}
+{% endfor %}
+
+**Languages Used:** {{ ', '.join(sorted(languages)) }}
+
+## 📝 Problem List
+
+| Contest | Index | Problem | Rating | Language |
+|---------|-------|---------|--------|----------|
+{{ ''.join(rows) }}
+## 🎯 Topics Covered
+
+{% if tags %}
+{% set tag_list = sorted(tags) %}
+{% for i in range(0, len(tag_list), 3) %}
+- {{ ' • '.join(tag_list[i:i + 3]) }}
+{% endfor %}
+{% else %}
+- Implementation
+- Math
+- Greedy
+- Dynamic Programming
+- Data Structures
+- Graph Theory
+{% endif %}
+
+## 🔗 My Profile
+
+**Codeforces:** [My Profile](https://codeforces.com/profile/{{ handle }})
+
+## 📈 Features
+
+Each solution includes:
+- ✅ Problem statement and Codeforces link
+- 💻 Clean, optimized code
+- ⏱️ Time complexity analysis
+- 💾 Space complexity analysis
+- 📊 Performance metrics (Runtime & Memory)
+- 📈 Visual performance graphs
+- 🏷️ Problem tags and ratings
+
+## 🛠️ Tech Stack
+
+- **Automated Sync:** GitHub Actions
+- **Complexity Analysis:** Google Gemini AI
+- **Visualization:** {{ GRAPH_BACKEND }}
+- **Data Source:** Codeforces API
+
+---
+
+_🎯 Practice makes perfect. Keep solving, keep improving!_ 💻
+
+_Last updated: {{ updated }}_
+""", ('total', 'rating_ranges', 'languages', 'tags', 'rows', 'handle', 'updated'), HELPERS)
+
+
+ROW_LINK = re.compile(r'^\|.*?\]\(\./([^)]+)\) \|', re.MULTILINE)
+
+
+def existing_rows(text):
+    """Map problem folder -> rendered index row from a previously written README"""
+    rows = {}
+    for match in ROW_LINK.finditer(text):
+        end = text.find('\n', match.start())
+        rows[match.group(1)] = text[match.start():] + '\n' if end == -1 else text[match.start():end + 1]
+    return rows
+
+
+def row_fingerprint(problem):
+    """Hash of the record fields shown in index rows"""
+    payload = json.dumps([problem.title, problem.folder, problem.number, problem.difficulty, problem.contest_id,
+                          problem.index, problem.rating, problem.languages])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def render_rows(row_template, problems, touched, index_path, fingerprints=None):
+    """Index rows in order and their fingerprints by problem key, re-rendering touched or previously missing
+    problems and those whose row fields changed since `fingerprints` were stored"""
+    cached = {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            cached = existing_rows(f.read())
+    except OSError:
+        pass
+
+    fingerprints = fingerprints or {}
+    rows = []
+    current = {}
+    rendered = 0
+    for problem in problems:
+        fingerprint = current[problem.key] = row_fingerprint(problem)
+        row = None
+        if touched is not None and problem.key not in touched and fingerprints.get(problem.key) == fingerprint:
+            row = cached.get(problem.folder)
+        if row is None:
+            row = row_template.render(problem)
+            rendered += 1
+        rows.append(row)
+    return rows, current, rendered
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Sync Records
+Compact __slots__ record types shared by both syncers and their README
+generators, with conversion to and from the persisted sync state
+"""
+
+import sys
+from datetime import datetime
+
+
+def intern(value):
+    """Intern short repeated strings such as languages, verdicts and tags"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def number_or_none(value, cast=float):
+    try:
+        return cast(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ComplexityResult:
+    __slots__ = ('time_complexity', 'space_complexity', 'time_explanation', 'space_explanation')
+
+    def __init__(self, time_complexity, space_complexity, time_explanation='', space_explanation=''):
+        self.time_complexity = intern(time_complexity)
+        self.space_complexity = intern(space_complexity)
+        self.time_explanation = time_explanation
+        self.space_explanation = space_explanation
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from an analysis result dict, or None when there is none"""
+        if not data:
+            return None
+        return cls(*(data.get(field, '') for field in cls.__slots__))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class PerfMetrics:
+    """Percentiles (LeetCode) and/or absolute usage (Codeforces); unknown values are None"""
+    __slots__ = ('runtime_percentile', 'memory_percentile', 'time_ms', 'memory_kb')
+
+    def __init__(self, runtime_percentile=None, memory_percentile=None, time_ms=None, memory_kb=None):
+        self.runtime_percentile = number_or_none(runtime_percentile)
+        self.memory_percentile = number_or_none(memory_percentile)
+        self.time_ms = number_or_none(time_ms, int)
+        self.memory_kb = number_or_none(memory_kb)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data.get(field) for field in cls.__slots__))
+
+    @property
+    def has_percentiles(self):
+        return self.runtime_percentile is not None and self.memory_percentile is not None
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__ if getattr(self, field) is not None}
+
+
+class Submission:
+    __slots__ = ('id', 'language', 'verdict', 'creation_time', 'code_hash', 'perf', 'complexity')
+
+    def __init__(self, id, language, verdict='OK', creation_time=0, code_hash=None, perf=None, complexity=None):
+        self.id = number_or_none(id, int)
+        self.language = intern(language)
+        self.verdict = intern(verdict)
+        self.creation_time = number_or_none(creation_time, int) or 0
+        self.code_hash = code_hash
+        self.perf = perf or PerfMetrics()
+        self.complexity = complexity
+
+    @classmethod
+    def from_dict(cls, language, data):
+        return cls(
+            data.get('submission_id'),
+            language,
+            data.get('verdict', 'OK'),
+            data.get('creation_time', 0),
+            data.get('hash'),
+            PerfMetrics.from_dict(data),
+            ComplexityResult.from_dict(data.get('complexity'))
+        )
+
+    @property
+    def created(self):
+        """Submission time formatted for READMEs"""
+        return datetime.fromtimestamp(self.creation_time).strftime('%Y-%m-%d %H:%M:%S')
+
+    def to_dict(self):
+        data = {'submission_id': self.id, 'verdict': self.verdict}
+        if self.creation_time:
+            data['creation_time'] = self.creation_time
+        if self.code_hash:
+            data['hash'] = self.code_hash
+        data.update(self.perf.to_dict())
+        if self.complexity:
+            data['complexity'] = self.complexity.to_dict()
+        return data
+
+
+class Problem:
+    """A solved problem and its newest accepted solution per language"""
+    __slots__ = ('key', 'title', 'folder', 'number', 'difficulty', 'contest_id', 'index',
+                 'rating', 'tags', 'graph', 'solutions')
+
+    def __init__(self, key, title, folder, number='', difficulty=None, contest_id=None, index=None,
+                 rating=None, tags=(), graph=None, solutions=None):
+        self.key = key
+        self.title = title
+        self.folder = folder
+        self.number = number
+        self.difficulty = intern(difficulty)
+        self.contest_id = number_or_none(contest_id, int)
+        self.index = intern(index)
+        self.rating = rating if isinstance(rating, int) else None
+        self.tags = tuple(intern(tag) for tag in tags)
+        self.graph = graph
+        self.solutions = solutions or {}
+
+    @classmethod
+    def from_dict(cls, key, data):
+        solutions = {
+            language: Submission.from_dict(language, record)
+            for language, record in data.get('solutions', {}).items()
+        }
+        return cls(
+            key,
+            data.get('title', ''),
+            data.get('folder', key),
+            data.get('number', ''),
+            data.get('difficulty'),
+            data.get('contest_id'),
+            data.get('index'),
+            data.get('rating'),
+            data.get('tags', ()),
+            data.get('graph'),
+            solutions
+        )
+
+    @property
+    def rating_label(self):
+        return str(self.rating) if self.rating else 'Unrated'
+
+    @property
+    def languages(self):
+        return sorted(self.solutions)
+
+    @property
+    def latest(self):
+        """The most recently recorded solution"""
+        return max(self.solutions.values(), key=lambda sub: (sub.creation_time, sub.id or 0), default=None)
+
+    def to_dict(self):
+        data = {'title': self.title, 'folder': self.folder}
+        for field in ('number', 'difficulty', 'contest_id', 'index', 'rating', 'graph'):
+            value = getattr(self, field)
+            if value is not None and value != '':
+                data[field] = value
+        if self.tags:
+            data['tags'] = list(self.tags)
+        data['solutions'] = {language: sub.to_dict() for language, sub in self.solutions.items()}
+        return data
+
+
+def load_problems(state):
+    """Problem records from a SyncState"""
+    return {key: Problem.from_dict(key, data) for key, data in state.data.get('problems', {}).items()}
+
+
+def store_problems(state, problems):
+    """Write Problem records back into a SyncState before saving"""
+    state.data['problems'] = {key: problem.to_dict() for key, problem in problems.items()}
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache
+Disk-backed store of response bodies keyed by method, URL and body hash, with
+per-endpoint TTLs, ETag / Last-Modified revalidation and size-bounded LRU
+eviction, so identical requests are not repeated between runs
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+# Response headers kept with a cached body
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified')
+
+
+class CachedResponse:
+    """Stored response exposing the parts of the requests API the syncers use"""
+
+    from_cache = True
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=65536):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code} for {self.url}")
+
+    def close(self):
+        pass
+
+
+class CachingStream:
+    """Wraps a streamed response, writing its body to a temp file in the cache as it is read and storing
+    it once read to the end, so the body is never held in memory"""
+
+    def __init__(self, response, cache, key, url):
+        self.response = response
+        self.cache = cache
+        self.key = key
+        self.url = url
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def iter_content(self, chunk_size=65536):
+        tmp_path = self.cache.temp_path(self.key)
+        size = 0
+        complete = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in self.response.iter_content(chunk_size=chunk_size):
+                    size += len(chunk)
+                    if size <= self.cache.max_bytes:
+                        f.write(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            # Bodies read only in part, or too large to keep, are not cached
+            if complete and size <= self.cache.max_bytes:
+                self.cache.commit(self.key, self.url, self.response.headers, tmp_path, size)
+            else:
+                self.cache.discard(tmp_path)
+
+    def close(self):
+        self.response.close()
+
+
+class ResponseCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+        self.max_bytes = max_bytes
+        self.rules = []
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.entries = self.load()
+        self.total_bytes = sum(entry['size'] for entry in self.entries.values())
+
+    def configure(self, prefix, ttl):
+        """Cache responses for URLs starting with `prefix` for `ttl` seconds (None: never expires,
+        0: always revalidate)"""
+        with self.lock:
+            self.rules = [rule for rule in self.rules if rule[0] != prefix]
+            self.rules.append((prefix, ttl))
+            self.rules.sort(key=lambda rule: len(rule[0]), reverse=True)
+
+    def rule_for(self, url):
+        """(cacheable, ttl) of the longest configured prefix matching `url`"""
+        for prefix, ttl in self.rules:
+            if url.startswith(prefix):
+                return True, ttl
+        return False, 0
+
+    @staticmethod
+    def make_key(method, url, params=None, body=None):
+        """Hash of method, URL, sorted query parameters and request body"""
+        if isinstance(body, bytes):
+            body = hashlib.sha256(body).hexdigest()
+        payload = json.dumps([method.upper(), url, params or {}, body], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def body_path(self, key):
+        return os.path.join(self.directory, key + '.body')
+
+    def load(self):
+        """Load the index, dropping body files it does not know about (left by a killed run)"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = OrderedDict(sorted(json.load(f).items(), key=lambda item: item[1]['used']))
+        except (OSError, ValueError, KeyError, TypeError):
+            entries = OrderedDict()
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith('.tmp') or (name.endswith('.body') and name[:-5] not in entries):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return entries
+
+    def lookup(self, key):
+        """Index entry for `key`, marking it recently used, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry['used'] = int(time.time())
+            self.entries.move_to_end(key)
+            self.dirty = True
+            return dict(entry)
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return ttl is None or time.time() - entry['stored'] < ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """If-None-Match / If-Modified-Since headers for revalidating a stored response"""
+        headers = {}
+        if entry['headers'].get('etag'):
+            headers['If-None-Match'] = entry['headers']['etag']
+        if entry['headers'].get('last-modified'):
+            headers['If-Modified-Since'] = entry['headers']['last-modified']
+        return headers
+
+    @staticmethod
+    def storable(response, ttl):
+        """Only successful responses that can be reused, either while fresh or via validators"""
+        if response.status_code != 200:
+            return False
+        return ttl != 0 or any(response.headers.get(name) for name in ('etag', 'last-modified'))
+
+    def read(self, key):
+        """Stored body for `key`, or None if it has gone missing"""
+        try:
+            with open(self.body_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            with self.lock:
+                entry = self.entries.pop(key, None)
+                if entry:
+                    self.total_bytes -= entry['size']
+                    self.dirty = True
+            return None
+
+    def response(self, key, entry):
+        """CachedResponse for a looked-up entry, or None if its body has gone missing"""
+        content = self.read(key)
+        if content is None:
+            return None
+        return CachedResponse(entry['url'], entry['status'], dict(entry['headers']), content)
+
+    def temp_path(self, key):
+        """Private file a body for `key` is written to before it is committed"""
+        os.makedirs(self.directory, exist_ok=True)
+        return f"{self.body_path(key)}.{threading.get_ident()}.tmp"
+
+    @staticmethod
+    def discard(tmp_path):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def store(self, key, url, headers, content, status=200):
+        """Write a body and index it, evicting least recently used entries over the size limit"""
+        if len(content) > self.max_bytes:
+            return
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        self.commit(key, url, headers, tmp_path, len(content), status)
+
+    def commit(self, key, url, headers, tmp_path, size, status=200):
+        """Move a completely written body into place and index it"""
+        os.replace(tmp_path, self.body_path(key))
+
+        now = int(time.time())
+        kept = {name: headers[name] for name in KEPT_HEADERS if headers.get(name)}
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous['size']
+            self.entries[key] = {'url': url, 'status': status, 'headers': kept,
+                                 'stored': now, 'used': now, 'size': size}
+            self.total_bytes += size
+            self.dirty = True
+            evicted = self.evict()
+        for old_key in evicted:
+            try:
+                os.remove(self.body_path(old_key))
+            except OSError:
+                pass
+
+    def evict(self):
+        """Drop least recently used entries until the total fits, returns their keys (lock held)"""
+        evicted = []
+        while self.total_bytes > self.max_bytes and self.entries:
+            old_key, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry['size']
+            evicted.append(old_key)
+        return evicted
+
+    def revalidated(self, key):
+        """A 304 confirmed the stored body, so it is fresh again"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                entry['stored'] = int(time.time())
+                self.dirty = True
+
+    def get_json(self, key):
+        """Stored JSON value for `key` (per-item entries), or None"""
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        content = self.read(key)
+        return json.loads(content) if content is not None else None
+
+    def put_json(self, key, url, value):
+        self.store(key, url, {'content-type': 'application/json'},
+                   json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+    def save(self):
+        """Write the index atomically"""
+        with self.lock:
+            if not self.dirty:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
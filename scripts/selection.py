@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Submission Selection
+Reduces a newest-first submission stream to one winning submission per
+solution key before any detail lookup, file write or analysis happens
+"""
+
+import os
+import re
+
+
+POLICIES = ('newest', 'fastest', 'lowest-memory')
+
+MEASURE = re.compile(r'([\d.]+)\s*([a-zA-Z]*)')
+RUNTIME_UNITS = {'': 1, 'ms': 1, 's': 1000}
+MEMORY_UNITS = {'': 1, 'b': 1 / 1024, 'kb': 1, 'mb': 1024, 'gb': 1024 * 1024}
+
+INF = float('inf')
+
+
+def selection_policy():
+    """Policy from SYNC_SELECTION_POLICY, validated"""
+    policy = os.environ.get('SYNC_SELECTION_POLICY', 'newest').strip().lower()
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown selection policy: {policy} (expected one of {', '.join(POLICIES)})")
+    return policy
+
+
+def parse_measure(value, units):
+    """Convert '12 ms' / '16.2 MB' style values (or plain numbers) to ms / KB, or None"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = MEASURE.match(str(value or '').strip())
+    if not match:
+        return None
+    factor = units.get(match.group(2).lower())
+    try:
+        return float(match.group(1)) * factor if factor is not None else None
+    except ValueError:
+        return None
+
+
+def parse_runtime(value):
+    return parse_measure(value, RUNTIME_UNITS)
+
+
+def parse_memory(value):
+    return parse_measure(value, MEMORY_UNITS)
+
+
+class SubmissionSelector:
+    """Keep one submission per key: the first seen (newest) or the best by runtime or memory.
+
+    `key(sub)` returns the solution key, or None for submissions that cannot win.
+    `metrics(sub)` returns (runtime_ms, memory_kb), either may be None.
+    `incumbent(key)` returns the metrics of the solution recorded by earlier runs,
+    which a new submission must beat under the ranked policies.
+    """
+
+    def __init__(self, policy, key, metrics, incumbent=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown selection policy: {policy}")
+        self.policy = policy
+        self.key = key
+        self.metrics = metrics
+        self.incumbent = incumbent
+        self.seen = set()
+        self.best = {}
+        self.offered = 0
+
+    def rank(self, metrics):
+        """Sort key under the policy; unknown values rank last"""
+        runtime, memory = metrics or (None, None)
+        runtime = INF if runtime is None else runtime
+        memory = INF if memory is None else memory
+        return (runtime, memory) if self.policy == 'fastest' else (memory, runtime)
+
+    def offer(self, sub):
+        """Consider the next (older) submission, returns winners that are already final"""
+        position = self.offered
+        self.offered += 1
+        key = self.key(sub)
+        if key is None:
+            return []
+
+        if self.policy == 'newest':
+            if key in self.seen:
+                return []
+            self.seen.add(key)
+            return [sub]
+
+        # Ties keep the newer submission, which was offered first
+        rank = self.rank(self.metrics(sub))
+        current = self.best.get(key)
+        if current is None or rank < current[0]:
+            self.best[key] = (rank, position, sub)
+        return []
+
+    def finish(self):
+        """Winners held back by a ranked policy, in stream order, that beat the recorded solutions"""
+        winners = []
+        for key, (rank, position, sub) in self.best.items():
+            incumbent = self.incumbent(key) if self.incumbent else None
+            if incumbent is not None and not rank < self.rank(incumbent):
+                continue
+            winners.append((position, sub))
+        self.best.clear()
+        return [sub for _, sub in sorted(winners, key=lambda winner: winner[0])]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Solution Files
+Finds the hand-written code in a Codeforces problem folder, whose solution is
+filled in after the sync created a placeholder for it
+"""
+
+import os
+
+from sync_state import SyncState
+
+
+PLACEHOLDER_MARKER = "Please add your solution code here"
+
+
+def is_placeholder(code):
+    return len(code) <= 200 or PLACEHOLDER_MARKER in code
+
+
+def read_solution(folder_path):
+    """(path, code) of the first solution file holding real code, or (None, None)"""
+    try:
+        names = sorted(name for name in os.listdir(folder_path) if name.startswith('solution.'))
+    except OSError:
+        return None, None
+    for name in names:
+        path = os.path.join(folder_path, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        if not is_placeholder(code):
+            return path, code
+    return None, None
+
+
+def solution_hash(folder_path):
+    """Hash of the folder's hand-written code, or None while it only holds placeholders"""
+    _, code = read_solution(folder_path)
+    return SyncState.content_hash(code) if code else None
@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+Static Complexity Estimator
+Offline Big-O estimate from loop nesting, recursion and auxiliary containers,
+used as a fast path before asking Gemini
+"""
+
+import ast
+import re
+
+
+# Costs are (linear factors, log factors): (2, 1) means O(n^2 log n)
+CONSTANT = (0, 0)
+LINEAR = (1, 0)
+LOGARITHMIC = (0, 1)
+SORT = (1, 1)
+
+PYTHON_LINEAR_CALLS = {'sum', 'max', 'min', 'any', 'all', 'list', 'set', 'dict', 'tuple', 'Counter', 'reversed'}
+PYTHON_LINEAR_METHODS = {'join', 'count', 'index', 'reverse', 'copy', 'split', 'replace', 'find', 'strip',
+                         'lstrip', 'rstrip'}
+PYTHON_CONTAINER_CALLS = {'list', 'dict', 'set', 'defaultdict', 'Counter', 'deque', 'OrderedDict', 'bytearray'}
+PYTHON_INSERT_METHODS = {'append', 'appendleft', 'add', 'extend', 'insert', 'update', 'setdefault', 'push'}
+PYTHON_CONSTANT_CALLS = {'len', 'abs', 'int', 'float', 'bool', 'str', 'ord', 'chr', 'print', 'range', 'enumerate',
+                         'zip', 'isinstance', 'divmod', 'pow', 'hash', 'round', 'iter', 'next', 'super', 'id', 'type'}
+PYTHON_CONSTANT_METHODS = {'append', 'appendleft', 'add', 'get', 'popleft', 'setdefault', 'items', 'keys', 'values',
+                           'discard', 'isdigit', 'isalpha', 'isalnum', 'isspace', 'islower', 'isupper', 'lower',
+                           'upper', 'startswith', 'endswith'}
+PYTHON_LOG_CALLS = {'heappush', 'heappop', 'heappushpop', 'heapreplace', 'bisect', 'bisect_left', 'bisect_right'}
+PYTHON_HASHED_CALLS = {'set', 'dict', 'frozenset', 'defaultdict', 'Counter', 'OrderedDict'}
+PYTHON_SEQUENCE_CALLS = {'list', 'str', 'tuple', 'sorted', 'deque', 'bytearray'}
+
+C_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'sizeof', 'do', 'else', 'function', 'new'}
+C_CALLBACK_LOOPS = {'forEach', 'map', 'filter', 'reduce', 'some', 'every', 'findIndex', 'flatMap',
+                    'for_each', 'transform', 'count_if', 'find_if', 'all_of', 'any_of', 'none_of'}
+C_LINEAR_CALLS = {'includes', 'indexOf', 'lastIndexOf', 'slice', 'split', 'join', 'reverse', 'substring',
+                  'substr', 'concat', 'fill', 'accumulate', 'from', 'copy', 'max_element',
+                  'min_element', 'to_string', 'repeat', 'replace', 'assign'}
+C_CONTAINERS = ('vector', 'unordered_map', 'map', 'set', 'unordered_set', 'multiset', 'multimap', 'stack',
+                'queue', 'deque', 'priority_queue', 'list', 'string', 'Map', 'Set', 'Array', 'ArrayList',
+                'HashMap', 'HashSet', 'Dictionary', 'List', 'StringBuilder')
+C_INSERT_METHODS = ('push_back', 'emplace_back', 'push', 'insert', 'emplace', 'add', 'set', 'put',
+                    'append', 'push_front', 'unshift', 'Add', 'Push', 'Enqueue')
+
+HALVING_PYTHON = (ast.FloorDiv, ast.Div, ast.RShift, ast.Mult, ast.LShift)
+HALVING_C = re.compile(r'(/=|>>=|\*=|<<=)\s*\w+|(/|>>)\s*\d+')
+SUBSCRIPT = r'\s*\[(?:[^\[\]]|\[[^\[\]]*\])*\]\s*=(?!=)'
+
+C_COMPARISONS = ('<', '>', '<=', '>=', '!=')
+C_SIZE_BOUND = re.compile(r'[A-Za-z_]\w*(?: \. (?:size|length|Length|count|Count|len)(?: \( \))?)?(?: [-+] \d\w*)?')
+C_NUMERIC = r'(?:\d\w*(?:\.\d\w*)?|[-+*/%()<>\s])+'
+
+BASE_CONFIDENCE = {'python': 0.9, 'c-family': 0.8}
+# Loops, calls and membership tests of unknown cost keep the estimate below the default Gemini cutoff
+UNCLEAR_CONFIDENCE = 0.7
+
+
+def add_cost(a, b):
+    return (a[0] + b[0], a[1] + b[1])
+
+
+def format_cost(cost):
+    """Render a (linear, log) cost as Big-O notation"""
+    linear, logs = cost
+    parts = []
+    if linear == 1:
+        parts.append('n')
+    elif linear > 1:
+        parts.append(f'n^{linear}')
+    if logs == 1:
+        parts.append('log n')
+    elif logs > 1:
+        parts.append(f'log^{logs} n')
+    return f"O({' '.join(parts) or '1'})"
+
+
+def describe_time(cost, sorts):
+    linear, logs = cost
+    if cost == CONSTANT:
+        return "No loop depends on the input size, so every step runs a constant number of times (static estimate)"
+    pieces = []
+    loops = linear - (1 if sorts and logs else 0)
+    if loops == 1:
+        pieces.append("a single linear loop")
+    elif loops > 1:
+        pieces.append(f"{loops} nested linear loops")
+    halving = logs - (1 if sorts and linear else 0)
+    if halving == 1:
+        pieces.append("a halving loop")
+    elif halving > 1:
+        pieces.append(f"{halving} nested halving loops")
+    if sorts and logs:
+        pieces.append("a sort")
+    return "The deepest path runs " + " around ".join(pieces) + " (static estimate)"
+
+
+def describe_space(degree, recursive):
+    if recursive:
+        return "Recursion depth grows with the input, using stack space (static estimate)"
+    if degree == 0:
+        return "Only a fixed number of scalar variables are allocated (static estimate)"
+    if degree == 1:
+        return "Auxiliary containers grow linearly with the input (static estimate)"
+    return f"Auxiliary containers nest {degree} levels deep, each sized by the input (static estimate)"
+
+
+def language_family(lang):
+    """Map LeetCode and Codeforces language names to an estimator"""
+    name = (lang or '').lower()
+    if 'python' in name or 'pypy' in name:
+        return 'python'
+    if any(key in name for key in ('c++', 'cpp', 'clang', 'java', 'javascript', 'typescript', 'node',
+                                   'c#', 'csharp', 'kotlin', 'go', 'rust', 'swift', 'php', 'scala')):
+        return 'c-family'
+    if name in ('c', 'gnu c11', 'gnu c', 'gnu c99'):
+        return 'c-family'
+    return None
+
+
+class PythonEstimator:
+    def __init__(self, tree):
+        self.tree = tree
+        self.sorts = False
+        self.while_loops = 0
+        self.recursive = False
+        self.branching = False
+        self.unclear = 0
+        self.functions = [node for node in ast.walk(tree)
+                          if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name != '__init__']
+        self.defined = {node.name for node in ast.walk(tree)
+                        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+        self.hashed, self.sequences = self.bound_kinds()
+
+    @staticmethod
+    def is_constant_range(node):
+        """True for `range(26)` style loops whose bound is a literal"""
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'range'
+                and node.args and all(isinstance(arg, ast.Constant) for arg in node.args))
+
+    @staticmethod
+    def is_halving(loop):
+        """True when a while loop shrinks its variable geometrically (x //= 2, x = x // 10, ...)"""
+        for node in ast.walk(loop):
+            if isinstance(node, ast.AugAssign) and isinstance(node.op, HALVING_PYTHON):
+                return True
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.BinOp) \
+                    and isinstance(node.value.op, HALVING_PYTHON) and isinstance(node.value.right, ast.Constant):
+                return True
+        return False
+
+    def bound_kinds(self):
+        """Names only ever bound to hashed containers, and names bound to strings or lists"""
+        hashed = set()
+        sequences = set()
+        other = set()
+        for node in ast.walk(self.tree):
+            if not isinstance(node, ast.Assign):
+                continue
+            value = node.value
+            call = value.func.id if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) else None
+            if isinstance(value, (ast.Set, ast.Dict, ast.SetComp, ast.DictComp)) or call in PYTHON_HASHED_CALLS:
+                kind = hashed
+            elif isinstance(value, (ast.List, ast.ListComp, ast.JoinedStr)) or call in PYTHON_SEQUENCE_CALLS \
+                    or (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+                kind = sequences
+            else:
+                kind = other
+            kind.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        return hashed - sequences - other, sequences
+
+    def is_sequence(self, node):
+        """True for expressions known to be a string or list"""
+        return (isinstance(node, (ast.List, ast.ListComp, ast.JoinedStr))
+                or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+                or (isinstance(node, ast.Name) and node.id in self.sequences))
+
+    def membership_cost(self, node):
+        """Cost of the `in` / `not in` tests of a comparison"""
+        own = CONSTANT
+        for op, container in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(container, (ast.Set, ast.Dict, ast.SetComp, ast.DictComp)) \
+                    or (isinstance(container, ast.Name) and container.id in self.hashed) \
+                    or (isinstance(container, ast.Call) and isinstance(container.func, ast.Name)
+                        and container.func.id == 'range'):
+                continue
+            if isinstance(container, ast.Constant) or (isinstance(container, (ast.Tuple, ast.List))
+                                                       and all(isinstance(item, ast.Constant) for item in container.elts)):
+                continue  # A fixed literal such as 'aeiou' or (1, 2)
+            if not self.is_sequence(container):
+                self.unclear += 1  # An unknown container may or may not be hashed
+            own = LINEAR
+        return own
+
+    def call_cost(self, node):
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id == 'sorted':
+                self.sorts = True
+                return SORT
+            if func.id in PYTHON_LINEAR_CALLS and len(node.args) == 1:
+                return LINEAR
+            if func.id in PYTHON_LOG_CALLS:
+                return LOGARITHMIC
+            if func.id not in PYTHON_CONSTANT_CALLS | PYTHON_LINEAR_CALLS | PYTHON_CONTAINER_CALLS | self.defined:
+                self.unclear += 1
+            return CONSTANT
+        if isinstance(func, ast.Attribute):
+            if func.attr == 'sort':
+                self.sorts = True
+                return SORT
+            if func.attr in PYTHON_LINEAR_METHODS:
+                return LINEAR
+            if func.attr in PYTHON_LOG_CALLS:
+                return LOGARITHMIC
+            receiver = func.value
+            if func.attr in ('pop', 'insert') and node.args:
+                # list.pop(0) and list.insert(i, x) shift the whole list; dict.pop(key) does not
+                if isinstance(receiver, ast.Name) and receiver.id in self.hashed:
+                    return CONSTANT
+                first = node.args[0]
+                if self.is_sequence(receiver) or (isinstance(first, ast.Constant) and first.value == 0):
+                    return LINEAR
+                self.unclear += 1
+                return CONSTANT
+            if func.attr == 'remove' and not (isinstance(receiver, ast.Name) and receiver.id in self.hashed):
+                return LINEAR
+            known = func.attr in PYTHON_CONSTANT_METHODS | PYTHON_INSERT_METHODS | {'pop'} or (
+                isinstance(receiver, ast.Name) and receiver.id in ('self', 'math') and
+                (receiver.id == 'math' or func.attr in self.defined))
+            if not known:
+                self.unclear += 1
+        return CONSTANT
+
+    def concat_cost(self, node):
+        """String and list concatenation copies its operands"""
+        if isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add) and self.is_sequence(node.target):
+            return LINEAR
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add) \
+                and (self.is_sequence(node.left) or self.is_sequence(node.right)):
+            return LINEAR
+        return CONSTANT
+
+    def cost(self, node, in_loop=False):
+        """Most expensive (linear, log) path through `node`"""
+        if in_loop and isinstance(node, ast.Return):
+            return CONSTANT  # Runs once, on the way out of the loop
+
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            weight = CONSTANT if self.is_constant_range(node.iter) else LINEAR
+            inner = max([self.cost(child, True) for child in node.body + node.orelse] + [self.cost(node.iter)])
+            return add_cost(weight, inner)
+
+        if isinstance(node, ast.While):
+            if self.is_halving(node):
+                weight = LOGARITHMIC
+            else:
+                weight = LINEAR
+                self.while_loops += 1
+            inner = max([self.cost(child, True) for child in node.body + node.orelse] + [CONSTANT])
+            return add_cost(weight, inner)
+
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            body = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            inner = max(self.cost(child) for child in body)
+            for generator in node.generators:
+                if not self.is_constant_range(generator.iter):
+                    inner = add_cost(LINEAR, inner)
+            return inner
+
+        if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+            own = LINEAR
+        elif isinstance(node, ast.Call):
+            own = self.call_cost(node)
+        elif isinstance(node, ast.Compare):
+            own = self.membership_cost(node)
+        else:
+            own = self.concat_cost(node)
+
+        children = [self.cost(child, in_loop) for child in ast.iter_child_nodes(node)
+                    if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+        return max([own] + children)
+
+    def find_recursion(self):
+        for function in self.functions:
+            calls = 0
+            for node in ast.walk(function):
+                if not isinstance(node, ast.Call):
+                    continue
+                func = node.func
+                if isinstance(func, ast.Name) and func.id == function.name:
+                    calls += 1
+                elif isinstance(func, ast.Attribute) and func.attr == function.name \
+                        and isinstance(func.value, ast.Name) and func.value.id == 'self':
+                    calls += 1
+            if calls:
+                self.recursive = True
+            if calls > 1:
+                self.branching = True
+
+    def container_names(self):
+        """Names bound to mutable containers"""
+        names = set()
+        for node in ast.walk(self.tree):
+            if not isinstance(node, ast.Assign):
+                continue
+            value = node.value
+            is_container = isinstance(value, (ast.List, ast.Dict, ast.Set)) or (
+                isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+                and value.func.id in PYTHON_CONTAINER_CALLS)
+            if is_container:
+                names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        return names
+
+    def space_degree(self):
+        """Nesting degree of auxiliary allocations: 0 is O(1), 1 is O(n), ..."""
+        degree = 0
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp)):
+                nested = 1 + sum(1 for child in ast.walk(node.elt if not isinstance(node, ast.DictComp) else node.value)
+                                 if isinstance(child, (ast.ListComp, ast.SetComp, ast.DictComp))
+                                 or (isinstance(child, ast.BinOp) and isinstance(child.op, ast.Mult)
+                                     and isinstance(child.left, ast.List)))
+                degree = max(degree, nested)
+            elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult) \
+                    and isinstance(node.left, ast.List) and not isinstance(node.right, ast.Constant):
+                degree = max(degree, 1)
+            elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice) \
+                    and isinstance(node.ctx, ast.Load):
+                degree = max(degree, 1)
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+                    and node.func.id in PYTHON_CONTAINER_CALLS | {'sorted'} and node.args:
+                degree = max(degree, 1)
+
+        # Containers that grow inside a loop
+        containers = self.container_names()
+        for loop in ast.walk(self.tree):
+            if not isinstance(loop, (ast.For, ast.AsyncFor, ast.While)):
+                continue
+            for node in ast.walk(loop):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                        and node.func.attr in PYTHON_INSERT_METHODS \
+                        and isinstance(node.func.value, ast.Name) and node.func.value.id in containers:
+                    degree = max(degree, 1)
+                elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store) \
+                        and isinstance(node.value, ast.Name) and node.value.id in containers:
+                    degree = max(degree, 1)
+                elif self.grows_sequence(node):
+                    degree = max(degree, 1)
+        return degree
+
+    def grows_sequence(self, node):
+        """True for `s += ...` and `s = s + ...` on a string or list"""
+        if isinstance(node, ast.AugAssign):
+            return isinstance(node.op, ast.Add) and self.is_sequence(node.target)
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.BinOp) and isinstance(node.value.op, ast.Add):
+            names = {target.id for target in node.targets if isinstance(target, ast.Name)}
+            operands = (node.value.left, node.value.right)
+            return any(isinstance(operand, ast.Name) and operand.id in names and self.is_sequence(operand)
+                       for operand in operands)
+        return False
+
+    def estimate(self):
+        statements = [node for node in self.tree.body
+                      if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+        for function in self.functions:
+            statements.extend(function.body)
+        time_cost = max([self.cost(node) for node in statements] + [CONSTANT])
+        self.find_recursion()
+        return time_cost, self.space_degree()
+
+
+class CFamilyEstimator:
+    TOKEN = re.compile(r'[A-Za-z_]\w*|\d\w*(?:\.\d\w*)?|::|->|=>|>>=|<<=|[-+*/%&|^!<>=]=|\S')
+
+    def __init__(self, code):
+        self.constants = self.constant_names(code)
+        self.code = self.strip_code(code)
+        self.tokens = self.TOKEN.findall(self.code)
+        self.matches = self.match_brackets()
+        self.sorts = False
+        self.while_loops = 0
+        self.unclear = 0
+        self.recursive = False
+        self.branching = False
+
+    @staticmethod
+    def strip_code(code):
+        """Drop comments, string/char literals and preprocessor lines"""
+        code = re.sub(r'/\*.*?\*/', ' ', code, flags=re.S)
+        code = re.sub(r'//[^\n]*', ' ', code)
+        code = re.sub(r'^\s*#[^\n]*', ' ', code, flags=re.M)
+        code = re.sub(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`', '""', code)
+        return code
+
+    @staticmethod
+    def constant_names(code):
+        """Names bound to numeric literals by #define, const, constexpr or final"""
+        names = set()
+        bindings = re.findall(r'^\s*#\s*define\s+([A-Za-z_]\w*)\s+([^\n]+)', code, flags=re.M)
+        bindings += re.findall(r'\b(?:const|constexpr|final)\b[^;={}()]*?\b([A-Za-z_]\w*)\s*(?::\s*\w+\s*)?=\s*([^;,\n]+)',
+                               code)
+        for name, value in bindings:
+            if re.fullmatch(C_NUMERIC, value.strip()):
+                names.add(name)
+        return names
+
+    def match_brackets(self):
+        matches = {}
+        stack = []
+        for i, token in enumerate(self.tokens):
+            if token in '({[':
+                stack.append(i)
+            elif token in ')}]' and stack:
+                matches[stack.pop()] = i
+        return matches
+
+    def statement_end(self, start):
+        """Index of the end of a brace-less loop body"""
+        if start < len(self.tokens) and self.tokens[start] == '{':
+            return self.matches.get(start, len(self.tokens) - 1)
+        depth = 0
+        for i in range(start, len(self.tokens)):
+            token = self.tokens[i]
+            if token in '({[':
+                depth += 1
+            elif token in ')}]':
+                depth -= 1
+            elif token == ';' and depth <= 0:
+                return i
+        return len(self.tokens) - 1
+
+    def loop_span(self, i):
+        """Return (header tokens, body end index) for the loop keyword at `i`"""
+        if i + 1 < len(self.tokens) and self.tokens[i + 1] == '(':
+            header_end = self.matches.get(i + 1, i + 1)
+            return self.tokens[i + 2:header_end], self.statement_end(header_end + 1)
+        # Go/Rust style loops without parentheses run up to the opening brace
+        j = i + 1
+        while j < len(self.tokens) and self.tokens[j] != '{':
+            j += 1
+        return self.tokens[i + 1:j], self.statement_end(j)
+
+    def is_do_while_tail(self, i):
+        """True for the `while (...)` closing a do { } block"""
+        if i == 0 or self.tokens[i - 1] != '}':
+            return False
+        for opener, closer in self.matches.items():
+            if closer == i - 1:
+                return opener > 0 and self.tokens[opener - 1] == 'do'
+        return False
+
+    def is_constant(self, tokens):
+        """True when every operand is a numeric literal or a constant name"""
+        return bool(tokens) and all(token[0].isdigit() or token in self.constants
+                                    or not (token[0].isalpha() or token[0] == '_') for token in tokens)
+
+    @staticmethod
+    def split_comparison(condition):
+        """Split a loop condition at its only top-level comparison into (lhs, op, rhs), or None"""
+        depth = 0
+        found = []
+        for i, token in enumerate(condition):
+            if token in ('(', '['):
+                depth += 1
+            elif token in (')', ']'):
+                depth -= 1
+            elif token in ('&', '|', '?'):
+                return None  # Compound conditions are left to Gemini
+            elif depth == 0 and token in C_COMPARISONS:
+                neighbours = condition[i - 1:i] + condition[i + 1:i + 2]
+                if token[0] not in neighbours:  # `<` `<` is a shift
+                    found.append(i)
+        if len(found) != 1:
+            return None
+        i = found[0]
+        return condition[:i], condition[i], condition[i + 1:]
+
+    def classify_for(self, header):
+        """(weight, clear) for a for-loop header: constant when it counts up to a constant bound, or between
+        two constants; clear when it is a for-each or a unit-step counter over a size"""
+        if ';' not in header:
+            # for (x : v), for (const x of arr), for (k in obj), for i := range xs
+            return LINEAR, any(token in header for token in (':', 'of', 'in', 'range'))
+        first = header.index(';')
+        second = header.index(';', first + 1) if ';' in header[first + 1:] else len(header)
+        init, condition, step = header[:first], header[first + 1:second], header[second + 1:]
+
+        parts = self.split_comparison(condition)
+        if parts is None:
+            return LINEAR, False
+        left, op, right = parts
+        assign = init.index('=') if '=' in init else None
+        var = init[assign - 1] if assign else (left[0] if left else None)
+        start = init[assign + 1:] if assign is not None else []
+        if left == [var]:
+            bound, ascending = right, op in ('<', '<=')
+        elif right == [var]:
+            bound, ascending = left, op in ('>', '>=')
+        else:
+            return LINEAR, False  # i * i <= n and the like
+
+        if self.is_constant(bound) and (ascending or self.is_constant(start)):
+            return CONSTANT, True
+        size = bound if ascending else start
+        limit_ok = ascending or self.is_constant(bound)
+        unit_step = ''.join(step) in (f'{var}++', f'++{var}', f'{var}--', f'--{var}') or (
+            step[:2] in ([var, '+='], [var, '-=']) and self.is_constant(step[2:]))
+        return LINEAR, bool(C_SIZE_BOUND.fullmatch(' '.join(size))) and limit_ok and unit_step
+
+    def in_return(self, i):
+        """True if token `i` belongs to a return statement, which runs only once"""
+        while i > 0 and self.tokens[i - 1] not in (';', '{', '}'):
+            i -= 1
+        return self.tokens[i] == 'return'
+
+    def estimate_time(self):
+        active = []
+        current = CONSTANT
+        best = CONSTANT
+
+        for i, token in enumerate(self.tokens):
+            while active and active[-1][0] < i:
+                _, weight = active.pop()
+                current = (current[0] - weight[0], current[1] - weight[1])
+
+            weight = None
+            end = None
+            if token in ('for', 'while', 'do', 'loop') and not (token == 'while' and self.is_do_while_tail(i)):
+                if token in ('do', 'loop'):
+                    header, end = [], self.statement_end(i + 1)
+                else:
+                    header, end = self.loop_span(i)
+                body = ' '.join(header + self.tokens[i:end + 1])
+                if token == 'for':
+                    weight, clear = self.classify_for(header)
+                    if not clear:
+                        self.unclear += 1
+                elif HALVING_C.search(body):
+                    weight = LOGARITHMIC
+                else:
+                    weight = LINEAR
+                    self.while_loops += 1
+            elif i + 1 < len(self.tokens) and self.tokens[i + 1] == '(' and i > 0 and self.tokens[i - 1] in ('.', '::'):
+                if token in C_CALLBACK_LOOPS:
+                    weight, end = LINEAR, self.matches.get(i + 1, i + 1)
+                elif token == 'sort':
+                    self.sorts = True
+                    best = max(best, add_cost(current, SORT))
+                elif token in C_LINEAR_CALLS:
+                    base = CONSTANT if self.in_return(i) else current
+                    best = max(best, add_cost(base, LINEAR))
+            elif token == 'sort' and i + 1 < len(self.tokens) and self.tokens[i + 1] == '(':
+                self.sorts = True
+                best = max(best, add_cost(current, SORT))
+
+            if weight is not None:
+                active.append((end, weight))
+                active.sort(key=lambda item: -item[0])
+                current = add_cost(current, weight)
+                best = max(best, current)
+
+        return best
+
+    def function_names(self):
+        """Names of functions defined in the source, with their definition indices"""
+        names = {}
+        tokens = self.tokens
+        for i, token in enumerate(tokens):
+            if not re.match(r'[A-Za-z_]\w*$', token) or token in C_KEYWORDS:
+                continue
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else ''
+            if i > 0 and tokens[i - 1] == 'function':
+                names.setdefault(token, set()).add(i)
+            elif nxt == '=' and i + 3 < len(tokens):
+                # name = function (...) / name = (...) => / name = x =>
+                value = tokens[i + 2]
+                close = self.matches.get(i + 2) if value == '(' else None
+                if value == 'function' or tokens[i + 3] == '=>' or \
+                        (close is not None and close + 1 < len(tokens) and tokens[close + 1] == '=>'):
+                    names.setdefault(token, set()).add(i)
+            elif nxt == '(':
+                close = self.matches.get(i + 1)
+                if close is None:
+                    continue
+                after = tokens[close + 1:close + 3]
+                if after[:1] == ['{'] or after == ['const', '{'] or after[:1] == ['=>']:
+                    names.setdefault(token, set()).add(i)
+        return names
+
+    def body_span(self, definition):
+        """Token range of the function body that follows a definition"""
+        for j in range(definition, len(self.tokens)):
+            if self.tokens[j] == '{':
+                return j, self.matches.get(j, len(self.tokens) - 1)
+            if self.tokens[j] == ';':
+                break
+        return definition, definition
+
+    def find_recursion(self):
+        for name, definitions in self.function_names().items():
+            calls = 0
+            for definition in definitions:
+                start, end = self.body_span(definition)
+                calls += sum(1 for i in range(start, end)
+                             if self.tokens[i] == name and self.tokens[i + 1] == '(')
+            if calls:
+                self.recursive = True
+            if calls > 1:
+                self.branching = True
+
+    def space_degree(self):
+        code = self.code
+        degree = 0
+        container = r'(?:std::)?(?:' + '|'.join(C_CONTAINERS) + r')\b'
+        for match in re.finditer(container + r'\s*(<(?:[^<>;(){}]|<[^<>;(){}]*(?:<[^<>;(){}]*>)?[^<>;(){}]*>)*>)?\s*(\w+)\s*(.)',
+                                 code):
+            generics, name, follow = match.group(1) or '', match.group(2), match.group(3)
+            if follow == '(':
+                # A function definition returning a container, or a sized constructor
+                close = code.find(')', match.end())
+                if re.match(r'\s*(const\s*)?\{', code[close + 1:]):
+                    continue
+                args = code[match.end():close]
+                if args.strip() and not re.fullmatch(r'[\s\d,.]*', args):
+                    degree = max(degree, 1 + generics.count('vector'))
+                    continue
+            if follow in ',)' or (follow == '&'):
+                continue  # Parameters are input, not auxiliary space
+            if re.search(r'\b' + re.escape(name) + r'\s*(\.|->)\s*(' + '|'.join(C_INSERT_METHODS) + r')\s*\(', code) \
+                    or re.search(r'\b' + re.escape(name) + SUBSCRIPT, code):
+                degree = max(degree, 1)
+
+        # JavaScript style bindings: const seen = new Map() / [] / {}
+        for match in re.finditer(r'\b(?:const|let|var)\s+(\w+)\s*=\s*(new\s+\w+\s*\(([^)]*)\)|\[\s*\]|\{\s*\}|Array\s*\(([^)]*)\))', code):
+            name = match.group(1)
+            sized = (match.group(3) or match.group(4) or '').strip()
+            if sized and not sized.isdigit():
+                degree = max(degree, 1)
+            elif re.search(r'\b' + re.escape(name) + r'\s*\.\s*(' + '|'.join(C_INSERT_METHODS) + r')\s*\(', code) \
+                    or re.search(r'\b' + re.escape(name) + SUBSCRIPT, code):
+                degree = max(degree, 1)
+
+        if re.search(r'\bnew\s+\w+\s*\[\s*[A-Za-z_]', code):
+            degree = max(degree, 1)
+        if re.search(r'\.\s*(split|slice|map|filter|concat|substring|substr)\s*\(|\[\s*\.\.\.', code):
+            degree = max(degree, 1)
+        return degree
+
+    def estimate(self):
+        time_cost = self.estimate_time()
+        self.find_recursion()
+        return time_cost, self.space_degree()
+
+
+def estimate_complexity(code, lang):
+    """
+    Estimate time and space complexity without network access.
+    Returns the Gemini result fields plus `confidence` (0-1), or None if the
+    language is unsupported or the code cannot be parsed.
+    """
+    family = language_family(lang)
+    if not family or not code or not code.strip():
+        return None
+
+    if family == 'python':
+        try:
+            estimator = PythonEstimator(ast.parse(code))
+        except (SyntaxError, ValueError):
+            return None
+        helper_count = len(estimator.functions)
+    else:
+        estimator = CFamilyEstimator(code)
+        helper_count = len(estimator.function_names())
+
+    time_cost, space = estimator.estimate()
+
+    confidence = BASE_CONFIDENCE[family]
+    confidence -= 0.1 * min(estimator.while_loops, 3)
+    if time_cost[0] >= 3:
+        confidence -= 0.15
+    if helper_count > 1:
+        confidence -= 0.15
+    if estimator.unclear:
+        confidence = min(confidence, UNCLEAR_CONFIDENCE)
+
+    time_complexity = format_cost(time_cost)
+    time_explanation = describe_time(time_cost, estimator.sorts)
+    if estimator.recursive:
+        # Recurrence relations are beyond loop counting; leave them to Gemini
+        confidence = min(confidence, 0.3)
+        if estimator.branching:
+            time_complexity = 'O(2^n)'
+        time_explanation = "Recursive calls dominate the running time (static estimate)"
+        space = max(space, 1)
+
+    return {
+        'time_complexity': time_complexity,
+        'space_complexity': format_cost((space, 0)),
+        'time_explanation': time_explanation,
+        'space_explanation': describe_space(space, estimator.recursive),
+        'confidence': round(max(0.0, min(1.0, confidence)), 2)
+    }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Sync All Platforms
+Runs the LeetCode and Codeforces syncs concurrently, sharing one set of rate
+limits, HTTP sessions, complexity cache and CPU slots
+"""
+
+import os
+import sys
+import threading
+
+# --probe answers before the pipeline, analysis and plotting modules below are imported
+if __name__ == "__main__" and '--probe' in sys.argv[1:]:
+    from sync_probe import configured_platforms, probe
+    sys.exit(probe(*configured_platforms()))
+
+from pipeline import SyncResources
+from profiling import run_profiled
+
+
+def syncer_classes():
+    """Threaded syncers by default, their asyncio variants when SYNC_ASYNC is set"""
+    if os.environ.get('SYNC_ASYNC', '').lower() in ('1', 'true', 'yes'):
+        from async_http import import_aiohttp
+        from async_sync import AsyncCodeforcesSync, AsyncLeetCodeSync
+        # Fail before any syncing starts when the optional dependency is missing
+        import_aiohttp()
+        return AsyncLeetCodeSync, AsyncCodeforcesSync
+    
+    from sync_codeforces import CodeforcesSync
+    from sync_leetcode import LeetCodeSync
+    return LeetCodeSync, CodeforcesSync
+
+
+def main():
+    LeetCodeSync, CodeforcesSync = syncer_classes()
+    resources = SyncResources(pool_size=max(int(os.environ.get('LEETCODE_CONCURRENCY', 8)), 10))
+    syncers = []
+    if os.environ.get('LEETCODE_SESSION') and os.environ.get('LEETCODE_CSRF'):
+        syncers.append(('LeetCode', LeetCodeSync(resources)))
+    if os.environ.get('CODEFORCES_HANDLE'):
+        syncers.append(('Codeforces', CodeforcesSync(resources)))
+    
+    if not syncers:
+        resources.close()
+        raise ValueError("No platform credentials configured!")
+    
+    failures = []
+    
+    def run(name, syncer):
+        try:
+            syncer.sync()
+        except Exception as e:
+            failures.append((name, e))
+    
+    threads = [threading.Thread(target=run, args=syncer, name=f'sync-{syncer[0].lower()}') for syncer in syncers]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        resources.close()
+    
+    for name, e in failures:
+        print(f"❌ {name} sync failed: {e}")
+    if failures:
+        sys.exit(1)
+    print(f"\n✅ Sync completed successfully! ({', '.join(name for name, _ in syncers)})")
+
+
+if __name__ == "__main__":
+    run_profiled('sync-all', main, __doc__.strip().split('\n')[0])
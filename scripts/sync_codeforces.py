@@ -4,243 +4,360 @@ Codeforces Solutions Sync Script
 Automatically syncs Codeforces submissions and generates documentation
 """
 
-import requests
 import json
 import os
+import sys
+from concurrent.futures import Future
+from functools import partial
 from datetime import datetime
 import time
-import re
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from urllib.parse import urlsplit
+
+# --probe answers before the pipeline, analysis and plotting modules below are imported
+if __name__ == "__main__" and '--probe' in sys.argv[1:]:
+    from sync_probe import probe
+    sys.exit(probe('codeforces'))
+
+from checkpoint import Checkpoint
+from complexity_cache import ComplexityCache
+from document_writer import DocumentWriter
+from json_stream import JsonArrayStream
+from performance_graphs import graph_fingerprint, graph_job
+from pipeline import Pipeline, SyncResources
+from profiling import count, run_profiled, span
+from readme_templates import CODEFORCES_INDEX, CODEFORCES_PROBLEM, CODEFORCES_ROW, render_rows
+from records import ComplexityResult, PerfMetrics, Problem, Submission, intern, load_problems, store_problems
+from selection import SubmissionSelector, selection_policy
+from solution_files import PLACEHOLDER_MARKER, read_solution, solution_hash
+from static_complexity import estimate_complexity, language_family
+from sync_state import SyncState
 
 
 class CodeforcesSync:
-    def __init__(self):
+    # Bump when the complexity prompt changes so cached results are recomputed
+    COMPLEXITY_PROMPT_VERSION = 'codeforces-1'
+    LANG_EXT_MAP = {
+        'GNU C++': 'cpp',
+        'GNU C++11': 'cpp',
+        'GNU C++14': 'cpp',
+        'GNU C++17': 'cpp',
+        'GNU C++20': 'cpp',
+        'Clang++17 Diagnostics': 'cpp',
+        'MS C++': 'cpp',
+        'Python 2': 'py',
+        'Python 3': 'py',
+        'PyPy 2': 'py',
+        'PyPy 3': 'py',
+        'Java 8': 'java',
+        'Java 11': 'java',
+        'Kotlin': 'kt',
+        'C# 8': 'cs',
+        'C# 10': 'cs',
+        'Go': 'go',
+        'JavaScript': 'js',
+        'Rust': 'rs',
+        'Ruby': 'rb',
+        'PHP': 'php',
+        'Haskell': 'hs',
+        'Scala': 'scala'
+    }
+    
+    def __init__(self, resources=None):
         self.handle = os.environ.get('CODEFORCES_HANDLE')
         self.gemini_api_key = os.environ.get('GEMINI_API_KEY')
         self.base_dir = './codeforces'
+        self.cache_dir = os.environ.get('SYNC_CACHE_DIR', './.cache')
         
         if not self.handle:
             raise ValueError("Missing Codeforces handle!")
         
         os.makedirs(self.base_dir, exist_ok=True)
-        self.api_base = "https://codeforces.com/api"
+        self.static_confidence = float(os.environ.get('STATIC_COMPLEXITY_MIN_CONFIDENCE', 0.75))
+        self.api_base = os.environ.get('CODEFORCES_API_BASE', "https://codeforces.com/api").rstrip('/')
+        self.page_size = int(os.environ.get('CODEFORCES_PAGE_SIZE', 100))
+        self.checkpoint_interval = float(os.environ.get('SYNC_CHECKPOINT_INTERVAL', 30))
+        self.selection_policy = selection_policy()
+        
+        # Rate limits, HTTP sessions, the complexity cache and CPU slots may be
+        # shared with other syncers when run from sync_all.py
+        self.owns_resources = resources is None
+        self.resources = resources or SyncResources(self.cache_dir)
+        self.complexity_cache = self.resources.complexity_cache
+        self.http = self.resources.http
+        
+        # Codeforces allows one API call per two seconds
+        self.limiter = self.resources.limiter
+        self.limiter.configure(urlsplit(self.api_base).hostname, float(os.environ.get('CODEFORCES_RATE', 0.5)))
+        
+        # Problemset index: (contestId, index) -> rating, loaded once per run
+        self.problemset_path = os.path.join(self.cache_dir, 'codeforces', 'problemset.json')
+        self.problemset_ttl = int(os.environ.get('CODEFORCES_PROBLEMSET_TTL', 7 * 24 * 3600))
+        self.problem_ratings = None
+        self.problemset_refreshed = False
+        # Problems a refresh did not list (gym, unrated) only force another one once the snapshot expires
+        self.problemset_fetched_at = 0
+        self.missing_problems = set()
+        self.missing_changed = False
+        
+        # The problemset is reused for as long as its snapshot; submission pages change
+        # with every new submission, so by default they are only revalidated
+        self.http_cache = self.resources.http_cache
+        if self.http_cache:
+            self.http_cache.configure(f"{self.api_base}/problemset.problems", self.problemset_ttl)
+            self.http_cache.configure(f"{self.api_base}/user.status", float(os.environ.get('SYNC_HTTP_LIST_TTL', 0)))
     
-    @staticmethod
-    def clean_markdown(text):
-        """Remove markdown formatting"""
-        if not text:
-            return text
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
-        return text.strip()
-    
-    def create_performance_graph(self, folder_path, time_ms, memory_kb, title):
-        """Create performance visualization"""
-        try:
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-            
-            # Time graph
-            ax1.bar(['Execution Time'], [time_ms], color='#10B981', width=0.4)
-            ax1.set_ylabel('Time (ms)', fontsize=11, fontweight='bold')
-            ax1.set_title('Runtime', fontsize=12, fontweight='bold')
-            ax1.text(0, time_ms, f'{time_ms} ms', ha='center', va='bottom', fontsize=10, fontweight='bold')
-            ax1.grid(axis='y', alpha=0.3, linestyle='--')
-            
-            # Memory graph
-            ax2.bar(['Memory Usage'], [memory_kb / 1024], color='#3B82F6', width=0.4)
-            ax2.set_ylabel('Memory (MB)', fontsize=11, fontweight='bold')
-            ax2.set_title('Memory', fontsize=12, fontweight='bold')
-            ax2.text(0, memory_kb / 1024, f'{memory_kb / 1024:.2f} MB', ha='center', va='bottom', fontsize=10, fontweight='bold')
-            ax2.grid(axis='y', alpha=0.3, linestyle='--')
-            
-            fig.suptitle(f'Performance: {title}', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            
-            graph_path = os.path.join(folder_path, 'performance.png')
-            plt.savefig(graph_path, dpi=150, bbox_inches='tight')
-            plt.close()
-            
-            print(f"✓ Performance graph created: {graph_path}")
-            return True
-        except Exception as e:
-            print(f"Error creating graph: {e}")
-            return False
+    def local_complexity(self, code, lang, message=None):
+        """Complexity from the cache or a confident static estimate, returns (cache_key, result or None);
+        `message` is printed once an analysis actually runs"""
+        cache_key = ComplexityCache.make_key(code, lang, self.COMPLEXITY_PROMPT_VERSION)
+        cached = self.complexity_cache.get(cache_key)
+        if cached:
+            return cache_key, cached
+        
+        if message and (self.gemini_api_key or language_family(lang)):
+            print(message)
+        # Trust the offline estimate when it is confident enough
+        with self.resources.cpu_slots, span('static_analysis'):
+            estimate = estimate_complexity(code, lang)
+        if estimate and estimate['confidence'] >= self.static_confidence:
+            count('complexity.static')
+            print(f"  Static estimate used (confidence {estimate['confidence']:.2f})")
+            return cache_key, {field: estimate[field] for field in ComplexityCache.FIELDS}
+        return cache_key, None
     
-    def analyze_complexity(self, code, lang, max_retries=3):
-        """Analyze code complexity using Gemini API"""
-        if not self.gemini_api_key:
-            print("No Gemini API key found, skipping complexity analysis")
-            return None
+    def request_complexity(self, code, lang, message=None):
+        """Complexity from the cache, a static estimate or a batched Gemini call, returns a Future"""
+        cache_key, result = self.local_complexity(code, lang, message)
+        if result or not self.gemini_api_key:
+            future = Future()
+            future.set_result(result)
+            return future
         
-        for attempt in range(max_retries):
-            try:
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
-                
-                prompt_text = "Analyze this " + lang + " code and provide ONLY the time and space complexity in Big O notation.\n\n"
-                prompt_text += "Code:\n" + code + "\n\n"
-                prompt_text += "Respond in this EXACT JSON format with NO markdown formatting:\n"
-                prompt_text += '{\n'
-                prompt_text += '  "time_complexity": "O(...)",\n'
-                prompt_text += '  "space_complexity": "O(...)",\n'
-                prompt_text += '  "time_explanation": "brief explanation",\n'
-                prompt_text += '  "space_explanation": "brief explanation"\n'
-                prompt_text += '}'
-                
-                payload = {
-                    "contents": [{
-                        "parts": [{
-                            "text": prompt_text
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0.1,
-                        "maxOutputTokens": 500
-                    }
-                }
-                
-                headers = {'Content-Type': 'application/json'}
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if 'candidates' in data and len(data['candidates']) > 0:
-                        content = data['candidates'][0]['content']['parts'][0]['text']
-                        content = content.strip()
-                        
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*', '', content)
-                        
-                        start_idx = content.find('{')
-                        end_idx = content.rfind('}') + 1
-                        
-                        if start_idx != -1 and end_idx > start_idx:
-                            json_str = content[start_idx:end_idx]
-                            complexity_data = json.loads(json_str)
-                            
-                            complexity_data['time_explanation'] = self.clean_markdown(
-                                complexity_data.get('time_explanation', ''))
-                            complexity_data['space_explanation'] = self.clean_markdown(
-                                complexity_data.get('space_explanation', ''))
-                            
-                            return complexity_data
-                        else:
-                            if attempt < max_retries - 1:
-                                time.sleep(2)
-                                continue
-                            return None
-                    else:
-                        if attempt < max_retries - 1:
-                            time.sleep(2)
-                            continue
-                        return None
-                else:
-                    if attempt < max_retries - 1:
-                        time.sleep(3)
-                        continue
-                    return None
-                    
-            except Exception as e:
-                print(f"Complexity analysis error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(3)
-                    continue
+        future = self.resources.complexity_batcher.submit(code, lang)
+        future.add_done_callback(partial(self.cache_complexity, cache_key))
+        return future
+    
+    def cache_complexity(self, cache_key, future):
+        if future.result():
+            self.complexity_cache.put(cache_key, future.result())
+    
+    def analyze_complexity(self, code, lang):
+        """Analyze code complexity, waiting for the batched Gemini answer if one is needed"""
+        return self.request_complexity(code, lang).result()
+    
+    @staticmethod
+    def compact_submission(sub):
+        """Keep only the submission fields the sync uses"""
+        problem = sub.get('problem', {})
+        return {
+            'id': sub.get('id', 0),
+            'verdict': intern(sub.get('verdict')),
+            'programmingLanguage': intern(sub.get('programmingLanguage', 'Unknown')),
+            'timeConsumedMillis': sub.get('timeConsumedMillis', 0),
+            'memoryConsumedBytes': sub.get('memoryConsumedBytes', 0),
+            'creationTimeSeconds': sub.get('creationTimeSeconds', 0),
+            'problem': {
+                'contestId': problem.get('contestId'),
+                'index': intern(problem.get('index')),
+                'name': problem.get('name', 'Unknown Problem'),
+                'tags': [intern(tag) for tag in problem.get('tags', [])]
+            }
+        }
+    
+    def first_status_cursor(self, last_submission_id):
+        """(from, count) of the first user.status page"""
+        # Without a watermark the whole history is needed, so fetch it in one call
+        return 1, self.page_size if last_submission_id else 10000
+    
+    def status_params(self, cursor):
+        """Query of the user.status page at `cursor`"""
+        start, count = cursor
+        return {
+            'handle': self.handle,
+            'from': start,
+            'count': count
+        }
+    
+    def read_status_page(self, stream, cursor, last_submission_id):
+        """Yield the submissions of a user.status page newer than the watermark, parsed from `stream`;
+        returns the cursor of the next page, or None once paging is done"""
+        received = 0
+        for sub in stream:
+            if stream.meta.get('status') != 'OK':
+                break
+            received += 1
+            # Submissions come newest first, so stop at the watermark
+            if last_submission_id and sub.get('id', 0) <= last_submission_id:
                 return None
+            yield self.compact_submission(sub)
         
-        return None
+        if stream.meta.get('status') != 'OK':
+            raise RuntimeError(f"API Error: {stream.meta.get('comment', 'Unknown error')}")
+        
+        start, count = cursor
+        return (start + received, count) if received == count else None
     
-    def get_user_submissions(self):
-        """Get all submissions from Codeforces API"""
+    def iter_user_submissions(self, last_submission_id=0):
+        """Stream submissions newer than the watermark from the Codeforces API"""
         url = f"{self.api_base}/user.status"
-        params = {
-            'handle': self.handle,
-            'from': 1,
-            'count': 10000
-        }
+        cursor = self.first_status_cursor(last_submission_id)
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            data = response.json()
-            
-            if data['status'] == 'OK':
-                return data['result']
-            else:
-                print(f"API Error: {data.get('comment', 'Unknown error')}")
-                return []
+            while cursor:
+                with span('codeforces.fetch'):
+                    response = self.http.get(url, params=self.status_params(cursor), stream=True)
+                try:
+                    # Parse the result array element by element as the body arrives
+                    stream = JsonArrayStream(response.iter_content(chunk_size=65536), 'result')
+                    cursor = yield from self.read_status_page(stream, cursor, last_submission_id)
+                finally:
+                    response.close()
         except Exception as e:
+            # A partial history would advance the watermark past unseen submissions
             print(f"Error fetching submissions: {e}")
-            return []
+            raise
     
-    def get_problem_rating(self, contest_id, index):
-        """Get problem rating from Codeforces API"""
+    @staticmethod
+    def parse_problemset(data):
+        """Build a (contestId, index) -> rating map from a problemset.problems response"""
+        if data['status'] != 'OK':
+            print(f"API Error: {data.get('comment', 'Unknown error')}")
+            return None
+        
+        ratings = {}
+        for problem in data['result']['problems']:
+            contest_id = problem.get('contestId')
+            index = problem.get('index')
+            if contest_id and index:
+                ratings[(contest_id, index)] = problem.get('rating', 'Unrated')
+        return ratings
+    
+    def fetch_problemset(self, revalidate=False):
+        """Download problemset.problems and build a (contestId, index) -> rating map"""
         try:
             url = f"{self.api_base}/problemset.problems"
-            response = requests.get(url, timeout=30)
-            data = response.json()
-            
-            if data['status'] == 'OK':
-                problems = data['result']['problems']
-                for problem in problems:
-                    if problem.get('contestId') == contest_id and problem.get('index') == index:
-                        return problem.get('rating', 'Unrated')
-            return 'Unrated'
-        except:
-            return 'Unrated'
-    
-    def create_problem_readme(self, folder_path, problem_info, submission_info, complexity_data, graph_created):
+            response = self.http.get(url, timeout=60, revalidate=revalidate)
+            return self.parse_problemset(response.json())
+        except Exception as e:
+            print(f"Error fetching problemset: {e}")
+            return None
+    
+    @staticmethod
+    def parse_problem_key(key):
+        contest_id, index = key.split('/', 1)
+        return int(contest_id), index
+    
+    def load_problemset_snapshot(self):
+        """Load the on-disk problemset snapshot, returns (ratings, fetched_at, missing problems)"""
+        try:
+            with open(self.problemset_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            ratings = {self.parse_problem_key(key): rating for key, rating in snapshot['ratings'].items()}
+            missing = {self.parse_problem_key(key) for key in snapshot.get('missing', [])}
+            return ratings, snapshot.get('fetched_at', 0), missing
+        except (OSError, ValueError, KeyError):
+            return None, 0, set()
+    
+    def save_problemset_snapshot(self, ratings, fetched_at=None, missing=()):
+        """Persist the problemset index so later runs can skip the download"""
+        os.makedirs(os.path.dirname(self.problemset_path), exist_ok=True)
+        snapshot = {
+            'fetched_at': int(fetched_at or time.time()),
+            'ratings': {f"{contest_id}/{index}": rating for (contest_id, index), rating in ratings.items()},
+            'missing': sorted(f"{contest_id}/{index}" for contest_id, index in missing)
+        }
+        tmp_path = self.problemset_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, self.problemset_path)
+    
+    def cached_problemset(self, force_refresh=False):
+        """(ratings, snapshot): the index when memory or a snapshot within TTL answers, else None along with
+        the stale snapshot to fall back on"""
+        if self.problem_ratings is not None and not force_refresh:
+            return self.problem_ratings, None
+        
+        snapshot, fetched_at, missing = self.load_problemset_snapshot()
+        if not force_refresh and snapshot is not None and time.time() - fetched_at < self.problemset_ttl:
+            print(f"Loaded problemset snapshot ({len(snapshot)} problems)")
+            self.problem_ratings = snapshot
+            self.problemset_fetched_at = fetched_at
+            self.missing_problems = missing
+            return self.problem_ratings, None
+        
+        print("Downloading problemset...")
+        return None, snapshot
+    
+    def store_problemset(self, ratings, snapshot):
+        """Keep a downloaded index, or the stale snapshot when the download failed"""
+        self.problemset_refreshed = True
+        self.missing_problems = set()
+        if ratings is not None:
+            self.save_problemset_snapshot(ratings)
+            self.problem_ratings = ratings
+            self.problemset_fetched_at = time.time()
+        else:
+            # Fall back to a stale snapshot rather than losing every rating
+            self.problem_ratings = snapshot or {}
+            self.problemset_fetched_at = 0
+        return self.problem_ratings
+    
+    def needs_problemset_refresh(self, ratings, key):
+        """True when `key` is missing from the index and no refresh happened this run; a problem still
+        missing after one is remembered until the snapshot expires"""
+        if key in ratings or key in self.missing_problems:
+            return False
+        # Problems newer than the snapshot trigger one refresh per run
+        if not self.problemset_refreshed:
+            return True
+        self.missing_problems.add(key)
+        self.missing_changed = True
+        return False
+    
+    def save_missing_problems(self):
+        """Store the problems this run found missing with the snapshot they were looked up in"""
+        if self.missing_changed and self.problemset_fetched_at:
+            self.save_problemset_snapshot(self.problem_ratings, self.problemset_fetched_at, self.missing_problems)
+            self.missing_changed = False
+    
+    def load_problemset_index(self, force_refresh=False):
+        """Load the problemset index from snapshot (within TTL) or from the API"""
+        ratings, snapshot = self.cached_problemset(force_refresh)
+        if ratings is not None:
+            return ratings
+        
+        with span('codeforces.problemset'):
+            ratings = self.fetch_problemset(revalidate=force_refresh)
+        return self.store_problemset(ratings, snapshot)
+    
+    def get_problem_rating(self, contest_id, index):
+        """Get problem rating from the cached problemset index"""
+        ratings = self.load_problemset_index()
+        key = (contest_id, index)
+        if self.needs_problemset_refresh(ratings, key):
+            ratings = self.load_problemset_index(force_refresh=True)
+            # Remembers the problem if the refreshed index lacks it as well
+            self.needs_problemset_refresh(ratings, key)
+        
+        return ratings.get(key, 'Unrated')
+    
+    def create_problem_readme(self, folder_path, problem, graph_file):
         """Create README.md for a specific problem"""
         readme_path = os.path.join(folder_path, 'README.md')
         
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {problem_info['name']}\n\n")
-            
-            # Problem metadata
-            f.write(f"**Contest ID:** {problem_info['contest_id']}\n\n")
-            f.write(f"**Index:** {problem_info['index']}\n\n")
-            f.write(f"**Rating:** {problem_info['rating']}\n\n")
-            f.write(f"**Problem Link:** [Codeforces](https://codeforces.com/problemset/problem/{problem_info['contest_id']}/{problem_info['index']})\n\n")
-            f.write(f"**Verdict:** {submission_info['verdict']}\n\n")
-            
-            # Tags
-            if problem_info.get('tags'):
-                f.write("**Tags:** " + ", ".join([f"`{tag}`" for tag in problem_info['tags']]) + "\n\n")
-            
-            # Performance section
-            if graph_created:
-                f.write("## Performance\n\n")
-                f.write("![Performance Graph](./performance.png)\n\n")
-            
-            # Performance metrics
-            f.write("## Performance Metrics\n\n")
-            f.write("| Metric | Value |\n")
-            f.write("|--------|-------|\n")
-            f.write(f"| Language | {submission_info['language']} |\n")
-            f.write(f"| Execution Time | {submission_info['time_ms']} ms |\n")
-            f.write(f"| Memory Used | {submission_info['memory_kb'] / 1024:.2f} MB |\n")
-            f.write(f"| Submission Time | {submission_info['creation_time']} |\n\n")
-            
-            # Complexity analysis
-            if complexity_data:
-                f.write("## Complexity Analysis\n\n")
-                f.write(f"### {submission_info['language']}\n\n")
-                f.write(f"- **Time Complexity:** {complexity_data['time_complexity']}\n")
-                f.write(f"  - {complexity_data['time_explanation']}\n\n")
-                f.write(f"- **Space Complexity:** {complexity_data['space_complexity']}\n")
-                f.write(f"  - {complexity_data['space_explanation']}\n\n")
-        
-        print(f"Updated README: {readme_path}")
-    
-    def create_main_readme(self, processed_problems):
-        """Create main README.md in codeforces folder"""
+        with DocumentWriter(readme_path) as f:
+            f.write(CODEFORCES_PROBLEM.render(problem, graph_file))
+        
+        if f.changed:
+            print(f"Updated README: {readme_path}")
+    
+    def create_main_readme(self, problems, touched=None, fingerprints=None):
+        """Create main README.md in codeforces folder, re-rendering only the rows of `touched` problems and rows
+        whose fields changed since `fingerprints`; returns the new row fingerprints"""
         print("\nCreating main README.md...")
         main_readme_path = os.path.join(self.base_dir, 'README.md')
         
         # Calculate statistics
-        total_problems = len(processed_problems)
         rating_ranges = {
             '800-1000': 0,
             '1100-1300': 0,
@@ -252,290 +369,343 @@ class CodeforcesSync:
         languages_used = set()
         all_tags = set()
         
-        for problem_key, info in processed_problems.items():
-            rating = info.get('rating', 'Unrated')
-            
-            try:
-                rating_val = int(rating)
-                if rating_val <= 1000:
-                    rating_ranges['800-1000'] += 1
-                elif rating_val <= 1300:
-                    rating_ranges['1100-1300'] += 1
-                elif rating_val <= 1600:
-                    rating_ranges['1400-1600'] += 1
-                elif rating_val <= 1900:
-                    rating_ranges['1700-1900'] += 1
-                else:
-                    rating_ranges['2000+'] += 1
-            except:
+        for problem in problems.values():
+            rating_val = problem.rating
+            if rating_val is None:
                 rating_ranges['Unrated'] += 1
+            elif rating_val <= 1000:
+                rating_ranges['800-1000'] += 1
+            elif rating_val <= 1300:
+                rating_ranges['1100-1300'] += 1
+            elif rating_val <= 1600:
+                rating_ranges['1400-1600'] += 1
+            elif rating_val <= 1900:
+                rating_ranges['1700-1900'] += 1
+            else:
+                rating_ranges['2000+'] += 1
             
-            if 'language' in info:
-                languages_used.add(info['language'])
-            
-            if 'tags' in info:
-                all_tags.update(info['tags'])
+            languages_used.update(problem.solutions)
+            all_tags.update(problem.tags)
         
         # Sort problems by rating
         sorted_problems = sorted(
-            processed_problems.items(),
-            key=lambda x: (
-                int(x[1].get('rating', '0')) if str(x[1].get('rating', '0')).isdigit() else 0,
-                x[1].get('contest_id', 0),
-                x[1].get('index', '')
-            ),
+            problems.values(),
+            key=lambda problem: (problem.rating or 0, problem.contest_id or 0, problem.index or ''),
             reverse=True
         )
+        rows, fingerprints, rendered = render_rows(CODEFORCES_ROW, sorted_problems, touched, main_readme_path,
+                                                   fingerprints)
         
-        with open(main_readme_path, 'w', encoding='utf-8') as f:
-            f.write("# 🚀 Codeforces Solutions\n\n")
-            f.write("My personal collection of Codeforces problem solutions, showcasing competitive programming skills.\n\n")
-            
-            f.write("## 📊 Progress Statistics\n\n")
-            f.write(f"**Total Problems Solved:** {total_problems}\n\n")
-            
-            f.write("### By Rating\n\n")
-            f.write("| Rating Range | Count |\n")
-            f.write("|--------------|-------|\n")
-            for rating_range, count in rating_ranges.items():
-                if count > 0:
-                    f.write(f"| {rating_range} | {count} |\n")
-            f.write("\n")
-            
-            f.write("**Languages Used:** " + ", ".join(sorted(languages_used)) + "\n\n")
-            
-            f.write("## 📝 Problem List\n\n")
-            f.write("| Contest | Index | Problem | Rating | Language |\n")
-            f.write("|---------|-------|---------|--------|----------|\n")
-            
-            for problem_key, info in sorted_problems:
-                contest_id = info.get('contest_id', '')
-                index = info.get('index', '')
-                name = info.get('name', '')
-                rating = info.get('rating', 'Unrated')
-                folder = info.get('folder', '')
-                language = info.get('language', '')
-                
-                # Rating color
-                try:
-                    rating_val = int(rating)
-                    if rating_val <= 1000:
-                        rating_emoji = '🟢'
-                    elif rating_val <= 1300:
-                        rating_emoji = '🔵'
-                    elif rating_val <= 1600:
-                        rating_emoji = '🟣'
-                    elif rating_val <= 1900:
-                        rating_emoji = '🟡'
-                    else:
-                        rating_emoji = '🔴'
-                except:
-                    rating_emoji = '⚪'
-                
-                f.write(f"| {contest_id} | {index} | [{name}](./{folder}) | {rating_emoji} {rating} | `{language}` |\n")
-            
-            f.write("\n## 🎯 Topics Covered\n\n")
-            if all_tags:
-                # Group tags in columns
-                tag_list = sorted(all_tags)
-                for i in range(0, len(tag_list), 3):
-                    tags_row = tag_list[i:i+3]
-                    f.write("- " + " • ".join(tags_row) + "\n")
-            else:
-                f.write("- Implementation\n")
-                f.write("- Math\n")
-                f.write("- Greedy\n")
-                f.write("- Dynamic Programming\n")
-                f.write("- Data Structures\n")
-                f.write("- Graph Theory\n")
-            f.write("\n")
-            
-            f.write("## 🔗 My Profile\n\n")
-            f.write(f"**Codeforces:** [My Profile](https://codeforces.com/profile/{self.handle})\n\n")
-            
-            f.write("## 📈 Features\n\n")
-            f.write("Each solution includes:\n")
-            f.write("- ✅ Problem statement and Codeforces link\n")
-            f.write("- 💻 Clean, optimized code\n")
-            f.write("- ⏱️ Time complexity analysis\n")
-            f.write("- 💾 Space complexity analysis\n")
-            f.write("- 📊 Performance metrics (Runtime & Memory)\n")
-            f.write("- 📈 Visual performance graphs\n")
-            f.write("- 🏷️ Problem tags and ratings\n\n")
-            
-            f.write("## 🛠️ Tech Stack\n\n")
-            f.write("- **Automated Sync:** GitHub Actions\n")
-            f.write("- **Complexity Analysis:** Google Gemini AI\n")
-            f.write("- **Visualization:** Matplotlib\n")
-            f.write("- **Data Source:** Codeforces API\n\n")
-            
-            f.write("---\n\n")
-            f.write("_🎯 Practice makes perfect. Keep solving, keep improving!_ 💻\n\n")
-            f.write(f"_Last updated: {datetime.now().strftime('%B %d, %Y')}_\n")
+        with DocumentWriter(main_readme_path) as f:
+            f.write(CODEFORCES_INDEX.render(
+                len(problems),
+                rating_ranges,
+                languages_used,
+                all_tags,
+                rows,
+                self.handle,
+                datetime.now().strftime('%B %d, %Y')
+            ))
         
-        print(f"✓ Main README updated: {main_readme_path}")
+        if f.changed:
+            print(f"✓ Main README updated: {main_readme_path} ({rendered} rows rendered)")
+        else:
+            print(f"Main README unchanged: {main_readme_path}")
+        return fingerprints
     
-    def sync(self):
-        """Main sync function"""
-        print(f"Fetching submissions for handle: {self.handle}")
-        submissions = self.get_user_submissions()
-        
-        if not submissions:
-            print("No submissions found!")
-            return
-        
-        print(f"Found {len(submissions)} total submissions")
-        
-        # Language mapping
-        lang_ext_map = {
-            'GNU C++': 'cpp',
-            'GNU C++11': 'cpp',
-            'GNU C++14': 'cpp',
-            'GNU C++17': 'cpp',
-            'GNU C++20': 'cpp',
-            'Clang++17 Diagnostics': 'cpp',
-            'MS C++': 'cpp',
-            'Python 2': 'py',
-            'Python 3': 'py',
-            'PyPy 2': 'py',
-            'PyPy 3': 'py',
-            'Java 8': 'java',
-            'Java 11': 'java',
-            'Kotlin': 'kt',
-            'C# 8': 'cs',
-            'C# 10': 'cs',
-            'Go': 'go',
-            'JavaScript': 'js',
-            'Rust': 'rs',
-            'Ruby': 'rb',
-            'PHP': 'php',
-            'Haskell': 'hs',
-            'Scala': 'scala'
-        }
+    @staticmethod
+    def note_submission(sub, progress):
+        """Count a fetched submission"""
+        progress['count'] += 1
+        progress['newest'] = max(progress['newest'], sub['id'])
+    
+    @staticmethod
+    def selection_key(sub):
+        """Problem key of an accepted submission, otherwise None"""
+        if sub.get('verdict') != 'OK':
+            return None
+        problem = sub.get('problem', {})
+        if not problem.get('contestId') or not problem.get('index'):
+            return None
+        return f"{problem['contestId']}_{problem['index']}"
+    
+    @staticmethod
+    def submission_metrics(sub):
+        return sub.get('timeConsumedMillis', 0), sub.get('memoryConsumedBytes', 0) / 1024
+    
+    def make_selector(self, problems):
+        """One winning accepted submission per problem under the selection policy"""
+        def incumbent(key):
+            previous = problems.get(key)
+            if not previous or not previous.latest:
+                return None
+            return previous.latest.perf.time_ms, previous.latest.perf.memory_kb
         
-        processed_problems = {}
+        return SubmissionSelector(self.selection_policy, self.selection_key, self.submission_metrics, incumbent)
+    
+    def accept_submission(self, sub, problems):
+        """Returns (key, sub, previous) for a selected submission unless an earlier run recorded it"""
+        problem_key = self.selection_key(sub)
+        previous = problems.get(problem_key)
+        if previous and previous.latest and previous.latest.id == sub.get('id'):
+            return None
+        return problem_key, sub, previous
+    
+    def iter_new_accepted(self, last_submission_id, problems, progress):
+        """Fetch stage: stream submissions and yield the selected unrecorded AC per problem"""
+        selector = self.make_selector(problems)
+        for sub in self.iter_user_submissions(last_submission_id):
+            self.note_submission(sub, progress)
+            for winner in selector.offer(sub):
+                item = self.accept_submission(winner, problems)
+                if item:
+                    yield item
         
-        # Process only AC submissions
-        for sub in submissions:
-            if sub.get('verdict') != 'OK':
-                continue
-            
-            problem = sub.get('problem', {})
-            contest_id = problem.get('contestId')
-            index = problem.get('index')
-            name = problem.get('name', 'Unknown Problem')
-            tags = problem.get('tags', [])
-            
-            if not contest_id or not index:
+        # Ranked policies only know their winners once the stream is exhausted
+        for winner in selector.finish():
+            item = self.accept_submission(winner, problems)
+            if item:
+                yield item
+    
+    def prepare_submission(self, item):
+        """Prepare stage: look up the rating, create the folder and placeholder and queue the graph"""
+        problem_key, sub, previous = item
+        problem = sub['problem']
+        contest_id = problem['contestId']
+        index = problem['index']
+        name = problem.get('name', 'Unknown Problem')
+        tags = problem.get('tags', [])
+        
+        # Get submission details
+        language = sub.get('programmingLanguage', 'Unknown')
+        time_ms = sub.get('timeConsumedMillis', 0)
+        memory_kb = sub.get('memoryConsumedBytes', 0) / 1024  # Convert to KB
+        
+        # Get problem rating
+        rating = self.get_problem_rating(contest_id, index)
+        
+        # Determine file extension
+        ext = self.LANG_EXT_MAP.get(language, 'txt')
+        
+        # Create folder structure
+        folder_name = f"{contest_id}-{index}-{name.replace(' ', '-').replace('/', '-')[:50]}"
+        folder_path = os.path.join(self.base_dir, folder_name)
+        os.makedirs(folder_path, exist_ok=True)
+        
+        # Try to fetch source code
+        code_url = f"https://codeforces.com/contest/{contest_id}/submission/{sub['id']}"
+        print(f"\nProcessing: {name} ({contest_id}{index})")
+        print(f"  Verdict: {sub['verdict']}, Time: {time_ms}ms, Memory: {memory_kb:.0f}KB")
+        print("  Note: Source code must be manually added or fetched via authenticated session")
+        
+        # Create a placeholder for source code
+        source_file = os.path.join(folder_path, f"solution.{ext}")
+        if not os.path.exists(source_file):
+            with open(source_file, 'w', encoding='utf-8') as f:
+                f.write(f"// Solution for {name}\n")
+                f.write(f"// Contest: {contest_id}, Problem: {index}\n")
+                f.write(f"// Language: {language}\n")
+                f.write(f"// Verdict: {sub['verdict']}\n")
+                f.write(f"// Time: {time_ms}ms, Memory: {memory_kb:.0f}KB\n\n")
+                f.write(f"// Source code URL: {code_url}\n")
+                f.write(f"// {PLACEHOLDER_MARKER}\n")
+        
+        # Store problem info; only the selected accepted solution is kept
+        submission = Submission(
+            sub.get('id'),
+            language,
+            sub['verdict'],
+            sub.get('creationTimeSeconds', 0),
+            perf=PerfMetrics(time_ms=time_ms, memory_kb=memory_kb)
+        )
+        record = Problem(
+            problem_key,
+            name,
+            folder_name,
+            contest_id=contest_id,
+            index=index,
+            rating=rating,
+            tags=tags,
+            solutions={submission.language: submission}
+        )
+        
+        # Queue the performance graph unless its inputs are unchanged
+        job = graph_job('runtime_memory', folder_path, time_ms, memory_kb, name)
+        record.graph = graph_fingerprint(job)
+        stale = not previous or previous.graph != record.graph or not os.path.exists(job[2])
+        
+        return record, (record, folder_path, job, stale)
+    
+    @staticmethod
+    def solution_code(record, folder_path):
+        """Hand-written code of a problem folder, or None while only the placeholder exists; the submission
+        remembers its hash so later edits are noticed"""
+        _, code = read_solution(folder_path)
+        submission = record.latest
+        submission.code_hash = SyncState.content_hash(code) if code else None
+        if not code:
+            submission.complexity = None
+        return code
+    
+    def analyze_submission(self, item):
+        """Analyze stage: queue analysis of the solution if it holds real code rather than the placeholder"""
+        record, page = item
+        code = self.solution_code(record, page[1])
+        if not code:
+            return record, page, None
+        return record, page, self.request_complexity(code, record.latest.language, "  Analyzing complexity...")
+    
+    def complete_analysis(self, item):
+        """Complete stage: wait for the submission's complexity answer"""
+        record, page, future = item
+        if future:
+            submission = record.latest
+            submission.complexity = ComplexityResult.from_dict(future.result())
+            if submission.complexity:
+                print(f"  ✓ Complexity: {submission.complexity.time_complexity}, {submission.complexity.space_complexity}")
+        return record, page
+    
+    def checkpoint_submission(self, item):
+        """Checkpoint stage: remember an analyzed submission and whether its graph still needs drawing"""
+        record, page = item
+        self.checkpoint.add(record.key, dict(record.to_dict(), stale=page[3]))
+        return item
+    
+    def resume_checkpoint(self, problems):
+        """Merge submissions processed by an interrupted run, returns their pages"""
+        pages = []
+        for problem_key, data in self.checkpoint.load().items():
+            record = problems[problem_key] = Problem.from_dict(problem_key, data)
+            folder_path = os.path.join(self.base_dir, record.folder)
+            perf = record.latest.perf
+            job = graph_job('runtime_memory', folder_path, perf.time_ms, perf.memory_kb, record.title)
+            pages.append((record, folder_path, job, data.get('stale', True)))
+        if pages:
+            print(f"Resuming from checkpoint: {len(pages)} problems already processed")
+        return pages
+    
+    def edited_solutions(self, problems, skip):
+        """Analyze items for problems whose solution was filled in or edited by hand since its last analysis"""
+        for problem_key, record in sorted(problems.items()):
+            if problem_key in skip or not record.latest:
                 continue
-            
-            problem_key = f"{contest_id}_{index}"
-            
-            # Skip if already processed (keep first AC)
-            if problem_key in processed_problems:
+            folder_path = os.path.join(self.base_dir, record.folder)
+            if solution_hash(folder_path) == record.latest.code_hash:
                 continue
-            
-            # Get submission details
-            language = sub.get('programmingLanguage', 'Unknown')
-            time_ms = sub.get('timeConsumedMillis', 0)
-            memory_kb = sub.get('memoryConsumedBytes', 0) / 1024  # Convert to KB
-            creation_time = datetime.fromtimestamp(sub.get('creationTimeSeconds', 0)).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Get problem rating
-            rating = self.get_problem_rating(contest_id, index)
-            time.sleep(0.5)  # Rate limiting for API
-            
-            # Determine file extension
-            ext = lang_ext_map.get(language, 'txt')
-            
-            # Create folder structure
-            folder_name = f"{contest_id}-{index}-{name.replace(' ', '-').replace('/', '-')[:50]}"
-            folder_path = os.path.join(self.base_dir, folder_name)
-            os.makedirs(folder_path, exist_ok=True)
-            
-            # Try to fetch source code
-            code_url = f"https://codeforces.com/contest/{contest_id}/submission/{sub['id']}"
-            print(f"\nProcessing: {name} ({contest_id}{index})")
-            print(f"  Verdict: {sub['verdict']}, Time: {time_ms}ms, Memory: {memory_kb:.0f}KB")
-            print(f"  Note: Source code must be manually added or fetched via authenticated session")
-            
-            # Create a placeholder for source code
-            source_file = os.path.join(folder_path, f"solution.{ext}")
-            if not os.path.exists(source_file):
-                with open(source_file, 'w', encoding='utf-8') as f:
-                    f.write(f"// Solution for {name}\n")
-                    f.write(f"// Contest: {contest_id}, Problem: {index}\n")
-                    f.write(f"// Language: {language}\n")
-                    f.write(f"// Verdict: {sub['verdict']}\n")
-                    f.write(f"// Time: {time_ms}ms, Memory: {memory_kb:.0f}KB\n\n")
-                    f.write(f"// Source code URL: {code_url}\n")
-                    f.write(f"// Please add your solution code here\n")
-            
-            # Store problem info
-            processed_problems[problem_key] = {
-                'contest_id': contest_id,
-                'index': index,
-                'name': name,
-                'rating': rating,
-                'tags': tags,
-                'folder': folder_name,
-                'language': language,
-                'time_ms': time_ms,
-                'memory_kb': memory_kb
-            }
-            
-            # Create performance graph
-            graph_created = self.create_performance_graph(
-                folder_path,
-                time_ms,
-                memory_kb,
-                name
-            )
-            
-            # Analyze complexity (if code exists and is not placeholder)
-            complexity_data = None
-            if os.path.exists(source_file):
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    code = f.read()
-                    if self.gemini_api_key and len(code) > 200 and "Please add your solution code here" not in code:
-                        print(f"  Analyzing complexity...")
-                        complexity_data = self.analyze_complexity(code, language)
-                        if complexity_data:
-                            print(f"  ✓ Complexity: {complexity_data['time_complexity']}, {complexity_data['space_complexity']}")
-                        time.sleep(2)
-            
-            # Create problem README
-            submission_info = {
-                'verdict': sub['verdict'],
-                'language': language,
-                'time_ms': time_ms,
-                'memory_kb': memory_kb,
-                'creation_time': creation_time
-            }
-            
-            problem_info = {
-                'contest_id': contest_id,
-                'index': index,
-                'name': name,
-                'rating': rating,
-                'tags': tags
-            }
-            
-            self.create_problem_readme(
-                folder_path,
-                problem_info,
-                submission_info,
-                complexity_data,
-                graph_created
-            )
-        
-        # Create main README
-        self.create_main_readme(processed_problems)
-        
-        print(f"\n✅ Processed {len(processed_problems)} accepted solutions")
+            print(f"\nSolution changed: {record.title} ({record.contest_id}{record.index})")
+            perf = record.latest.perf
+            job = graph_job('runtime_memory', folder_path, perf.time_ms, perf.memory_kb, record.title)
+            stale = record.graph != graph_fingerprint(job) or not os.path.exists(job[2])
+            record.graph = graph_fingerprint(job)
+            yield record, (record, folder_path, job, stale)
+    
+    def reanalyze_solutions(self, problems, skip):
+        """Analyze -> complete -> checkpoint for edited solutions; returns (record, page)"""
+        solutions = Pipeline('codeforces-edits', self.resources.queue_size)
+        solutions.add_stage('analyze', self.analyze_submission, self.resources.analysis_workers)
+        solutions.add_stage('complete', self.complete_analysis, self.resources.queue_size)
+        solutions.add_stage('checkpoint', self.checkpoint_submission)
+        return solutions.run(self.edited_solutions(problems, skip))
+    
+    def collect_submissions(self, last_submission_id, problems, progress):
+        """Fetch -> prepare -> analyze -> complete -> checkpoint, processing AC submissions as
+        they stream in; returns (record, page) in fetch order"""
+        submissions = Pipeline('codeforces', self.resources.queue_size)
+        submissions.add_stage('prepare', self.prepare_submission)
+        submissions.add_stage('analyze', self.analyze_submission, self.resources.analysis_workers)
+        # Enough waiters that solutions queued for one Gemini batch never hold up the rest
+        submissions.add_stage('complete', self.complete_analysis, self.resources.queue_size)
+        submissions.add_stage('checkpoint', self.checkpoint_submission)
+        return submissions.run(self.iter_new_accepted(last_submission_id, problems, progress))
+    
+    def render_page(self, page):
+        """Render stage: draw the problem's graph if its inputs changed"""
+        problem, folder_path, job, stale = page
+        graph_path = job[2]
+        if stale and not self.resources.renderer.render(job):
+            problem.graph = None  # Retry on the next run
+            return problem, folder_path, None
+        return problem, folder_path, os.path.basename(graph_path) if os.path.exists(graph_path) else None
+    
+    def write_page(self, page):
+        """Write stage: create the problem README"""
+        problem, folder_path, graph_file = page
+        self.create_problem_readme(folder_path, problem, graph_file)
+        return problem.key
+    
+    def sync(self):
+        """Main sync function"""
+        state = SyncState(os.path.join(self.base_dir, '.sync_state.json'))
+        problems = load_problems(state)
+        last_submission_id = state.data.get('last_submission_id', 0)
+        
+        print(f"Fetching submissions for handle: {self.handle}")
+        self.checkpoint = Checkpoint(os.path.join(self.cache_dir, 'codeforces-checkpoint.json'),
+                                     last_submission_id, self.checkpoint_interval)
+        
+        try:
+            pages = self.resume_checkpoint(problems)
+            updated_problems = {page[0].key for page in pages}
+            progress = {'count': 0, 'newest': last_submission_id}
+            for record, page in self.collect_submissions(last_submission_id, problems, progress):
+                problems[record.key] = record
+                updated_problems.add(record.key)
+                pages.append(page)
+            
+            # Solutions are filled in by hand after the sync, so their files are checked even without new submissions
+            edited = 0
+            for record, page in self.reanalyze_solutions(problems, set(updated_problems)):
+                updated_problems.add(record.key)
+                pages.append(page)
+                edited += 1
+            
+            if not progress['count'] and not updated_problems:
+                print("No new submissions found!")
+                if not os.path.exists(os.path.join(self.base_dir, 'README.md')) and problems:
+                    with span('codeforces.index'):
+                        self.create_main_readme(problems)
+                return
+            
+            print(f"Found {progress['count']} new submissions and {edited} edited solutions")
+            
+            # Render -> write the problem READMEs
+            writer = Pipeline('codeforces-pages', self.resources.queue_size)
+            writer.add_stage('render', self.render_page, self.resources.cpu_workers)
+            writer.add_stage('write', self.write_page)
+            writer.run(pages)
+            
+            # Create main README from the persisted records
+            if updated_problems or not os.path.exists(os.path.join(self.base_dir, 'README.md')):
+                # Rows rendered by an older row template are all redrawn once
+                reuse_rows = state.data.get('index_template') == CODEFORCES_ROW.digest
+                with span('codeforces.index'):
+                    state.data['index_rows'] = self.create_main_readme(
+                        problems, updated_problems if reuse_rows else None, state.data.get('index_rows'))
+                state.data['index_template'] = CODEFORCES_ROW.digest
+            
+            with span('codeforces.state'):
+                store_problems(state, problems)
+                state.data['last_submission_id'] = progress['newest']
+                state.save()
+            self.complexity_cache.save()
+            self.save_missing_problems()
+            self.checkpoint.clear()
+            
+            print(f"\n✅ Processed {len(updated_problems)} new accepted solutions ({len(problems)} total)")
+        except Exception:
+            # Keep everything processed so far for the next run
+            self.checkpoint.save()
+            raise
+        finally:
+            if self.owns_resources:
+                self.resources.close()
 
 
-if __name__ == "__main__":
+def main():
     syncer = CodeforcesSync()
     syncer.sync()
     print("\n✅ Sync completed successfully!")
+
+
+if __name__ == "__main__":
+    run_profiled('codeforces', main, __doc__.strip().split('\n')[0])
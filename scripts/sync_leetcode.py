@@ -4,547 +4,575 @@ LeetCode Solutions Sync Script
 Automatically syncs LeetCode submissions and generates documentation
 """
 
-import requests
-import json
 import os
+import sys
+from concurrent.futures import Future
+from functools import partial
 from datetime import datetime
-import time
-import re
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from urllib.parse import urlsplit
+
+# --probe answers before the pipeline, analysis and plotting modules below are imported
+if __name__ == "__main__" and '--probe' in sys.argv[1:]:
+    from sync_probe import probe
+    sys.exit(probe('leetcode'))
+
+from checkpoint import Checkpoint
+from complexity_cache import ComplexityCache
+from document_writer import DocumentWriter
+from graphql_fetch import GraphQLFetcher, PROBLEM_QUERY, SUBMISSION_QUERY, parse_problem, parse_submission
+from performance_graphs import graph_fingerprint, graph_job
+from pipeline import Pipeline, SyncResources
+from profiling import count, run_profiled, span
+from readme_templates import LEETCODE_INDEX, LEETCODE_PROBLEM, LEETCODE_ROW, render_rows
+from records import ComplexityResult, PerfMetrics, Problem, Submission, load_problems, store_problems
+from selection import SubmissionSelector, parse_memory, parse_runtime, selection_policy
+from static_complexity import estimate_complexity, language_family
+from sync_probe import leetcode_auth
+from sync_state import SyncState
 
 
 class LeetCodeSync:
-    def __init__(self):
+    # Bump when the complexity prompt changes so cached results are recomputed
+    COMPLEXITY_PROMPT_VERSION = 'leetcode-1'
+    EXT_MAP = {
+        'cpp': 'cpp', 'java': 'java', 'python': 'py',
+        'python3': 'py', 'c': 'c', 'csharp': 'cs',
+        'javascript': 'js', 'typescript': 'ts',
+        'php': 'php', 'swift': 'swift', 'kotlin': 'kt',
+        'go': 'go', 'ruby': 'rb', 'scala': 'scala',
+        'rust': 'rs'
+    }
+    
+    def __init__(self, resources=None):
         self.session = os.environ.get('LEETCODE_SESSION')
         self.csrf_token = os.environ.get('LEETCODE_CSRF')
         self.gemini_api_key = os.environ.get('GEMINI_API_KEY')
         self.base_dir = './leetcode'
+        self.cache_dir = os.environ.get('SYNC_CACHE_DIR', './.cache')
+        self.page_size = int(os.environ.get('LEETCODE_PAGE_SIZE', 20))
+        self.chunk_size = int(os.environ.get('LEETCODE_CHUNK_SIZE', 50))
+        self.checkpoint_interval = float(os.environ.get('SYNC_CHECKPOINT_INTERVAL', 30))
+        self.selection_policy = selection_policy()
         
         if not self.session or not self.csrf_token:
             raise ValueError("Missing LeetCode credentials!")
         
         os.makedirs(self.base_dir, exist_ok=True)
-    
-    @staticmethod
-    def clean_markdown(text):
-        """Remove markdown formatting like * and _ for clean output"""
-        if not text:
-            return text
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
-        return text.strip()
-    
-    def create_performance_graph(self, folder_path, runtime_percentile, memory_percentile, title):
-        """Create a bar chart showing runtime and memory percentiles"""
-        try:
-            categories = ['Runtime', 'Memory']
-            percentiles = [runtime_percentile, memory_percentile]
-            
-            fig, ax = plt.subplots(figsize=(8, 5))
-            bars = ax.bar(categories, percentiles, color=['#10B981', '#3B82F6'], width=0.5)
-            
-            ax.set_ylabel('Percentile (%)', fontsize=12, fontweight='bold')
-            ax.set_title(f'Performance: {title}', fontsize=14, fontweight='bold', pad=20)
-            ax.set_ylim(0, 100)
-            ax.grid(axis='y', alpha=0.3, linestyle='--')
-            ax.set_axisbelow(True)
-            
-            for bar, val in zip(bars, percentiles):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{val:.1f}%',
-                        ha='center', va='bottom', fontsize=11, fontweight='bold')
-            
-            ax.axhline(y=50, color='red', linestyle='--', alpha=0.5, linewidth=1, label='Median (50%)')
-            ax.legend(loc='upper right')
-            
-            plt.tight_layout()
-            
-            graph_path = os.path.join(folder_path, 'performance.png')
-            plt.savefig(graph_path, dpi=150, bbox_inches='tight')
-            plt.close()
-            
-            print(f"✓ Performance graph created: {graph_path}")
-            return True
-        except Exception as e:
-            print(f"Error creating graph: {e}")
-            return False
-    
-    def analyze_complexity(self, code, lang, max_retries=3):
-        """Analyze code complexity using Gemini API with retry logic"""
-        if not self.gemini_api_key:
-            print("No Gemini API key found, skipping complexity analysis")
-            return None
+        self.static_confidence = float(os.environ.get('STATIC_COMPLEXITY_MIN_CONFIDENCE', 0.75))
         
-        for attempt in range(max_retries):
-            try:
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.gemini_api_key}"
-                
-                prompt_text = "Analyze this " + lang + " code and provide ONLY the time and space complexity in Big O notation.\n\n"
-                prompt_text += "Code:\n" + code + "\n\n"
-                prompt_text += "Respond in this EXACT JSON format with NO markdown formatting, NO asterisks, NO underscores in explanations:\n"
-                prompt_text += '{\n'
-                prompt_text += '  "time_complexity": "O(...)",\n'
-                prompt_text += '  "space_complexity": "O(...)",\n'
-                prompt_text += '  "time_explanation": "brief explanation without any markdown formatting",\n'
-                prompt_text += '  "space_explanation": "brief explanation without any markdown formatting"\n'
-                prompt_text += '}'
-                
-                payload = {
-                    "contents": [{
-                        "parts": [{
-                            "text": prompt_text
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0.1,
-                        "maxOutputTokens": 500
-                    }
-                }
-                
-                headers = {'Content-Type': 'application/json'}
-                response = requests.post(url, headers=headers, json=payload, timeout=30)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    if 'candidates' in data and len(data['candidates']) > 0:
-                        content = data['candidates'][0]['content']['parts'][0]['text']
-                        content = content.strip()
-                        
-                        content = re.sub(r'```json\s*', '', content)
-                        content = re.sub(r'```\s*', '', content)
-                        
-                        start_idx = content.find('{')
-                        end_idx = content.rfind('}') + 1
-                        
-                        if start_idx != -1 and end_idx > start_idx:
-                            json_str = content[start_idx:end_idx]
-                            complexity_data = json.loads(json_str)
-                            
-                            complexity_data['time_explanation'] = self.clean_markdown(
-                                complexity_data.get('time_explanation', ''))
-                            complexity_data['space_explanation'] = self.clean_markdown(
-                                complexity_data.get('space_explanation', ''))
-                            
-                            return complexity_data
-                        else:
-                            print(f"Could not extract JSON (attempt {attempt + 1}/{max_retries})")
-                            if attempt < max_retries - 1:
-                                time.sleep(2)
-                                continue
-                            return None
-                    else:
-                        print(f"No candidates in response (attempt {attempt + 1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            time.sleep(2)
-                            continue
-                        return None
-                else:
-                    print(f"Gemini API error: {response.status_code} (attempt {attempt + 1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        time.sleep(3)
-                        continue
-                    return None
-                    
-            except Exception as e:
-                print(f"Complexity analysis error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(3)
-                    continue
-                return None
+        self.base_url = os.environ.get('LEETCODE_BASE_URL', 'https://leetcode.com').rstrip('/')
+        concurrency = int(os.environ.get('LEETCODE_CONCURRENCY', 8))
         
-        return None
-    
-    def get_problem_details(self, title_slug):
-        """Get problem details from LeetCode GraphQL API"""
-        graphql_url = "https://leetcode.com/graphql"
-        query = """
-        query questionTitle($titleSlug: String!) {
-          question(titleSlug: $titleSlug) {
-            questionId
-            questionFrontendId
-            title
-            difficulty
-          }
-        }
-        """
+        # Rate limits, HTTP sessions, the complexity cache and CPU slots may be
+        # shared with other syncers when run from sync_all.py
+        self.owns_resources = resources is None
+        self.resources = resources or SyncResources(self.cache_dir, pool_size=concurrency)
+        self.complexity_cache = self.resources.complexity_cache
         
-        headers = {
-            'Content-Type': 'application/json',
-            'referer': 'https://leetcode.com',
-        }
+        # Pace each endpoint near its limit instead of sleeping between calls
+        self.limiter = self.resources.limiter
+        self.limiter.configure(urlsplit(self.base_url).hostname,
+                               float(os.environ.get('LEETCODE_RATE', 5)), burst=concurrency)
         
-        cookies = {
-            'LEETCODE_SESSION': self.session,
-            'csrftoken': self.csrf_token
-        }
+        # One keep-alive session per host, with auth prepared once
+        self.http = self.resources.http
+        headers, cookies = leetcode_auth(self.session, self.csrf_token)
+        self.http.configure_host(urlsplit(self.base_url).hostname, headers=headers, cookies=cookies)
         
-        payload = {
-            'query': query,
-            'variables': {'titleSlug': title_slug}
-        }
+        # Submission pages change with every new submission, so by default they are only
+        # revalidated; problem and submission details are cached per lookup by the fetcher
+        self.http_cache = self.resources.http_cache
+        if self.http_cache:
+            self.http_cache.configure(f"{self.base_url}/api/submissions/",
+                                      float(os.environ.get('SYNC_HTTP_LIST_TTL', 0)))
         
-        try:
-            response = requests.post(graphql_url, json=payload, headers=headers, cookies=cookies)
-            data = response.json()
-            if 'data' in data and data['data']['question']:
-                return data['data']['question']
-            return None
-        except:
-            return None
+        self.fetcher = GraphQLFetcher(
+            self.http,
+            f"{self.base_url}/graphql",
+            max_workers=concurrency,
+            timeout=float(os.environ.get('LEETCODE_TIMEOUT', 15)),
+            batch_size=int(os.environ.get('LEETCODE_BATCH_SIZE', 20)),
+            cache=self.http_cache
+        )
+    
+    def local_complexity(self, code, lang, message=None):
+        """Complexity from the cache or a confident static estimate, returns (cache_key, result or None);
+        `message` is printed once an analysis actually runs"""
+        cache_key = ComplexityCache.make_key(code, lang, self.COMPLEXITY_PROMPT_VERSION)
+        cached = self.complexity_cache.get(cache_key)
+        if cached:
+            return cache_key, cached
+        
+        if message and (self.gemini_api_key or language_family(lang)):
+            print(message)
+        # Trust the offline estimate when it is confident enough
+        with self.resources.cpu_slots, span('static_analysis'):
+            estimate = estimate_complexity(code, lang)
+        if estimate and estimate['confidence'] >= self.static_confidence:
+            count('complexity.static')
+            print(f"  Static estimate used (confidence {estimate['confidence']:.2f})")
+            return cache_key, {field: estimate[field] for field in ComplexityCache.FIELDS}
+        return cache_key, None
+    
+    def request_complexity(self, code, lang, message=None):
+        """Complexity from the cache, a static estimate or a batched Gemini call, returns a Future"""
+        cache_key, result = self.local_complexity(code, lang, message)
+        if result or not self.gemini_api_key:
+            future = Future()
+            future.set_result(result)
+            return future
+        
+        future = self.resources.complexity_batcher.submit(code, lang)
+        future.add_done_callback(partial(self.cache_complexity, cache_key))
+        return future
+    
+    def cache_complexity(self, cache_key, future):
+        if future.result():
+            self.complexity_cache.put(cache_key, future.result())
+    
+    def analyze_complexity(self, code, lang):
+        """Analyze code complexity, waiting for the batched Gemini answer if one is needed"""
+        return self.request_complexity(code, lang).result()
+    
+    def get_problem_details(self, title_slug):
+        """Get problem details from LeetCode GraphQL API"""
+        data = self.fetcher.post(PROBLEM_QUERY, {'titleSlug': title_slug}) or {}
+        return parse_problem(data.get('question'))
     
     def get_submission_details(self, submission_id):
         """Try to get detailed submission info including percentiles"""
-        try:
-            graphql_url = "https://leetcode.com/graphql"
-            query = """
-            query submissionDetails($submissionId: Int!) {
-              submissionDetails(submissionId: $submissionId) {
-                runtime
-                runtimePercentile
-                memory
-                memoryPercentile
-              }
-            }
-            """
-            
-            headers = {
-                'Content-Type': 'application/json',
-                'referer': 'https://leetcode.com',
-            }
-            
-            cookies = {
-                'LEETCODE_SESSION': self.session,
-                'csrftoken': self.csrf_token
-            }
-            
-            payload = {
-                'query': query,
-                'variables': {'submissionId': submission_id}
-            }
-            
-            response = requests.post(graphql_url, json=payload, headers=headers, cookies=cookies)
-            data = response.json()
-            
-            if 'data' in data and data['data'].get('submissionDetails'):
-                details = data['data']['submissionDetails']
-                return {
-                    'runtime_percentile': details.get('runtimePercentile'),
-                    'memory_percentile': details.get('memoryPercentile')
-                }
-            return None
-        except Exception as e:
-            print(f"Error fetching submission details: {e}")
-            return None
+        data = self.fetcher.post(SUBMISSION_QUERY, {'submissionId': submission_id}) or {}
+        return parse_submission(data.get('submissionDetails'))
     
-    def create_problem_readme(self, folder_path, info, title_slug, performance_data, complexity_data, graph_created):
+    def create_problem_readme(self, folder_path, problem, graph_file):
         """Create README.md for a specific problem"""
         readme_path = os.path.join(folder_path, 'README.md')
         
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(f"# {info['title']}\n\n")
-            f.write(f"**Difficulty:** {info['difficulty']}\n\n")
-            f.write(f"**Problem Link:** [LeetCode](https://leetcode.com/problems/{title_slug}/)\n\n")
-            f.write(f"**Status:** Accepted\n\n")
-            
-            # Performance section
-            if graph_created and performance_data:
-                f.write("## Performance\n\n")
-                f.write("![Performance Graph](./performance.png)\n\n")
-            
-            # Performance metrics table
-            if performance_data and any(
-                perf['runtime_percentile'] > 0 or perf['memory_percentile'] > 0 
-                for perf in performance_data.values()
-            ):
-                f.write("## Performance Metrics\n\n")
-                f.write("| Language | Runtime Percentile | Memory Percentile |\n")
-                f.write("|----------|-------------------|------------------|\n")
-                for lang, perf in performance_data.items():
-                    f.write(f"| {lang.title()} | {perf['runtime_percentile']:.2f}% | {perf['memory_percentile']:.2f}% |\n")
-                f.write("\n")
-            
-            # Complexity analysis
-            if complexity_data:
-                f.write("## Complexity Analysis\n\n")
-                for lang, complexity in complexity_data.items():
-                    f.write(f"### {lang.title()}\n\n")
-                    f.write(f"- **Time Complexity:** {complexity['time_complexity']}\n")
-                    f.write(f"  - {complexity['time_explanation']}\n\n")
-                    f.write(f"- **Space Complexity:** {complexity['space_complexity']}\n")
-                    f.write(f"  - {complexity['space_explanation']}\n\n")
+        with DocumentWriter(readme_path) as f:
+            f.write(LEETCODE_PROBLEM.render(problem, graph_file))
         
-        print(f"Updated README: {readme_path}")
+        if f.changed:
+            print(f"Updated README: {readme_path}")
     
-    def create_main_readme(self, processed_problems, processed_langs):
-        """Create main README.md in leetcode folder"""
+    def create_main_readme(self, problems, touched=None, fingerprints=None):
+        """Create main README.md in leetcode folder, re-rendering only the rows of `touched` problems and rows
+        whose fields changed since `fingerprints`; returns the new row fingerprints"""
         print("\nCreating main README.md...")
         main_readme_path = os.path.join(self.base_dir, 'README.md')
         
         # Calculate statistics
-        total_problems = len(processed_problems)
         difficulty_count = {'Easy': 0, 'Medium': 0, 'Hard': 0}
         languages_used = set()
         
-        for title_slug, info in processed_problems.items():
-            difficulty = info.get('difficulty', 'Unknown')
-            if difficulty in difficulty_count:
-                difficulty_count[difficulty] += 1
-            
-            if title_slug in processed_langs:
-                languages_used.update(processed_langs[title_slug])
+        for problem in problems.values():
+            if problem.difficulty in difficulty_count:
+                difficulty_count[problem.difficulty] += 1
+            languages_used.update(problem.solutions)
         
         # Sort problems by number
         sorted_problems = sorted(
-            processed_problems.items(),
-            key=lambda x: int(x[1].get('number', '0') or '0') if x[1].get('number', '0') else 0
+            problems.values(),
+            key=lambda problem: int(problem.number) if str(problem.number).isdigit() else 0
         )
+        rows, fingerprints, rendered = render_rows(LEETCODE_ROW, sorted_problems, touched, main_readme_path,
+                                                   fingerprints)
         
-        with open(main_readme_path, 'w', encoding='utf-8') as f:
-            f.write("# 🚀 LeetCode Solutions\n\n")
-            f.write("My personal collection of LeetCode problem solutions, documenting my journey in mastering data structures and algorithms.\n\n")
-            
-            f.write("## 📊 Progress Statistics\n\n")
-            f.write(f"**Total Problems Solved:** {total_problems}\n\n")
-            f.write("| Difficulty | Count |\n")
-            f.write("|------------|-------|\n")
-            f.write(f"| 🟢 Easy | {difficulty_count['Easy']} |\n")
-            f.write(f"| 🟡 Medium | {difficulty_count['Medium']} |\n")
-            f.write(f"| 🔴 Hard | {difficulty_count['Hard']} |\n\n")
-            
-            f.write("**Languages Used:** " + ", ".join(sorted(lang.title() for lang in languages_used)) + "\n\n")
-            
-            f.write("## 📝 Problem List\n\n")
-            f.write("| # | Title | Difficulty | Solution |\n")
-            f.write("|---|-------|------------|----------|\n")
-            
-            for title_slug, info in sorted_problems:
-                number = info.get('number', '')
-                title = info.get('title', '')
-                difficulty = info.get('difficulty', 'Unknown')
-                folder = info.get('folder', '')
-                
-                diff_emoji = {'Easy': '🟢', 'Medium': '🟡', 'Hard': '🔴'}.get(difficulty, '⚪')
-                
-                langs = []
-                if title_slug in processed_langs:
-                    langs = sorted(processed_langs[title_slug])
-                
-                lang_badges = " ".join([f"`{lang}`" for lang in langs])
-                
-                f.write(f"| {number} | [{title}](./{folder}) | {diff_emoji} {difficulty} | {lang_badges} |\n")
-           
-            
-            f.write("## 🔗 My Profile\n\n")
-            f.write("**LeetCode:** [My Profile](https://leetcode.com/u/gourangadassamrat/)\n\n")
-            
-            f.write("## 📈 Features\n\n")
-            f.write("Each solution includes:\n")
-            f.write("- ✅ Problem statement and LeetCode link\n")
-            f.write("- 💻 Clean, well-commented code\n")
-            f.write("- ⏱️ Time complexity analysis\n")
-            f.write("- 💾 Space complexity analysis\n")
-            f.write("- 📊 Performance metrics (Runtime & Memory percentiles)\n")
-            f.write("- 📈 Visual performance graphs\n\n")
+        with DocumentWriter(main_readme_path) as f:
+            f.write(LEETCODE_INDEX.render(
+                len(problems),
+                difficulty_count,
+                languages_used,
+                rows,
+                datetime.now().strftime('%B %d, %Y')
+            ))
+        
+        if f.changed:
+            print(f"✓ Main README updated: {main_readme_path} ({rendered} rows rendered)")
+        else:
+            print(f"Main README unchanged: {main_readme_path}")
+        return fingerprints
+    
+    @staticmethod
+    def parse_percentile(value):
+        """Convert a percentile value from the API into a float, or None"""
+        try:
+            return float(value) if value is not None else None
+        except (ValueError, TypeError):
+            return None
+    
+    def submissions_params(self, cursor):
+        """Query of the /api/submissions/ page at `cursor`, an (offset, last_key) pair"""
+        offset, last_key = cursor
+        return {'offset': offset, 'limit': self.page_size, 'lastkey': last_key}
+    
+    @staticmethod
+    def read_submissions_page(data, cursor, last_submission_id):
+        """Split a fetched submissions page into (submissions newer than the watermark, cursor of the next
+        page or None once paging is done)"""
+        page = data.get('submissions_dump', [])
+        submissions = []
+        for sub in page:
+            if last_submission_id and int(sub.get('id') or 0) <= last_submission_id:
+                return submissions, None
+            submissions.append(sub)
+        
+        if not page or not data.get('has_next'):
+            return submissions, None
+        return submissions, (cursor[0] + len(page), data.get('last_key', ''))
+    
+    def iter_submissions(self, last_submission_id):
+        """Lazily page through /api/submissions/, stopping at an already processed id"""
+        url = f"{self.base_url}/api/submissions/"
+        cursor = (0, '')
+        
+        while cursor:
+            with span('leetcode.fetch'):
+                response = self.http.get(url, params=self.submissions_params(cursor))
+                response.raise_for_status()
+                data = response.json()
+            submissions, cursor = self.read_submissions_page(data, cursor, last_submission_id)
+            yield from submissions
+    
+    @staticmethod
+    def submission_metrics(sub):
+        """(runtime ms, memory KB) from a submissions list entry"""
+        return parse_runtime(sub.get('runtime')), parse_memory(sub.get('memory'))
+    
+    def make_selector(self, problems):
+        """One winning accepted submission per (problem, language) under the selection policy"""
+        def key(sub):
+            return (sub['title_slug'], sub['lang']) if sub['status_display'] == 'Accepted' else None
+        
+        def incumbent(key):
+            problem = problems.get(key[0])
+            record = problem.solutions.get(key[1]) if problem else None
+            return (record.perf.time_ms, record.perf.memory_kb) if record else None
+        
+        return SubmissionSelector(self.selection_policy, key, self.submission_metrics, incumbent)
+    
+    def select_submission(self, sub, problems):
+        """Return the content hash if the selected `sub` needs syncing, otherwise None"""
+        # Skip solutions whose code is unchanged since the last run
+        code_hash = SyncState.content_hash(sub.get('code', ''))
+        problem = problems.get(sub['title_slug'])
+        record = problem.solutions.get(sub['lang']) if problem else None
+        if record and record.code_hash == code_hash:
+            return None
+        return code_hash
+    
+    def queue_selected(self, winners, problems, pending):
+        """Add selected submissions with new or changed code to `pending`"""
+        for sub in winners:
+            code_hash = self.select_submission(sub, problems)
+            if code_hash:
+                pending.append((sub, code_hash))
+    
+    @staticmethod
+    def needs_details(problems, title_slug):
+        """True for unknown problems and placeholders recorded while their details could not be fetched"""
+        problem = problems.get(title_slug)
+        return problem is None or not problem.number
+    
+    def relocate_folder(self, old, new):
+        """Move the files of a placeholder folder into the problem's numbered folder"""
+        old_path = os.path.join(self.base_dir, old)
+        if old == new or not os.path.isdir(old_path):
+            return
+        new_path = os.path.join(self.base_dir, new)
+        os.makedirs(new_path, exist_ok=True)
+        for name in os.listdir(old_path):
+            target = os.path.join(new_path, name)
+            if not os.path.exists(target):
+                os.replace(os.path.join(old_path, name), target)
+        if not os.listdir(old_path):
+            os.rmdir(old_path)
+        print(f"Moved {old} to {new}")
+    
+    def record_problem(self, problems, title_slug, problem_info):
+        """Store fetched problem details, replacing any placeholder record and its folder"""
+        folder = f"{problem_info['questionFrontendId']}-{title_slug}"
+        placeholder = problems.get(title_slug)
+        if placeholder:
+            self.relocate_folder(placeholder.folder, folder)
+        problems[title_slug] = Problem(
+            title_slug,
+            problem_info['title'],
+            folder,
+            number=problem_info['questionFrontendId'],
+            difficulty=problem_info['difficulty'],
+            solutions=placeholder.solutions if placeholder else None
+        )
+    
+    def retry_placeholders(self, problems):
+        """Fetch the details an earlier run could not get, returns the keys of the completed problems"""
+        title_slugs = sorted(slug for slug in problems if self.needs_details(problems, slug))
+        if not title_slugs:
+            return set()
+        print(f"Retrying details for {len(title_slugs)} problems...")
+        with span('leetcode.details'):
+            problem_details, _ = self.fetcher.fetch_details(title_slugs, [])
+        completed = set()
+        for title_slug in title_slugs:
+            if problem_details.get(title_slug):
+                self.record_problem(problems, title_slug, problem_details[title_slug])
+                completed.add(title_slug)
+        return completed
+    
+    def missing_slugs(self, pending, problems):
+        """Slugs of a chunk whose problem details are still unknown"""
+        return sorted({sub['title_slug'] for sub, _ in pending if self.needs_details(problems, sub['title_slug'])})
+    
+    def chunk_lookups(self, pending, problems):
+        """Problems and submissions of a chunk whose details must be fetched"""
+        missing_slugs = self.missing_slugs(pending, problems)
+        detail_ids = []
+        for sub, _ in pending:
+            runtime_percentile = self.parse_percentile(sub.get('runtime_percentile'))
+            if (runtime_percentile is None or runtime_percentile == 0) and sub.get('id'):
+                detail_ids.append(sub['id'])
+        
+        if missing_slugs or detail_ids:
+            print(f"Fetching details for {len(missing_slugs)} problems and {len(detail_ids)} submissions...")
+        return missing_slugs, detail_ids
+    
+    def apply_details(self, pending, problems, problem_details, submission_details):
+        """Record fetched problems and yield the chunk's submissions ready for analysis"""
+        for title_slug in self.missing_slugs(pending, problems):
+            problem_info = problem_details.get(title_slug)
+            if problem_info:
+                self.record_problem(problems, title_slug, problem_info)
+            elif title_slug not in problems:
+                # Placeholder without a number; its details are fetched again on the next run
+                problems[title_slug] = Problem(
+                    title_slug,
+                    title_slug.replace('-', ' ').title(),
+                    title_slug,
+                    difficulty='Unknown'
+                )
+        
+        while pending:
+            sub, code_hash = pending.pop(0)
+            runtime_percentile = self.parse_percentile(sub.get('runtime_percentile'))
+            memory_percentile = self.parse_percentile(sub.get('memory_percentile'))
             
-            f.write("## 🛠️ Tech Stack\n\n")
-            f.write("- **Automated Sync:** GitHub Actions\n")
-            f.write("- **Complexity Analysis:** Google Gemini AI\n")
-            f.write("- **Visualization:** Matplotlib\n\n")
+            # Fall back to GraphQL details if percentiles are None or 0
+            details = submission_details.get(sub.get('id'))
+            if details:
+                runtime_percentile = self.parse_percentile(details.get('runtime_percentile'))
+                memory_percentile = self.parse_percentile(details.get('memory_percentile'))
             
-            f.write("---\n\n")
-            f.write("_🎯 Consistency is key. Keep coding, keep learning!_ 💻\n\n")
-            f.write(f"_Last updated: {datetime.now().strftime('%B %d, %Y')}_\n")
+            yield sub, code_hash, problems[sub['title_slug']].folder, runtime_percentile, memory_percentile
+    
+    def resolve_chunk(self, pending, problems):
+        """Resolve details for a chunk of submissions, yielding them ready for analysis"""
+        # Resolve problem and submission details concurrently
+        missing_slugs, detail_ids = self.chunk_lookups(pending, problems)
+        with span('leetcode.details'):
+            problem_details, submission_details = self.fetcher.fetch_details(missing_slugs, detail_ids)
+        yield from self.apply_details(pending, problems, problem_details, submission_details)
+    
+    @staticmethod
+    def note_submission(sub, progress):
+        """Count a fetched submission, logging the fields of the first one"""
+        if progress['count'] == 0:
+            print("Sample submission fields:", list(sub.keys()))
+            if 'runtime_percentile' in sub:
+                print(f"Sample runtime_percentile: {sub.get('runtime_percentile')}")
+            if 'memory_percentile' in sub:
+                print(f"Sample memory_percentile: {sub.get('memory_percentile')}")
+        progress['count'] += 1
+        progress['newest'] = max(progress['newest'], int(sub.get('id') or 0))
+    
+    def iter_pending(self, last_submission_id, problems, progress):
+        """Fetch stage: stream submissions and yield the ones that need syncing, chunk by chunk"""
+        selector = self.make_selector(problems)
+        pending = []
+        for sub in self.iter_submissions(last_submission_id):
+            self.note_submission(sub, progress)
+            self.queue_selected(selector.offer(sub), problems, pending)
+            if len(pending) >= self.chunk_size:
+                yield from self.resolve_chunk(pending, problems)
         
-        print(f"✓ Main README updated: {main_readme_path}")
+        # Ranked policies only know their winners once the stream is exhausted
+        self.queue_selected(selector.finish(), problems, pending)
+        while pending:
+            chunk, pending = pending[:self.chunk_size], pending[self.chunk_size:]
+            yield from self.resolve_chunk(chunk, problems)
     
-    def sync(self):
-        """Main sync function"""
-        url = "https://leetcode.com/api/submissions/"
+    def store_submission(self, item):
+        """Write the solution to disk and build its record, returns (slug, lang, record, code)"""
+        sub, code_hash, folder, runtime_percentile, memory_percentile = item
+        title_slug = sub['title_slug']
+        lang = sub['lang']
+        code = sub.pop('code', '')
+        
+        folder_name = os.path.join(self.base_dir, folder)
+        os.makedirs(folder_name, exist_ok=True)
+        
+        # Save solution
+        ext = self.EXT_MAP.get(lang, 'txt')
+        filename = os.path.join(folder_name, f"solution.{ext}")
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(code)
         
-        cookies = {
-            'LEETCODE_SESSION': self.session,
-            'csrftoken': self.csrf_token
-        }
+        print(f"Saved: {filename}")
+        
+        record = Submission(sub.get('id'), lang, sub['status_display'], sub.get('timestamp'), code_hash)
+        
+        # Store performance data; absolute usage is kept for the ranked selection policies
+        runtime_ms, memory_kb = self.submission_metrics(sub)
+        if runtime_percentile is not None and memory_percentile is not None:
+            record.perf = PerfMetrics(runtime_percentile, memory_percentile, runtime_ms, memory_kb)
+            print(f"  Runtime: {runtime_percentile:.2f}%, Memory: {memory_percentile:.2f}%")
+        else:
+            record.perf = PerfMetrics(time_ms=runtime_ms, memory_kb=memory_kb)
+            print("  No performance data available for this submission")
+        return title_slug, lang, record, code
+    
+    def analyze_submission(self, item):
+        """Analyze stage: write the solution to disk and queue its analysis, so Gemini calls are batched"""
+        title_slug, lang, record, code = self.store_submission(item)
+        message = f"Analyzing complexity for {title_slug} ({lang})..."
+        return title_slug, lang, record, self.request_complexity(code, lang, message)
+    
+    def complete_analysis(self, item):
+        """Complete stage: wait for the solution's complexity answer"""
+        title_slug, lang, record, future = item
+        record.complexity = ComplexityResult.from_dict(future.result())
+        if record.complexity:
+            print(f"✓ Complexity analyzed: {record.complexity.time_complexity}, {record.complexity.space_complexity}")
         
-        headers = {
-            'referer': 'https://leetcode.com',
-            'x-csrftoken': self.csrf_token
-        }
+        return title_slug, lang, record
+    
+    def checkpoint_solution(self, item, problems):
+        """Checkpoint stage: remember an analyzed solution so an interrupted run can resume"""
+        title_slug, lang, record = item
+        problem = problems[title_slug]
+        entry = Problem(title_slug, problem.title, problem.folder, problem.number, problem.difficulty,
+                        solutions={lang: record})
+        self.checkpoint.add(title_slug, entry.to_dict())
+        return item
+    
+    def resume_checkpoint(self, problems):
+        """Merge solutions analyzed by an interrupted run, returns their problem keys"""
+        resumed = set()
+        for title_slug, data in self.checkpoint.load().items():
+            entry = Problem.from_dict(title_slug, data)
+            if title_slug in problems:
+                problems[title_slug].solutions.update(entry.solutions)
+            else:
+                problems[title_slug] = entry
+            resumed.add(title_slug)
+        if resumed:
+            print(f"Resuming from checkpoint: {len(resumed)} problems already processed")
+        return resumed
+    
+    def collect_solutions(self, last_submission_id, problems, progress):
+        """Fetch -> analyze -> complete -> checkpoint: submissions stream through bounded queues, so
+        only a chunk of pending code is held at once; returns (slug, lang, record) in fetch order"""
+        solutions = Pipeline('leetcode', self.resources.queue_size)
+        solutions.add_stage('analyze', self.analyze_submission, self.resources.analysis_workers)
+        # Enough waiters that solutions queued for one Gemini batch never hold up the rest
+        solutions.add_stage('complete', self.complete_analysis, self.resources.queue_size)
+        solutions.add_stage('checkpoint', partial(self.checkpoint_solution, problems=problems))
+        return solutions.run(self.iter_pending(last_submission_id, problems, progress))
+    
+    def render_page(self, page):
+        """Render stage: draw the problem's graph if its inputs changed"""
+        problem, folder_path, job, stale = page
+        graph_file = None
+        if job:
+            graph_path = job[2]
+            if stale and not self.resources.renderer.render(job):
+                problem.graph = None  # Retry on the next run
+            elif os.path.exists(graph_path):
+                graph_file = os.path.basename(graph_path)
+        return problem, folder_path, graph_file
+    
+    def write_page(self, page):
+        """Write stage: create the problem README"""
+        problem, folder_path, graph_file = page
+        self.create_problem_readme(folder_path, problem, graph_file)
+        return problem.key
+    
+    def sync(self):
+        """Main sync function"""
+        state = SyncState(os.path.join(self.base_dir, '.sync_state.json'))
+        last_submission_id = state.data.get('last_submission_id', 0)
+        self.checkpoint = Checkpoint(os.path.join(self.cache_dir, 'leetcode-checkpoint.json'),
+                                     last_submission_id, self.checkpoint_interval)
         
         try:
-            response = requests.get(url, cookies=cookies, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            problems = load_problems(state)
+            touched_problems = self.resume_checkpoint(problems)
+            touched_problems |= self.retry_placeholders(problems)
             
-            if 'submissions_dump' in data:
-                submissions = data['submissions_dump']
-                print(f"Found {len(submissions)} submissions")
-                
-                # Debug info
-                if len(submissions) > 0:
-                    print("Sample submission fields:", list(submissions[0].keys()))
-                    if 'runtime_percentile' in submissions[0]:
-                        print(f"Sample runtime_percentile: {submissions[0].get('runtime_percentile')}")
-                    if 'memory_percentile' in submissions[0]:
-                        print(f"Sample memory_percentile: {submissions[0].get('memory_percentile')}")
-                
-                processed_problems = {}
-                processed_langs = {}
-                solution_complexities = {}
-                solution_performance = {}
-                
-                ext_map = {
-                    'cpp': 'cpp', 'java': 'java', 'python': 'py',
-                    'python3': 'py', 'c': 'c', 'csharp': 'cs',
-                    'javascript': 'js', 'typescript': 'ts',
-                    'php': 'php', 'swift': 'swift', 'kotlin': 'kt',
-                    'go': 'go', 'ruby': 'rb', 'scala': 'scala',
-                    'rust': 'rs'
-                }
-                
-                for sub in submissions:
-                    if sub['status_display'] == 'Accepted':
-                        title_slug = sub['title_slug']
-                        lang = sub['lang']
-                        code = sub.get('code', '')
-                        submission_id = sub.get('id')
-                        
-                        # Handle percentile data
-                        runtime_percentile = sub.get('runtime_percentile')
-                        memory_percentile = sub.get('memory_percentile')
-                        
-                        try:
-                            runtime_percentile = float(runtime_percentile) if runtime_percentile is not None else None
-                        except (ValueError, TypeError):
-                            runtime_percentile = None
-                        
-                        try:
-                            memory_percentile = float(memory_percentile) if memory_percentile is not None else None
-                        except (ValueError, TypeError):
-                            memory_percentile = None
-                        
-                        # Try GraphQL API if percentiles are None or 0
-                        if (runtime_percentile is None or runtime_percentile == 0) and submission_id:
-                            print(f"Trying to fetch detailed stats for submission {submission_id}...")
-                            details = self.get_submission_details(submission_id)
-                            if details:
-                                runtime_percentile = details.get('runtime_percentile')
-                                memory_percentile = details.get('memory_percentile')
-                                try:
-                                    runtime_percentile = float(runtime_percentile) if runtime_percentile is not None else None
-                                except (ValueError, TypeError):
-                                    runtime_percentile = None
-                                try:
-                                    memory_percentile = float(memory_percentile) if memory_percentile is not None else None
-                                except (ValueError, TypeError):
-                                    memory_percentile = None
-                        
-                        # Skip if already processed
-                        if title_slug in processed_langs and lang in processed_langs[title_slug]:
-                            continue
-                        
-                        if title_slug not in processed_langs:
-                            processed_langs[title_slug] = set()
-                        processed_langs[title_slug].add(lang)
-                        
-                        # Get problem details
-                        if title_slug not in processed_problems:
-                            problem_info = self.get_problem_details(title_slug)
-                            if problem_info:
-                                processed_problems[title_slug] = {
-                                    'number': problem_info['questionFrontendId'],
-                                    'title': problem_info['title'],
-                                    'difficulty': problem_info['difficulty'],
-                                    'folder': f"{problem_info['questionFrontendId']}-{title_slug}"
-                                }
-                            else:
-                                processed_problems[title_slug] = {
-                                    'number': '',
-                                    'title': title_slug.replace('-', ' ').title(),
-                                    'difficulty': 'Unknown',
-                                    'folder': title_slug
-                                }
-                        
-                        folder_name = os.path.join(self.base_dir, processed_problems[title_slug]['folder'])
-                        os.makedirs(folder_name, exist_ok=True)
-                        
-                        # Save solution
-                        ext = ext_map.get(lang, 'txt')
-                        filename = os.path.join(folder_name, f"solution.{ext}")
-                        with open(filename, 'w', encoding='utf-8') as f:
-                            f.write(code)
-                        
-                        print(f"Saved: {filename}")
-                        
-                        # Store performance data
-                        if runtime_percentile is not None and memory_percentile is not None:
-                            if title_slug not in solution_performance:
-                                solution_performance[title_slug] = {}
-                            solution_performance[title_slug][lang] = {
-                                'runtime_percentile': runtime_percentile,
-                                'memory_percentile': memory_percentile
-                            }
-                            print(f"  Runtime: {runtime_percentile:.2f}%, Memory: {memory_percentile:.2f}%")
-                        else:
-                            print(f"  No performance data available for this submission")
-                        
-                        # Analyze complexity
-                        if self.gemini_api_key:
-                            print(f"Analyzing complexity for {title_slug} ({lang})...")
-                            complexity = self.analyze_complexity(code, lang)
-                            if complexity:
-                                if title_slug not in solution_complexities:
-                                    solution_complexities[title_slug] = {}
-                                solution_complexities[title_slug][lang] = complexity
-                                print(f"✓ Complexity analyzed: {complexity['time_complexity']}, {complexity['space_complexity']}")
-                            time.sleep(2)
-                
-                # Create README files
-                for title_slug, info in processed_problems.items():
-                    folder_path = os.path.join(self.base_dir, info['folder'])
-                    
-                    # Create performance graph
-                    graph_created = False
-                    if title_slug in solution_performance:
-                        first_lang = list(solution_performance[title_slug].keys())[0]
-                        perf = solution_performance[title_slug][first_lang]
-                        graph_created = self.create_performance_graph(
-                            folder_path,
-                            perf['runtime_percentile'],
-                            perf['memory_percentile'],
-                            info['title']
-                        )
-                    
-                    # Create problem README
-                    self.create_problem_readme(
-                        folder_path,
-                        info,
-                        title_slug,
-                        solution_performance.get(title_slug),
-                        solution_complexities.get(title_slug),
-                        graph_created
-                    )
+            progress = {'count': 0, 'newest': last_submission_id}
+            for title_slug, lang, record in self.collect_solutions(last_submission_id, problems, progress):
+                problems[title_slug].solutions[lang] = record
+                touched_problems.add(title_slug)
+            print(f"Found {progress['count']} new submissions")
+            
+            # Queue the graphs whose inputs changed
+            pages = []
+            for title_slug in sorted(touched_problems):
+                problem = problems[title_slug]
+                folder_path = os.path.join(self.base_dir, problem.folder)
                 
-                # Create main README
-                self.create_main_readme(processed_problems, processed_langs)
+                job = None
+                stale = False
+                perf = next((sub.perf for sub in problem.solutions.values() if sub.perf.has_percentiles), None)
+                if perf:
+                    job = graph_job('percentile', folder_path,
+                                    perf.runtime_percentile, perf.memory_percentile, problem.title)
+                    fingerprint = graph_fingerprint(job)
+                    stale = problem.graph != fingerprint or not os.path.exists(job[2])
+                    problem.graph = fingerprint
                 
+                pages.append((problem, folder_path, job, stale))
+            
+            # Render -> write README files for problems with new or changed solutions
+            writer = Pipeline('leetcode-pages', self.resources.queue_size)
+            writer.add_stage('render', self.render_page, self.resources.cpu_workers)
+            writer.add_stage('write', self.write_page)
+            writer.run(pages)
+            
+            # Create main README from the persisted records
+            if touched_problems or not os.path.exists(os.path.join(self.base_dir, 'README.md')):
+                # Rows rendered by an older row template are all redrawn once
+                reuse_rows = state.data.get('index_template') == LEETCODE_ROW.digest
+                with span('leetcode.index'):
+                    state.data['index_rows'] = self.create_main_readme(
+                        problems, touched_problems if reuse_rows else None, state.data.get('index_rows'))
+                state.data['index_template'] = LEETCODE_ROW.digest
             else:
-                print("No submissions found in response")
+                print("No new or changed solutions")
+            
+            with span('leetcode.state'):
+                store_problems(state, problems)
+                state.data.pop('solutions', None)  # Superseded by per-problem solutions
+                state.data['last_submission_id'] = progress['newest']
+                state.save()
+            self.complexity_cache.save()
+            self.checkpoint.clear()
                 
         except Exception as e:
+            # Keep everything analyzed so far for the next run
+            self.checkpoint.save()
             print(f"Error: {e}")
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            if self.owns_resources:
+                self.resources.close()
 
 
-if __name__ == "__main__":
+def main():
     syncer = LeetCodeSync()
     syncer.sync()
     print("\n✅ Sync completed successfully!")
+
+
+if __name__ == "__main__":
+    run_profiled('leetcode', main, __doc__.strip().split('\n')[0])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+No-Change Probe
+Pre-flight check behind `--probe`: one request for the newest submission,
+compared with the watermark of the sync state. Only the HTTP client and the
+state store are imported, so a day without submissions costs about a second
+"""
+
+import os
+from urllib.parse import urlsplit
+
+from http_client import HttpClient
+from solution_files import solution_hash
+from sync_state import SyncState
+
+
+# Exit status of a probe that found nothing to sync; 0 means a full sync is needed
+NO_CHANGES = 3
+
+
+def leetcode_auth(session, csrf_token):
+    """Headers and cookies sent with every LeetCode request"""
+    headers = {
+        'referer': 'https://leetcode.com',
+        'x-csrftoken': csrf_token
+    }
+    cookies = {
+        'LEETCODE_SESSION': session,
+        'csrftoken': csrf_token
+    }
+    return headers, cookies
+
+
+def leetcode_newest(http):
+    """Id of the newest LeetCode submission, from a one-entry submissions page"""
+    session = os.environ.get('LEETCODE_SESSION')
+    csrf_token = os.environ.get('LEETCODE_CSRF')
+    if not session or not csrf_token:
+        raise ValueError("Missing LeetCode credentials!")
+
+    base_url = os.environ.get('LEETCODE_BASE_URL', 'https://leetcode.com').rstrip('/')
+    headers, cookies = leetcode_auth(session, csrf_token)
+    http.configure_host(urlsplit(base_url).hostname, headers=headers, cookies=cookies)
+    response = http.get(f"{base_url}/api/submissions/", params={'offset': 0, 'limit': 1, 'lastkey': ''})
+    response.raise_for_status()
+    page = response.json().get('submissions_dump', [])
+    return int(page[0].get('id') or 0) if page else 0
+
+
+def codeforces_newest(http):
+    """Id of the newest Codeforces submission, from a one-entry user.status call"""
+    handle = os.environ.get('CODEFORCES_HANDLE')
+    if not handle:
+        raise ValueError("Missing Codeforces handle!")
+
+    api_base = os.environ.get('CODEFORCES_API_BASE', "https://codeforces.com/api").rstrip('/')
+    response = http.get(f"{api_base}/user.status", params={'handle': handle, 'from': 1, 'count': 1})
+    response.raise_for_status()
+    data = response.json()
+    if data.get('status') != 'OK':
+        raise RuntimeError(f"API Error: {data.get('comment', 'Unknown error')}")
+    result = data.get('result') or []
+    return result[0].get('id', 0) if result else 0
+
+
+# Platform -> (output folder, checkpoint file in the cache dir, newest submission lookup)
+PLATFORMS = {
+    'leetcode': ('./leetcode', 'leetcode-checkpoint.json', leetcode_newest),
+    'codeforces': ('./codeforces', 'codeforces-checkpoint.json', codeforces_newest),
+}
+
+
+def configured_platforms():
+    """Platforms whose credentials are set, as sync_all.py decides which to run"""
+    platforms = []
+    if os.environ.get('LEETCODE_SESSION') and os.environ.get('LEETCODE_CSRF'):
+        platforms.append('leetcode')
+    if os.environ.get('CODEFORCES_HANDLE'):
+        platforms.append('codeforces')
+    return platforms
+
+
+def edited_solutions(base_dir, state):
+    """True when a Codeforces solution was filled in or changed by hand since its last analysis"""
+    for problem in state.data.get('problems', {}).values():
+        stored = next((sub.get('hash') for sub in problem.get('solutions', {}).values()), None)
+        if solution_hash(os.path.join(base_dir, problem.get('folder', ''))) != stored:
+            return True
+    return False
+
+
+def stored_watermark(name):
+    """Watermark of earlier runs, or None when the next sync has work regardless of new submissions"""
+    base_dir, checkpoint_name, _ = PLATFORMS[name]
+    cache_dir = os.environ.get('SYNC_CACHE_DIR', './.cache')
+    if os.path.exists(os.path.join(cache_dir, checkpoint_name)):
+        print(f"{name}: an unfinished run left a checkpoint")
+        return None
+    if not os.path.exists(os.path.join(base_dir, 'README.md')):
+        print(f"{name}: no generated index yet")
+        return None
+    state = SyncState(os.path.join(base_dir, '.sync_state.json'))
+    if name == 'leetcode' and any(not problem.get('number') for problem in state.data.get('problems', {}).values()):
+        print(f"{name}: problem details missing since an earlier run")
+        return None
+    if name == 'codeforces' and edited_solutions(base_dir, state):
+        print(f"{name}: solution files edited since the last sync")
+        return None
+    watermark = state.data.get('last_submission_id')
+    if not watermark:
+        print(f"{name}: no sync state yet")
+        return None
+    return watermark
+
+
+def has_changes(name, http):
+    watermark = stored_watermark(name)
+    if watermark is None:
+        return True
+    newest = PLATFORMS[name][2](http)
+    if newest > watermark:
+        print(f"{name}: new submissions (newest {newest}, last synced {watermark})")
+        return True
+    print(f"{name}: no new submissions since {watermark}")
+    return False
+
+
+def probe(*names):
+    """Exit status for --probe: 0 if any platform needs a sync, NO_CHANGES otherwise"""
+    if not names:
+        raise ValueError("No platform credentials configured!")
+    http = HttpClient(
+        timeout=float(os.environ.get('SYNC_HTTP_TIMEOUT', 30)),
+        retries=int(os.environ.get('SYNC_HTTP_RETRIES', 3))
+    )
+    try:
+        # Every platform is probed so the log shows each one's state
+        changed = [name for name in names if has_changes(name, http)]
+    finally:
+        http.close()
+    return 0 if changed else NO_CHANGES
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Sync State Store
+Persists what previous sync runs already processed so daily runs stay incremental
+"""
+
+import hashlib
+import json
+
+from document_writer import write_if_changed
+
+
+class SyncState:
+    def __init__(self, path):
+        self.path = path
+        self.data = self.load()
+
+    @staticmethod
+    def content_hash(text):
+        """Stable hash of solution code, used to detect changed submissions"""
+        return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+    def load(self):
+        """Load state from disk, starting fresh if missing or corrupt"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Could not read sync state {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Write state atomically, and only when it changed, so an interrupted run never leaves a torn file"""
+        write_if_changed(self.path, json.dumps(self.data, indent=1, sort_keys=True, ensure_ascii=False) + '\n')
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Template Engine
+Compiles small text templates into plain Python render functions once, then
+reuses them for every page
+
+Syntax:
+    {{ expr }} or {{ expr:spec }}   f-string replacement field
+    {% if expr %} {% elif expr %} {% else %} {% endif %}
+    {% for target in expr %} {% endfor %}
+    {% set name = expr %}
+A block tag alone on its line removes the whole line from the output.
+"""
+
+import hashlib
+import re
+
+
+TOKEN = re.compile(r'(\{\{.*?\}\}|\{%.*?%\})', re.DOTALL)
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def split_tokens(source):
+    """Split into ('text' | 'expr' | 'tag', value) tokens, trimming lines that only hold a tag"""
+    parts = TOKEN.split(source)
+    tokens = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            tokens.append(['text', part])
+        elif part.startswith('{{'):
+            tokens.append(['expr', part[2:-2].strip()])
+        else:
+            tokens.append(['tag', part[2:-2].strip()])
+
+    # Decide on the untouched text first, then cut the whitespace around trimmed tags
+    trimmed = set()
+    for i in range(1, len(tokens), 2):
+        before = tokens[i - 1][1]
+        after = tokens[i + 1][1]
+        line_start = before.rfind('\n') + 1
+        starts_line = (line_start > 0 or i == 1) and not before[line_start:].strip(' \t')
+        ends_line = after.startswith('\n') or (not after and i + 2 == len(tokens))
+        if tokens[i][0] == 'tag' and starts_line and ends_line:
+            trimmed.add(i)
+
+    for i in range(0, len(tokens), 2):
+        text = tokens[i][1]
+        start = 1 if i - 1 in trimmed else 0
+        end = text.rfind('\n') + 1 if i + 1 in trimmed else len(text)
+        tokens[i][1] = text[start:max(start, end)]
+    return tokens
+
+
+def fstring_literal(field):
+    """A Python f-string literal holding one replacement field"""
+    for quote in ("'", '"', "'''", '"""'):
+        if quote not in field:
+            return f"f{quote}{{{field}}}{quote}"
+    raise TemplateError(f"Cannot quote template expression: {field}")
+
+
+def generate_source(source, params):
+    """Translate a template into the source of `def render(<params>)`"""
+    lines = [f"def render({', '.join(params)}):", "    _out = []", "    _write = _out.append"]
+    stack = []
+
+    def emit(code):
+        lines.append('    ' * (len(stack) + 1) + code)
+
+    for kind, value in split_tokens(source):
+        if kind == 'text':
+            if value:
+                emit(f"_write({value!r})")
+        elif kind == 'expr':
+            emit(f"_write({fstring_literal(value)})")
+        else:
+            keyword = value.split(None, 1)[0] if value else ''
+            if keyword in ('if', 'for'):
+                emit(value + ':')
+                stack.append(keyword)
+            elif keyword in ('elif', 'else'):
+                if not stack or stack[-1] != 'if':
+                    raise TemplateError(f"'{keyword}' outside of an if block")
+                stack.pop()
+                emit(value + ':')
+                stack.append('if')
+            elif keyword in ('endif', 'endfor'):
+                if not stack or stack.pop() != keyword[3:]:
+                    raise TemplateError(f"Unexpected '{keyword}'")
+            elif keyword == 'set':
+                emit(value[4:].strip())
+            else:
+                raise TemplateError(f"Unknown template tag: {value}")
+
+    if stack:
+        raise TemplateError(f"Unclosed '{stack[-1]}' block")
+    emit("return ''.join(_out)")
+    return '\n'.join(lines) + '\n'
+
+
+class Template:
+    def __init__(self, name, source, params, helpers=None):
+        self.name = name
+        self.source = source
+        self.params = tuple(params)
+        self.helpers = helpers or {}
+        self.compiled = None
+
+    @property
+    def digest(self):
+        """Identifies the template text, so output rendered from an older version can be detected"""
+        return hashlib.sha1(self.source.encode('utf-8')).hexdigest()
+
+    def compile(self):
+        """Build the render function on first use and keep it"""
+        if self.compiled is None:
+            namespace = dict(self.helpers)
+            code = compile(generate_source(self.source, self.params), f'<template {self.name}>', 'exec')
+            exec(code, namespace)
+            self.compiled = namespace['render']
+        return self.compiled
+
+    def render(self, *args, **kwargs):
+        return self.compile()(*args, **kwargs)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Static Complexity Estimator Tests
+Pins estimates that must either be right or stay below the Gemini cutoff
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from static_complexity import estimate_complexity  # noqa: E402
+
+
+# Default STATIC_COMPLEXITY_MIN_CONFIDENCE of both syncers
+CUTOFF = 0.75
+
+
+def python(code):
+    return estimate_complexity(code, 'python3')
+
+
+class PythonEstimatorTest(unittest.TestCase):
+    def test_membership_in_unknown_container_is_linear_and_unclear(self):
+        result = python(
+            "def f(a, b):\n"
+            "    r = 0\n"
+            "    for x in a:\n"
+            "        if x in b:\n"
+            "            r += 1\n"
+            "    return r\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n^2)')
+        self.assertLess(result['confidence'], CUTOFF)
+
+    def test_membership_in_set_is_constant(self):
+        result = python(
+            "def f(a, b):\n"
+            "    seen = set(b)\n"
+            "    return [x for x in a if x in seen]\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n)')
+        self.assertGreaterEqual(result['confidence'], CUTOFF)
+
+    def test_membership_in_literal_is_constant(self):
+        result = python(
+            "def f(s):\n"
+            "    c = 0\n"
+            "    for ch in s:\n"
+            "        if ch in 'aeiou':\n"
+            "            c += 1\n"
+            "    return c\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n)')
+        self.assertEqual(result['space_complexity'], 'O(1)')
+
+    def test_string_concatenation_in_loop(self):
+        result = python(
+            "def f(a):\n"
+            "    s = ''\n"
+            "    for x in a:\n"
+            "        s += str(x)\n"
+            "    return s\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n^2)')
+        self.assertEqual(result['space_complexity'], 'O(n)')
+
+    def test_list_concatenation_in_loop(self):
+        result = python(
+            "def f(a):\n"
+            "    out = []\n"
+            "    for x in a:\n"
+            "        out = out + [x]\n"
+            "    return out\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n^2)')
+        self.assertEqual(result['space_complexity'], 'O(n)')
+
+    def test_pop_front_is_linear(self):
+        result = python(
+            "def f(a):\n"
+            "    q = list(a)\n"
+            "    total = 0\n"
+            "    for _ in a:\n"
+            "        total += q.pop(0)\n"
+            "    return total\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n^2)')
+
+    def test_insert_front_is_linear(self):
+        result = python(
+            "def f(a):\n"
+            "    out = []\n"
+            "    for x in a:\n"
+            "        out.insert(0, x)\n"
+            "    return out\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n^2)')
+
+    def test_dict_pop_is_constant(self):
+        result = python(
+            "def f(a):\n"
+            "    counts = {}\n"
+            "    for x in a:\n"
+            "        counts[x] = 1\n"
+            "        counts.pop(x)\n"
+            "    return counts\n"
+        )
+        self.assertEqual(result['time_complexity'], 'O(n)')
+
+    def test_unknown_call_is_unclear(self):
+        result = python("def f(a):\n    return frobnicate(a)\n")
+        self.assertLess(result['confidence'], CUTOFF)
+
+
+class CFamilyEstimatorTest(unittest.TestCase):
+    def test_size_minus_literal_bound_is_linear(self):
+        result = estimate_complexity(
+            "int f(string s) { int r = 0; for (int i = 0; i < s.length() - 1; i++) r++; return r; }", 'C++')
+        self.assertEqual(result['time_complexity'], 'O(n)')
+
+    def test_literal_bound_is_constant(self):
+        result = estimate_complexity(
+            "int f() { int r = 0; for (int i = 0; i < 26; i++) r++; return r; }", 'C++')
+        self.assertEqual(result['time_complexity'], 'O(1)')
+
+    def test_unreadable_bound_is_unclear(self):
+        result = estimate_complexity(
+            "bool f(int n) { for (int i = 2; i * i <= n; i++) if (n % i == 0) return false; return true; }", 'C++')
+        self.assertLess(result['confidence'], CUTOFF)
+
+
+if __name__ == '__main__':
+    unittest.main()